@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import (
     QToolButton, QWidget, QVBoxLayout, QSizePolicy,
     QDialog, QFormLayout, QLabel, QLineEdit, QDialogButtonBox, QMessageBox
 )
+from PyQt6.QtCore import QTimer
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qtagg import (
     FigureCanvasQTAgg as FigureCanvas,
@@ -11,24 +12,42 @@ from matplotlib.backends.backend_qtagg import (
 from matplotlib.patches import Polygon as MplPolygon, Ellipse as MplEllipse, Rectangle as MplRectangle, PathPatch
 from matplotlib.path import Path
 from matplotlib import patheffects as pe
-from matplotlib.collections import LineCollection
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.tri import Triangulation
+from matplotlib.transforms import Affine2D
 
 from shapely.geometry import Polygon as ShapelyPoly, Point as ShapelyPoint, box as shapely_box, MultiPolygon
 from shapely.geometry import GeometryCollection
 from shapely.ops import unary_union
 from shapely import affinity as shapely_aff
-from pdekit.mesh.generator import generate_mesh
-
-from pdekit.shapes.dialogs import EllipseDialog, RectangleDialog, DomainCalculatorDialog           
+import shapely
+from pdekit.mesh.generator import generate_mesh, TriMesh, ellipse_segment_count, discretize_ellipse
+from pdekit.mesh.preprocess import PreprocessOptions, preprocess_geometry
+from pdekit.mesh.exporters import export_mesh
+from pdekit.mesh.importers import read_mesh
+from pdekit.mesh.locator import interpolate
+from pdekit.fem.transfer import transfer_field
+
+from pdekit.shapes.dialogs import EllipseDialog, RectangleDialog, DomainCalculatorDialog, PatternDialog           
+from pdekit.shapes.expression import DomainExpressions
+from pdekit.shapes.csg import CSGResult
+from pdekit.shapes.importers import iter_geometry_file
+from pdekit.shapes.pattern import pattern_geometry
+from pdekit.canvas.history import History
+from pdekit.io.project import write_project, read_project, LazyTriMesh
+from pdekit.io.timeseries import read_timeseries
 from math import hypot, atan2, cos, sin
 import numpy as np
 import re
+import time
+import dataclasses
 
 
 
 class Canvas(QWidget):
     
     CLOSE_PIXEL_THRESHOLD = 10
+    REDRAW_FPS = 60         # cap for coalesced repaints during interaction
     
     def __init__(self, parent=None):
         self.fig, self.ax = plt.subplots()
@@ -79,12 +98,56 @@ class Canvas(QWidget):
         self._tag_to_shape = {}  # tag -> patch
         self._tag_text = {}      # tag -> Text artist
         self._shape_geom = {}  # id(patch) -> Shapely geometry (Polygon)
+        self._shape_version = {}    # id(patch) -> edit counter, bumped on move/resize/edit
+        self._tag_anchor = {}       # id(patch) -> cached label anchor (see _tag_anchor_for)
+        self._geom_cache = {}       # id(patch) -> (patch, version, prepared Shapely geometry)
+        self._render_paths = {}     # id(patch) -> (patch, version, data-space Path) for batched layers
+        self._scene_key = None      # membership/version key of the batched layers
+        self._scene_artists = []    # cached collections drawing all unselected shapes
+        self._domain_exprs = DomainExpressions()   # compiled + memoized calculator expressions
+        self._expr_rpn = {}         # expression string -> RPN tokens (parse once)
+        self._csg = {}              # id(result patch) -> CSGResult, in creation (= dependency) order
+        self._mesh_exprs = DomainExpressions()     # same expressions over meshing-time geometry
+
+        # undo/redo: compact operation log + periodic scene snapshots
+        self._state_cache = {}      # id(patch) -> (patch, version, state) shared between snapshots
+        self._history = History(self._scene_state, self._restore_scene, self._apply_op,
+                                snapshot_every=20, max_bytes=64 * 2**20)
+        self._history.reset()
+        self._drag_delta = np.zeros(2)      # accumulated translation of the current drag
+        self._drag_moved = False            # the current drag changed geometry
         
         # Mesh overlay state 
         self._mesh_artists = []             # list of artists used to draw the mesh
+        self._mesh_lc = None                # overlay LineCollection, rebuilt only when the points change
+        self._mesh_lc_src = None            # points array _mesh_lc was built from
+        self._mesh_offset = np.zeros(2)     # pending drag offset, applied as a transform until baked
         self._mesh_cache = None             # {"points": ndarray, "triangles": ndarray}
         self._mesh_opts = {"quality": True, "max_area": None}  # last used meshing opts
         self._auto_remesh = True            # remesh automatically on geometry changes if a mesh exists
+        self._mesh_external = False         # mesh read from a file: not remeshed until meshed explicitly
+        self._project_file = None           # open ProjectFile backing a lazily mapped mesh
+        self._results = None                # open TimeSeries being played back
+        self._result_step = 0               # index of the step on screen
+        self._result_component = 0          # component shown for multi-component series
+        self._play_timer = QTimer(self)
+        self._play_timer.timeout.connect(self._advance_results)
+
+        # Field layer state (solution values drawn on the cached mesh)
+        self._field_tri = None              # matplotlib Triangulation, built once per mesh
+        self._field_tri_src = None          # the _mesh_cache dict _field_tri was built from
+        self._field_artist = None           # tripcolor collection; per frame only set_array()
+        self._field_contours = None         # tricontour set, reused while its key matches
+        self._field_contour_key = None      # (nodal values, triangulation, levels) it was built from
+        self._field_cbar = None             # colorbar attached to _field_artist
+        self._field_values = None           # last frame as nodal values
+        self._field_raw = None              # last frame exactly as passed in
+        self._field_opts = {"location": "node", "shading": "gouraud", "contours": 0}
+        self._field_scale = {"mode": "frame", "vmin": None, "vmax": None}
+        self._field_transfer = "interpolate"  # carry the field over remeshes: None, 'interpolate' or 'l2'
+        self._hover_tri = -1                # triangle under the cursor, start of the next walk
+        self._hover_readout = ""            # appended to the toolbar's x/y readout
+        self.ax.format_coord = self._format_coord
 
         self._mesh_data = {}     # id(patch) -> {"V": np.ndarray, "T": np.ndarray}
         #self._mesh_params = {}   # id(patch) -> dict of params used last time
@@ -96,7 +159,25 @@ class Canvas(QWidget):
             "conforming_delaunay": True,
             "max_steiner": None,
             "smooth_iters": 0,
+            "structured": False,
         }
+        # ellipses stay analytic and are discretized at meshing time
+        # (see pdekit.mesh.generator.ellipse_segment_count)
+        self._curve_params = {"chord_tol": 1e-3, "min_segments": 12, "max_segments": 1024}
+        # snap/simplify/sliver clean-up between the domain union and the PSLG
+        self._preprocess = PreprocessOptions()
+        self._last_preprocess_report = None
+        
+        # redraw scheduling: geometry is updated per event, repaints are
+        # coalesced onto a single-shot timer capped at REDRAW_FPS
+        self._redraw_interval = 1.0 / self.REDRAW_FPS
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.timeout.connect(self.flush_redraw)
+        self._pending_shapes = False    # full redraw_shapes() needed
+        self._pending_tags = False      # tag labels need re-placing (view changed)
+        self._pending_draw = False      # plain canvas draw needed
+        self._last_frame = 0.0
         
         # Event connections
         self.canvas.mpl_connect('button_press_event', self.on_click)
@@ -144,6 +225,25 @@ class Canvas(QWidget):
         ax.set_xlim(-1, 1)
         ax.set_ylim(-1, 1)
 
+        self.current_points.clear()
+        self.current_artists.clear()
+        self.mode = None
+        self.drawing = False
+        self.draw_type = None
+        self.circle_center = None
+        self.rect_start = None
+        self._clear_scene()
+        self._tag_counter = 1
+
+        self._clear_mesh_layer()
+        self._mesh_cache = None
+        self.clear_field(draw=False)
+        self._history.reset()
+        
+        self.canvas.draw()
+
+    def _clear_scene(self):
+        """Drop all shapes, tags and per-shape caches."""
         # Clear stored shapes
         for patch in self.shapes:
             try:
@@ -151,14 +251,7 @@ class Canvas(QWidget):
             except:
                 pass
         self.shapes.clear()
-        self.current_points.clear()
-        self.current_artists.clear()
         self.selected_idx = None
-        self.mode = None
-        self.drawing = False
-        self.draw_type = None
-        self.circle_center = None
-        self.rect_start = None
 
         # clear tags & labels too
         for t in list(self._tag_text.values()):
@@ -169,38 +262,86 @@ class Canvas(QWidget):
         self._tag_text.clear()
         self._shape_tags.clear()
         self._tag_to_shape.clear()
-        self._tag_counter = 1
-
-        self._clear_mesh_layer()
-        self._mesh_cache = None
-        
-        self.canvas.draw()
+        self._tag_anchor.clear()
+        self._shape_version.clear()
+        self._shape_geom.clear()
+        self._geom_cache.clear()
+        self._render_paths.clear()
+        self._scene_key = None
+        self._scene_artists = []
+        self._domain_exprs.clear()
+        self._mesh_exprs.clear()
+        self._csg.clear()
+        self._state_cache.clear()
         
     def delete_selected(self):
         if self.selected_idx is not None:
-            patch = self.shapes.pop(self.selected_idx)
-
-            # also remove its tag + label
-            tag = self._shape_tags.pop(id(patch), None)
-            if tag:
-                self._tag_to_shape.pop(tag, None)
-                t = self._tag_text.pop(tag, None)
-                if t:
-                    try:
-                        t.remove()
-                    except:
-                        pass
-                    
-            self._shape_geom.pop(id(patch), None)
-
-            self.selected_idx = None
+            tag = self._shape_tags.get(id(self.shapes[self.selected_idx]))
+            self._delete_shape(self.selected_idx)
+            self._history.record(("delete", tag))
             
             # delete the existing mesh overlay --> geometry changed
             self._clear_mesh_layer()
             self._mesh_cache = None
+            self.clear_field(draw=False)
 
             self.redraw_shapes()
-            
+
+    def _delete_shape(self, idx, release=True):
+        """
+        Remove shape `idx` with its tag, label and cached state.
+
+        Deleting a CSG result releases its operands back into the scene, or,
+        with release=False, deletes the ones no other result consumes.
+        Results built from the shape are frozen at their last geometry and
+        keep standing for their other operands, which are deleted likewise;
+        so deleting an operand never enlarges the domain.
+        """
+        patch = self.shapes[idx]
+        tag = self._shape_tags.get(id(patch))
+        dependents = [k for k, rec in self._csg.items() if tag in rec.operands]
+        if dependents:
+            self._update_csg()      # freeze the results as currently shown
+        self.shapes.pop(idx)
+
+        dropped = []
+        for key in dependents:
+            frozen = self._csg.pop(key)
+            if frozen.geom is not None:
+                self._shape_geom[key] = frozen.geom
+            self._bump_shape_version(frozen.patch)     # its state is a plain path now
+            dropped.extend(frozen.operands)
+        rec = self._csg.pop(id(patch), None)
+        if rec is not None and not release:
+            dropped.extend(rec.operands)
+
+        # also remove its tag + label
+        tag = self._shape_tags.pop(id(patch), None)
+        if tag:
+            self._tag_to_shape.pop(tag, None)
+            t = self._tag_text.pop(tag, None)
+            if t:
+                try:
+                    t.remove()
+                except:
+                    pass
+                
+        self._shape_geom.pop(id(patch), None)
+        self._shape_version.pop(id(patch), None)
+        self._tag_anchor.pop(id(patch), None)
+        self._geom_cache.pop(id(patch), None)
+        self._render_paths.pop(id(patch), None)
+
+        self.selected_idx = None
+
+        # operands only the frozen / consumed results stood for
+        consumed = self._csg_operands()
+        for t in dict.fromkeys(dropped):
+            op = self._tag_to_shape.get(t)
+            if op is not None and id(op) not in consumed:
+                self._delete_shape(self.shapes.index(op), release=False)
+                consumed = self._csg_operands()
+        
     def _highlight(self, idx):
         """Mark a shape as selected and redraw."""
         if idx is not None:
@@ -287,6 +428,8 @@ class Canvas(QWidget):
         self.canvas.draw()
 
     def redraw_shapes(self):
+        # a full redraw satisfies anything queued on the scheduler
+        self._pending_shapes = self._pending_tags = self._pending_draw = False
         ax = self.canvas.figure.axes[0]
         xlim, ylim = ax.get_xlim(), ax.get_ylim()
         ax.cla()
@@ -296,29 +439,30 @@ class Canvas(QWidget):
         ax.set_xlim(xlim)
         ax.set_ylim(ylim)
 
-        for i, patch in enumerate(self.shapes):
-            if i == self.selected_idx:
-                # highlighted style
-                patch.set_edgecolor('red')
-                patch.set_linewidth(1)
-                patch.set_alpha(0.4)
-                patch.set_zorder(2)
-            else:
-                # normal/unhighlighted style
-                patch.set_edgecolor('white')
-                patch.set_linewidth(1)
-                patch.set_facecolor('cyan')
-                patch.set_alpha(0.3)
-                patch.set_zorder(1)
-    
+        # re-derive CSG results from edited operands before drawing them
+        self._update_csg()
+        consumed = self._csg_operands()
+
+        # unselected shapes are drawn by a few cached collections; only the
+        # selected shape is added as an individual patch
+        selected = None
+        if self.selected_idx is not None and self.selected_idx < len(self.shapes):
+            selected = self.shapes[self.selected_idx]
+        for art in self._scene_layers(consumed, selected):
+            ax.add_collection(art, autolim=False)
+
+        if selected is not None:
+            # highlighted style
+            patch = selected
+            patch.set_edgecolor('red')
+            patch.set_linewidth(1)
+            patch.set_alpha(0.4)
+            patch.set_zorder(2)
             ax.add_patch(patch)
             if isinstance(patch, MplPolygon):
                 xs, ys = zip(*patch.get_xy()[:-1])
                 ax.scatter(xs, ys, s=10, facecolor='white', edgecolor='white', zorder=2)
 
-            # re-place tag labels for every shape
-            self._place_tag_text_for_patch_if_tagged(patch)
-            
             # keep boolean-result patches vesting up
             if isinstance(patch, PathPatch):
                 try:
@@ -332,6 +476,10 @@ class Canvas(QWidget):
                 except Exception:
                     pass
 
+        # re-place tag labels for every shape
+        for patch in self.shapes:
+            self._place_tag_text_for_patch_if_tagged(patch)
+
         # keep the mesh overlay visible across redraws
         if self._mesh_collection is not None:
             # fade while editing/moving for better geometry visibility
@@ -348,8 +496,60 @@ class Canvas(QWidget):
                 self.ax.add_collection(self._mesh_collection)
 
         self._repaint_mesh_layer(alpha=0.35)
+        self._attach_field_layer()
         self.canvas.draw()
 
+    def _shape_render_path(self, patch):
+        """Data-space Path of a shape for the batched layers, cached per shape version."""
+        key, version = id(patch), self._shape_version.get(id(patch), 0)
+        hit = self._render_paths.get(key)
+        if hit is not None and hit[0] is patch and hit[1] == version:
+            return hit[2]
+        if isinstance(patch, PathPatch):
+            # collections fill with the nonzero rule --> holes must run clockwise
+            path = self._geom_to_path(shapely.orient_polygons(self._patch_to_geom(patch)))
+        else:
+            path = patch.get_patch_transform().transform_path(patch.get_path())
+        self._render_paths[key] = (patch, version, path)
+        return path
+
+    def _scene_layers(self, consumed, selected):
+        """
+        Collections drawing every unselected shape: filled shapes, dashed CSG
+        operands and one scatter of all polygon vertices. They are rebuilt
+        only when a member, its version or its role changes, so the number
+        of draw calls does not grow with the scene.
+        """
+        members = [p for p in self.shapes if p is not selected]
+        key = tuple((id(p), self._shape_version.get(id(p), 0), id(p) in consumed) for p in members)
+        if key == self._scene_key:
+            return self._scene_artists
+
+        filled, dashed, verts = [], [], []
+        for p in members:
+            (dashed if id(p) in consumed else filled).append(self._shape_render_path(p))
+            if isinstance(p, MplPolygon):
+                verts.append(p.get_xy()[:-1])
+
+        layers = []
+        if filled:
+            # normal/unhighlighted style
+            layers.append(PathCollection(filled, facecolors='cyan', edgecolors='white',
+                                         linewidths=1, alpha=0.3, zorder=1))
+        if dashed:
+            # CSG operand: editable outline, the result carries the fill
+            layers.append(PathCollection(dashed, facecolors='none', edgecolors='white',
+                                         linewidths=1, linestyles='--', alpha=0.6, zorder=1))
+        if verts:
+            xy = np.concatenate(verts)
+            markers = self.ax.scatter(xy[:, 0], xy[:, 1], s=10, facecolor='white',
+                                      edgecolor='white', zorder=2)
+            markers.remove()    # re-attached by the caller like the others
+            layers.append(markers)
+
+        self._scene_key, self._scene_artists = key, layers
+        return layers
+
     def on_click(self, event):
         
         prev_idx  = self.selected_idx
@@ -381,6 +581,9 @@ class Canvas(QWidget):
                                 patch.center = (h, k)
                                 patch.width  = 2 * a
                                 patch.height = 2 * b
+                                self._bump_shape_version(patch)
+                                self._history.record(("set_shape", self._shape_tags.get(id(patch)),
+                                                      self._shape_params(patch)))
                                 # tag position update
                                 self._update_tag_position_for_patch(patch)
                                 self.redraw_shapes()
@@ -403,6 +606,9 @@ class Canvas(QWidget):
                                 patch.set_y(min(y1, y2))
                                 patch.set_width(abs(x2 - x1))
                                 patch.set_height(abs(y2 - y1))
+                                self._bump_shape_version(patch)
+                                self._history.record(("set_shape", self._shape_tags.get(id(patch)),
+                                                      self._shape_params(patch)))
                                 # tag position update
                                 self._update_tag_position_for_patch(patch)
                                 self.redraw_shapes()
@@ -421,6 +627,7 @@ class Canvas(QWidget):
                 self.shapes.append(poly)
                 # auto-tag
                 self._auto_tag(poly)
+                self._record_add(poly)
                 self.current_points.clear()
                 self.drawing = False
                 self.draw_type = None
@@ -445,6 +652,10 @@ class Canvas(QWidget):
         # Select/move/modify existing shapes
         if not self.drawing and event.button == 1:
             
+            # interior clicks on CSG operands only win if no result claims the point
+            consumed = self._csg_operands()
+            deferred = None
+
             # polygon editing
             for idx, patch in enumerate(self.shapes):
                 hit = False
@@ -464,7 +675,7 @@ class Canvas(QWidget):
                         self.last_mouse = (xpix, ypix)
                         return
                     # move polygon
-                    if ShapelyPoly(patch.get_xy()).contains(ShapelyPoint(x, y)):
+                    if shapely.contains_xy(self._patch_to_geom(patch), x, y):
                         if getattr(self.toolbar, 'mode', '') == 'pan/zoom':
                             self.toolbar.pan()
 
@@ -536,8 +747,8 @@ class Canvas(QWidget):
 
                 # PathPatch (result of domain ops) - move by dragging inside
                 if isinstance(patch, PathPatch):
-                    geom = self._shape_geom.get(id(patch), self._patch_to_geom(patch))
-                    if not geom.is_empty and geom.contains(ShapelyPoint(x, y)):
+                    geom = self._patch_to_geom(patch)
+                    if not geom.is_empty and shapely.contains_xy(geom, x, y):
                         if getattr(self.toolbar, 'mode', '') == 'pan/zoom':
                             self.toolbar.pan()
                         self.mode = 'move'
@@ -545,11 +756,25 @@ class Canvas(QWidget):
                         hit = True
                         self.last_mouse = (xpix, ypix)
 
+                if hit and id(patch) in consumed:
+                    # later operands are drawn on top --> last hit wins
+                    deferred = (idx, self.last_mouse)
+                    continue
+
                 if hit:
                     self._clear_highlight(prev_idx)
                     self.selected_idx = idx 
                     self._highlight(idx)
                     return
+
+            if deferred is not None:
+                idx, self.last_mouse = deferred
+                self.mode = 'move'
+                self.dragging = True
+                self._clear_highlight(prev_idx)
+                self.selected_idx = idx
+                self._highlight(idx)
+                return
             self._clear_highlight(prev_idx)
                     
 
@@ -576,7 +801,7 @@ class Canvas(QWidget):
             ellipse.set_zorder(2)
             ax.add_patch(ellipse)
             self.current_artists.append(ellipse)
-            self.canvas.draw()
+            self.schedule_redraw(shapes=False)
             return
 
         # preview rectangle
@@ -596,7 +821,7 @@ class Canvas(QWidget):
             rect.set_zorder(2)
             ax.add_patch(rect)
             self.current_artists.append(rect)
-            self.canvas.draw()
+            self.schedule_redraw(shapes=False)
             return
         
         
@@ -616,10 +841,11 @@ class Canvas(QWidget):
             ry = abs(ydata - yc)
             patch.width = 2 * rx
             patch.height = 2 * ry
+            self._bump_shape_version(patch)
+            self._drag_moved = True
             
-            # tag position update
-            self._update_tag_position_for_patch(patch)
-            self.redraw_shapes()
+            # tag is re-placed by the coalesced redraw
+            self.schedule_redraw()
             return
 
         # modify rectangle corner
@@ -642,15 +868,18 @@ class Canvas(QWidget):
             patch.set_y(new_y)
             patch.set_width(w)
             patch.set_height(h)
+            self._bump_shape_version(patch)
+            self._drag_moved = True
             
-            # tag position update
-            self._update_tag_position_for_patch(patch)
-            self.redraw_shapes()
+            # tag is re-placed by the coalesced redraw
+            self.schedule_redraw()
             
             # update last mouse position
             self.last_mouse = (event.x, event.y)
+            return
 
         if not getattr(self, 'dragging', False) or self.selected_idx is None:
+            self._update_hover(event)
             return
 
         xpix, ypix = event.x, event.y
@@ -665,35 +894,8 @@ class Canvas(QWidget):
         
         self.last_mouse = (xpix, ypix)
         if self.mode == 'move':
-            if isinstance(patch, MplPolygon):
-                pts = patch.get_xy() + [dx, dy]
-                patch.set_xy(pts)
-            elif isinstance(patch, MplEllipse):
-                xc, yc = patch.center
-                patch.center = (xc + dx, yc + dy)
-            elif isinstance(patch, MplRectangle):
-                patch.set_x(patch.get_x() + dx)
-                patch.set_y(patch.get_y() + dy)
-            elif isinstance(patch, PathPatch):
-                # translate the stored geometry, then update the patch path
-                geom = self._shape_geom.get(id(patch), self._patch_to_geom(patch))
-                if not geom.is_empty:
-                    geom2 = shapely_aff.translate(geom, xoff=dx, yoff=dy)
-                    self._shape_geom[id(patch)] = geom2
-                    
-                    # update the path to match new geometry
-                    if isinstance(geom2, ShapelyPoly):
-                        new_path = self._polygon_to_path(geom2)
-                        new_path.should_simplify = False          
-                        patch.set_path(new_path)
-                        try:
-                            patch.set_fillrule('evenodd')
-                            patch.set_joinstyle('round')
-                            patch.set_capstyle('butt')
-                            patch.set_snap(False)
-                            patch.set_antialiased(True)
-                        except Exception:
-                            pass
+            self._translate_shape(patch, dx, dy)
+            self._drag_delta += (dx, dy)
             
             if isinstance(patch, PathPatch):
                 self._translate_mesh_overlay(dx, dy)
@@ -707,10 +909,11 @@ class Canvas(QWidget):
             elif vid == len(pts) - 1:
                 pts[0] = pts[-1]
             patch.set_xy(pts)
+            self._drag_moved = True
         
-        # update tag for the moved/modified shape
-        self._update_tag_position_for_patch(patch)
-        self.redraw_shapes()
+        self._bump_shape_version(patch)
+        # tag for the moved/modified shape is re-placed by the coalesced redraw
+        self.schedule_redraw()
 
     def on_release(self, event):
         # finalize circle
@@ -723,6 +926,7 @@ class Canvas(QWidget):
             self.shapes.append(ellipse)
             
             self._auto_tag(ellipse)
+            self._record_add(ellipse)
 
             for art in self.current_artists:
                 art.remove()
@@ -742,6 +946,7 @@ class Canvas(QWidget):
             rect = MplRectangle((min(x0, x1), min(y0, y1)), abs(x1 - x0), abs(y1 - y0))
             self.shapes.append(rect)
             self._auto_tag(rect)
+            self._record_add(rect)
             
             for art in self.current_artists:
                 art.remove()
@@ -757,6 +962,10 @@ class Canvas(QWidget):
         # end drag
         if self.dragging:
             
+            # paint the final drag position before any remesh
+            self._bake_mesh_offset()
+            self.flush_redraw()
+            self._record_drag()
             self.dragging = False
             self.mode = None
             self.modify_vidx = None
@@ -765,7 +974,7 @@ class Canvas(QWidget):
             
         # Auto-remesh if a mesh exists and the geometry may have changed
         # (move/modify operations end on release). We reuse last used opts
-        if getattr(self, "_auto_remesh", True) and self._mesh_cache is not None:
+        if self._auto_remesh_due():
             try:
                 self.generate_and_show_mesh()
             except Exception:
@@ -788,10 +997,9 @@ class Canvas(QWidget):
         rely = (ydata - ylim[0]) / (ylim[1] - ylim[0])
         ax.set_xlim([xdata - new_w * relx, xdata + new_w * (1 - relx)])
         ax.set_ylim([ydata - new_h * rely, ydata + new_h * (1 - rely)])
-        self.canvas.draw_idle()
         
-        for tag, patch in list(self._tag_to_shape.items()):
-            self._place_tag_text(tag, patch)
+        # a burst of scroll steps re-places the tags and repaints once per frame
+        self.schedule_redraw(shapes=False, tags=True)
 
 
     def show_mesh(self, mesh, faint=True):
@@ -804,17 +1012,495 @@ class Canvas(QWidget):
             "points": np.asarray(mesh.points, dtype=float),
             "triangles": np.asarray(mesh.triangles, dtype=int),
         }
+        # values attached to the previous mesh no longer match its nodes
+        self.clear_field(draw=False)
+        # a freshly landed mesh already sits at the shapes' final position
+        self._mesh_offset = np.zeros(2)
+        self._hover_tri = -1
         # Paint (semi-transparent by default)
         self._repaint_mesh_layer(alpha=0.35 if faint else 0.9)
         self.canvas.draw_idle()
 
+    ###############
+    # UNDO / REDO #
+    ###############
+
+    def undo(self):
+        if self._history.undo():
+            self._after_history_step()
+
+    def redo(self):
+        if self._history.redo():
+            self._after_history_step()
+
+    def set_history_limits(self, snapshot_every=None, max_bytes=None):
+        """Snapshot interval (operations) and memory cap (bytes) of the undo history."""
+        if snapshot_every is not None:
+            self._history.snapshot_every = max(int(snapshot_every), 1)
+        if max_bytes is not None:
+            self._history.max_bytes = int(max_bytes)
+
+    def _after_history_step(self):
+        self.selected_idx = None
+        self.mode = None
+        self.redraw_shapes()
+        if self._auto_remesh_due():
+            try:
+                self.generate_and_show_mesh()
+            except Exception:
+                pass
+
+    def _shape_params(self, patch):
+        if isinstance(patch, MplEllipse):
+            xc, yc = patch.center
+            return (float(xc), float(yc), float(patch.width), float(patch.height))
+        if isinstance(patch, MplRectangle):
+            return (float(patch.get_x()), float(patch.get_y()),
+                    float(patch.get_width()), float(patch.get_height()))
+        return None
+
+    def _set_shape_params(self, patch, params):
+        if isinstance(patch, MplEllipse):
+            xc, yc, w, h = params
+            patch.center = (xc, yc)
+            patch.width, patch.height = w, h
+        elif isinstance(patch, MplRectangle):
+            x, y, w, h = params
+            patch.set_x(x); patch.set_y(y)
+            patch.set_width(w); patch.set_height(h)
+        self._bump_shape_version(patch)
+
+    def _shape_state(self, patch):
+        """Compact, immutable description of one shape for a snapshot."""
+        tag = self._shape_tags.get(id(patch))
+        rec = self._csg.get(id(patch))
+        if rec is not None:
+            return ("csg", tag, rec.expr, rec.universe)
+        if isinstance(patch, MplPolygon):
+            return ("polygon", tag, np.array(patch.get_xy(), dtype=float))
+        if isinstance(patch, MplEllipse):
+            return ("ellipse", tag, self._shape_params(patch))
+        if isinstance(patch, MplRectangle):
+            return ("rect", tag, self._shape_params(patch))
+        # Shapely geometries are immutable --> shared, not copied
+        return ("path", tag, self._patch_to_geom(patch))
+
+    def _scene_state(self):
+        """
+        Snapshot of the scene. States of shapes untouched since the previous
+        snapshot are reused, so consecutive snapshots share them.
+        """
+        states, cache = [], {}
+        for p in self.shapes:
+            key, ver = id(p), self._shape_version.get(id(p), 0)
+            hit = self._state_cache.get(key)
+            if hit is None or hit[0] is not p or hit[1] != ver:
+                hit = (p, ver, self._shape_state(p))
+            cache[key] = hit
+            states.append(hit[2])
+        self._state_cache = cache
+        return (tuple(states), self._tag_counter)
+
+    def _restore_scene(self, state):
+        states, counter = state
+        self._clear_scene()
+        for st in states:
+            self._add_shape_from_state(st)
+        self._tag_counter = counter
+
+    def _add_shape_from_state(self, st):
+        kind, tag = st[0], st[1]
+        if kind == "csg":
+            patch = self.add_csg_result(tag, st[2], universe=st[3])
+        else:
+            if kind == "polygon":
+                patch = MplPolygon(st[2].copy(), closed=True)   # drags edit vertices in place
+            elif kind == "ellipse":
+                xc, yc, w, h = st[2]
+                patch = MplEllipse(xy=(xc, yc), width=w, height=h)
+            elif kind == "rect":
+                x, y, w, h = st[2]
+                patch = MplRectangle((x, y), w, h)
+            else:
+                patch = self._make_path_patch(st[2])
+            self.shapes.append(patch)
+            self._shape_tags[id(patch)] = tag
+            self._tag_to_shape[tag] = patch
+        # the restored shape is described by this very state until it is edited
+        self._state_cache[id(patch)] = (patch, self._shape_version.get(id(patch), 0), st)
+        return patch
+
+    def _apply_op(self, op):
+        """Apply one recorded operation (used when replaying history)."""
+        kind = op[0]
+        if kind == "add":
+            self._add_shape_from_state(op[1])
+            self._tag_counter = op[2]
+        elif kind == "translate":
+            _, tag, dx, dy = op
+            self._translate_shape(self._tag_to_shape[tag], dx, dy)
+        elif kind == "move_vertex":
+            _, tag, vid, x, y = op
+            patch = self._tag_to_shape[tag]
+            pts = patch.get_xy()
+            pts[vid] = (x, y)
+            if vid == 0:
+                pts[-1] = pts[0]
+            elif vid == len(pts) - 1:
+                pts[0] = pts[-1]
+            patch.set_xy(pts)
+            self._bump_shape_version(patch)
+        elif kind == "set_shape":
+            self._set_shape_params(self._tag_to_shape[op[1]], op[2])
+        elif kind == "delete":
+            self._delete_shape(self.shapes.index(self._tag_to_shape[op[1]]))
+        elif kind == "add_many":
+            for st in op[1]:
+                self._add_shape_from_state(st)
+            self._tag_counter = op[2]
+        elif kind == "replace":
+            _, removed, st, counter = op
+            for t in removed:
+                # replaced shapes pass their operands on to the new one
+                self._delete_shape(self.shapes.index(self._tag_to_shape[t]), release=False)
+            self._add_shape_from_state(st)
+            self._tag_counter = counter
+        elif kind == "csg":
+            _, tag, expr, universe, counter = op
+            self.add_csg_result(tag, expr, universe=universe)
+            self._tag_counter = counter
+        else:
+            raise ValueError(f"Unknown history operation: {kind}")
+
+    def _record_add(self, patch):
+        self._history.record(("add", self._shape_state(patch), self._tag_counter))
+
+    def _record_drag(self):
+        """Log a finished drag as a single operation."""
+        idx = self.selected_idx
+        patch = self.shapes[idx] if idx is not None and idx < len(self.shapes) else None
+        tag = self._shape_tags.get(id(patch)) if patch is not None else None
+        if tag is not None:
+            if self.mode == 'move' and self._drag_delta.any():
+                dx, dy = self._drag_delta
+                self._history.record(("translate", tag, float(dx), float(dy)))
+            elif self.mode == 'modify_poly' and self._drag_moved:
+                x, y = patch.get_xy()[self.modify_vidx]
+                self._history.record(("move_vertex", tag, int(self.modify_vidx), float(x), float(y)))
+            elif self.mode in ('modify_ellipse', 'modify_rect') and self._drag_moved:
+                self._history.record(("set_shape", tag, self._shape_params(patch)))
+        self._drag_delta = np.zeros(2)
+        self._drag_moved = False
+
+    #################
+    # PROJECT FILES #
+    #################
+
+    def save_project(self, path):
+        """
+        Write the scene to a binary project file (see pdekit.io.project):
+        primitives as parameters, boolean results as WKB (or their
+        expression, while it is still live), settings as metadata, and the
+        mesh and current field as raw array blocks.
+        """
+        self._bake_mesh_offset()
+        shapes = []
+        for st in self._scene_state()[0]:
+            kind, tag = st[0], st[1]
+            if kind == "csg":
+                shapes.append({"kind": "csg", "tag": tag, "expr": st[2], "universe": list(st[3])})
+            elif kind == "polygon":
+                shapes.append({"kind": "polygon", "tag": tag, "xy": st[2].tolist()})
+            elif kind in ("ellipse", "rect"):
+                shapes.append({"kind": kind, "tag": tag, "params": list(st[2])})
+            else:
+                shapes.append({"kind": "path", "tag": tag, "geom": st[2]})
+
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        meta = {
+            "tag_counter": self._tag_counter,
+            "mesh_params": self._mesh_params,
+            "curve_params": self._curve_params,
+            "preprocess": dataclasses.asdict(self._preprocess),
+            "view": [float(xlim[0]), float(xlim[1]), float(ylim[0]), float(ylim[1])],
+        }
+
+        arrays = {}
+        if self._mesh_cache or self._mesh is not None:
+            # a project mesh that was never drawn is still only mapped from its file
+            src = self._mesh_cache or {"points": self._mesh.vertices, "triangles": self._mesh.triangles}
+            arrays["mesh/vertices"] = np.asarray(src["points"], dtype=np.float64)
+            arrays["mesh/triangles"] = np.asarray(src["triangles"], dtype=np.int32)
+            for name in ("segments", "segment_markers", "regions"):
+                a = getattr(self._mesh, name, None)
+                if a is not None:
+                    arrays[f"mesh/{name}"] = np.asarray(a, dtype=np.int32)
+            pf = self._project_file
+            if self._field_raw is not None:
+                arrays["field/values"] = np.asarray(self._field_raw, dtype=np.float64)
+                meta["field"] = dict(self._field_opts)
+            elif isinstance(self._mesh, LazyTriMesh) and pf is not None and pf.has("field/values"):
+                # stored field of a project opened without drawing it
+                arrays["field/values"] = np.asarray(pf.array("field/values"), dtype=np.float64)
+                meta["field"] = dict(pf.meta.get("field", {}))
+
+        write_project(path, meta, shapes, arrays)
+
+        # the written file replaces the opened one: blocks not mapped yet
+        # must come from it (the old header's offsets no longer apply)
+        if self._project_file is not None or isinstance(self._mesh, LazyTriMesh):
+            self._project_file = read_project(path)
+            if isinstance(self._mesh, LazyTriMesh):
+                self._mesh = self._project_file.mesh()
+
+    def load_project(self, path, show_mesh=True):
+        """
+        Open a project file. Shapes and settings are restored right away; the
+        mesh stays a memory-mapped LazyTriMesh in self._mesh and is only read
+        when the overlay is drawn (show_mesh=True) or a solver touches it.
+        """
+        pf = read_project(path)
+        meta = pf.meta
+
+        states = []
+        for rec in pf.shapes:
+            kind, tag = rec["kind"], rec["tag"]
+            if kind == "csg":
+                states.append(("csg", tag, rec["expr"], tuple(rec["universe"])))
+            elif kind == "polygon":
+                states.append(("polygon", tag, np.asarray(rec["xy"], dtype=float)))
+            elif kind in ("ellipse", "rect"):
+                states.append((kind, tag, tuple(rec["params"])))
+            else:
+                states.append(("path", tag, pf.geometry(rec)))
+
+        self._clear_mesh_layer()
+        self._mesh_cache = None
+        self._mesh_offset = np.zeros(2)
+        self.clear_field(draw=False)
+        self._restore_scene((tuple(states), int(meta.get("tag_counter", len(states) + 1))))
+
+        self._mesh_params.update(meta.get("mesh_params", {}))
+        self._curve_params.update(meta.get("curve_params", {}))
+        if "preprocess" in meta:
+            # options of older files that no longer exist are ignored
+            known = {f.name for f in dataclasses.fields(PreprocessOptions)}
+            self._preprocess = dataclasses.replace(
+                self._preprocess, **{k: v for k, v in meta["preprocess"].items() if k in known})
+        if "view" in meta:
+            x0, x1, y0, y1 = meta["view"]
+            self.ax.set_xlim(x0, x1)
+            self.ax.set_ylim(y0, y1)
+
+        self.detach_results()
+        self._project_file = pf
+        self._mesh = pf.mesh()
+        # the stored mesh is kept until the user meshes explicitly
+        self._mesh_external = True
+        self._history.reset()
+        self.selected_idx = None
+        self.mode = None
+        self.redraw_shapes()
+
+        if show_mesh and self._mesh is not None:
+            self.show_mesh(self._mesh)
+            if "field" in meta and pf.has("field/values"):
+                opts = meta["field"]
+                self.show_field(pf.array("field/values"), location=opts.get("location", "auto"),
+                                shading=opts.get("shading", "gouraud"),
+                                contours=opts.get("contours", 0))
+
+    ###################
+    # RESULT PLAYBACK #
+    ###################
+
+    def open_results(self, path, component: int = 0):
+        """
+        Open a solution time series (.pdks, see pdekit.io.timeseries): its
+        mesh becomes the current mesh and the first step is shown. Steps are
+        memory-mapped one at a time while playing. Series with several
+        components per value show `component`.
+        """
+        self.detach_results()
+        series = read_timeseries(path)
+        ncomp = series.shape[1] if len(series.shape) > 1 else 1
+        if not 0 <= int(component) < ncomp:
+            raise ValueError(f"Component {component} out of range, the series has {ncomp}.")
+        self._results = series
+        self._result_component = int(component)
+        self._mesh = series.mesh()
+        self.show_mesh(self._mesh)
+        # the results belong to this mesh: geometry edits must not replace it
+        self._mesh_external = True
+        self._result_step = 0
+        if len(series):
+            self.show_field(self._result_frame(0), location=series.location)
+        return series
+
+    def _result_frame(self, i: int) -> np.ndarray:
+        a = self._results.step(i)
+        return a[:, self._result_component] if a.ndim > 1 else a
+
+    def show_result_step(self, i: int):
+        """Show step i of the open time series (frames after the first only swap colors)."""
+        series = self._results
+        if series is None:
+            return
+        if i >= len(series):
+            series.refresh()    # the run may still be writing
+        if not len(series):
+            return
+        self._result_step = int(i) % len(series)
+        self.update_field(self._result_frame(self._result_step))
+
+    def play_results(self, interval_ms: int = 100):
+        if self._results is not None:
+            self._play_timer.start(int(interval_ms))
+
+    def stop_results(self):
+        self._play_timer.stop()
+
+    def detach_results(self):
+        """Stop playback and forget the series (its steps only fit its own mesh)."""
+        self.stop_results()
+        self._results = None
+
+    def _advance_results(self):
+        self.show_result_step(self._result_step + 1)
+
+    ###################
+    # GEOMETRY IMPORT #
+    ###################
+
+    _name_re = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+    def import_geometry(self, path, fmt=None, fit_view=True):
+        """
+        Bulk-load polygonal shapes from a GeoJSON, WKT or SVG file (see
+        pdekit.shapes.importers). Shapes are inserted batch by batch with
+        their tags and prepared geometries already cached, recorded as one
+        undo step, and drawn by a single redraw at the end.
+        Returns the list of new tags.
+        """
+        states, tags = [], []
+        bounds = []
+        for geoms, names in iter_geometry_file(path, fmt):
+            invalid = ~shapely.is_valid(geoms)
+            if invalid.any():
+                geoms[invalid] = shapely.make_valid(geoms[invalid])
+            keep = ~shapely.is_empty(geoms)
+            if not keep.any():
+                continue
+            shapely.prepare(geoms)
+            bounds.append(shapely.total_bounds(geoms[keep]))
+            for geom, name, ok in zip(geoms, names, keep):
+                if ok:
+                    states.append(self._insert_imported(geom, name))
+                    tags.append(states[-1][1])
+
+        if not states:
+            print("Import: no polygonal geometry found.")
+            return []
+        self._history.record(("add_many", tuple(states), self._tag_counter))
+
+        if fit_view:
+            b = np.array(bounds)
+            x0, y0 = b[:, 0].min(), b[:, 1].min()
+            x1, y1 = b[:, 2].max(), b[:, 3].max()
+            pad = 0.05 * max(x1 - x0, y1 - y0, 1e-9)
+            self.ax.set_xlim(x0 - pad, x1 + pad)
+            self.ax.set_ylim(y0 - pad, y1 + pad)
+        self.redraw_shapes()
+        print(f"Imported {len(tags)} shapes.")
+        return tags
+
+    def _insert_imported(self, geom, name=None):
+        """
+        Append one imported geometry without drawing it. Simple polygons
+        become editable MplPolygons, everything else a PathPatch.
+        Returns the shape's history state.
+        """
+        if name and self._name_re.match(name) and name not in self._tag_to_shape:
+            tag = name
+            m = re.fullmatch(r"P(\d+)", name)
+            if m:
+                # keep auto tags clear of imported P<n> names
+                self._tag_counter = max(self._tag_counter, int(m.group(1)) + 1)
+        else:
+            tag = self._next_tag()
+
+        if isinstance(geom, ShapelyPoly) and not geom.interiors:
+            xy = shapely.get_coordinates(geom.exterior)
+            patch = MplPolygon(xy, closed=True)
+            state = ("polygon", tag, xy.copy())
+        else:
+            patch = self._make_path_patch(geom)
+            state = ("path", tag, geom)
+        self.shapes.append(patch)
+        self._shape_tags[id(patch)] = tag
+        self._tag_to_shape[tag] = patch
+        # the parsed geometry is exactly what _build_patch_geom would produce
+        self._geom_cache[id(patch)] = (patch, 0, geom)
+        self._state_cache[id(patch)] = (patch, 0, state)
+        return state
+
+    ####################
+    # REDRAW SCHEDULER #
+    ####################
+
+    def set_redraw_fps(self, fps: float):
+        """Cap the rate of coalesced repaints (frames per second)."""
+        self._redraw_interval = 1.0 / max(float(fps), 1.0)
+
+    def schedule_redraw(self, shapes=True, tags=False):
+        """
+        Queue a repaint for the next timer tick instead of drawing now.
+        Any number of requests between two ticks collapse into one frame, so
+        intermediate frames are dropped and latency stays bounded by the
+        frame interval rather than growing with the event backlog.
+          shapes: rebuild the axes via redraw_shapes()
+          tags:   only re-place the tag labels (e.g. after a zoom)
+        """
+        self._pending_shapes = self._pending_shapes or shapes
+        self._pending_tags = self._pending_tags or tags
+        self._pending_draw = True
+        if self._redraw_timer.isActive():
+            return
+        wait = self._redraw_interval - (time.perf_counter() - self._last_frame)
+        self._redraw_timer.start(max(0, int(wait * 1000)))
+
+    def flush_redraw(self):
+        """Run the pending repaint (if any) immediately."""
+        self._redraw_timer.stop()
+        if not self._pending_draw:
+            return
+        shapes, tags = self._pending_shapes, self._pending_tags
+        self._pending_shapes = self._pending_tags = self._pending_draw = False
+        self._last_frame = time.perf_counter()
+
+        if shapes:
+            self.redraw_shapes()    # re-places tags as well
+            return
+        if tags:
+            for tag, patch in list(self._tag_to_shape.items()):
+                self._place_tag_text(tag, patch)
+        self.canvas.draw()
+
 #################
 # TAGGING UTILS #
 #################
 
-    def _auto_tag(self, patch):
+    def _next_tag(self):
+        """Next free P<n> tag; imported or user-chosen names may already hold some."""
         tag = f"P{self._tag_counter}"
+        while tag in self._tag_to_shape:
+            self._tag_counter += 1
+            tag = f"P{self._tag_counter}"
         self._tag_counter += 1
+        return tag
+
+    def _auto_tag(self, patch):
+        tag = self._next_tag()
         self._shape_tags[id(patch)] = tag
         self._tag_to_shape[tag] = patch
         self._place_tag_text(tag, patch)
@@ -826,49 +1512,101 @@ class Canvas(QWidget):
             
 
     def _place_tag_text(self, tag, patch):
-        geom = self._shape_geom.get(id(patch), self._patch_to_geom(patch))
-        if geom.is_empty:
+        xy = self._tag_anchor_for(patch, self._view_bounds())
+        if xy is None:
             return
 
-        x0, x1 = self.ax.get_xlim()
-        y0, y1 = self.ax.get_ylim()
-        view = shapely_box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        # move the existing label; after ax.cla() it is detached --> re-attach
+        txt = self._tag_text.get(tag)
+        if txt is not None:
+            if txt.axes is None:
+                self.ax.add_artist(txt)
+            txt.set_position(xy)
+            return
 
-        ### THIS NEEDS TO GO!!!! INSANE ERROR HANDLING
+        txt = self.ax.text(xy[0], xy[1], tag, ha='center', va='center',
+                        fontsize=10, color='white', zorder=50, clip_on=True)
         try:
-            visible = geom.intersection(view)
+            txt.set_path_effects([pe.withStroke(linewidth=2, foreground='black')])
         except Exception:
-            # repair attempt
+            pass
+        self._tag_text[tag] = txt
+
+    def _view_bounds(self):
+        """Current axes view as (xmin, ymin, xmax, ymax)."""
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+    def _bump_shape_version(self, patch):
+        """Mark a shape as edited so version-keyed caches recompute it."""
+        key = id(patch)
+        self._shape_version[key] = self._shape_version.get(key, 0) + 1
+
+    def _tag_anchor_for(self, patch, view):
+        """
+        Label anchor (x, y) for a shape, cached per shape version and view box.
+        The geometry/view intersection only runs when the shape changed or its
+        label would otherwise leave the visible part of the shape.
+        """
+        key = id(patch)
+        version = self._shape_version.get(key, 0)
+        entry = self._tag_anchor.get(key)
+        if entry is None or entry["version"] != version:
+            entry = {"version": version, "view": None, "xy": None,
+                     "visible": False, "full": None}
+            self._tag_anchor[key] = entry
+        elif entry["view"] == view:
+            return entry["xy"]
+        elif entry["visible"]:
+            x, y = entry["xy"]
+            if view[0] <= x <= view[2] and view[1] <= y <= view[3]:
+                entry["view"] = view
+                return entry["xy"]
+
+        geom = self._patch_to_geom(patch)
+        if geom.is_empty:
+            return None
+
+        gx0, gy0, gx1, gy1 = geom.bounds
+        inside = view[0] <= gx0 and gx1 <= view[2] and view[1] <= gy0 and gy1 <= view[3]
+        outside = gx1 < view[0] or gx0 > view[2] or gy1 < view[1] or gy0 > view[3]
+
+        visible = GeometryCollection()
+        if not (inside or outside):
+            ### THIS NEEDS TO GO!!!! INSANE ERROR HANDLING
+            box = shapely_box(*view)
             try:
-                from shapely.validation import make_valid as _make_valid
+                visible = geom.intersection(box)
             except Exception:
+                # repair attempt
                 try:
-                    from shapely import make_valid as _make_valid
+                    from shapely.validation import make_valid as _make_valid
                 except Exception:
-                    _make_valid = None
-            if _make_valid is not None:
-                try:
-                    visible = _make_valid(geom).intersection(view)
-                except Exception:
-                    visible = geom  # last resort
-            else:
-                visible = geom
+                    try:
+                        from shapely import make_valid as _make_valid
+                    except Exception:
+                        _make_valid = None
+                if _make_valid is not None:
+                    try:
+                        visible = _make_valid(geom).intersection(box)
+                    except Exception:
+                        visible = geom  # last resort
+                else:
+                    visible = geom
+
+        if inside or visible.is_empty:
+            # whole-shape anchor does not depend on the view --> reuse per version
+            if entry["full"] is None:
+                p = geom.representative_point()
+                entry["full"] = (p.x, p.y)
+            xy = entry["full"]
+        else:
+            p = visible.representative_point()
+            xy = (p.x, p.y)
 
-        target = (visible if not visible.is_empty else geom).representative_point()
-        x, y = target.x, target.y
-
-        old = self._tag_text.get(tag)
-        if old is not None:
-            try: old.remove()
-            except Exception: pass
-
-        txt = self.ax.text(x, y, tag, ha='center', va='center',
-                        fontsize=10, color='white', zorder=50, clip_on=True)
-        try:
-            txt.set_path_effects([pe.withStroke(linewidth=2, foreground='black')])
-        except Exception:
-            pass
-        self._tag_text[tag] = txt
+        entry.update(view=view, xy=xy, visible=inside or not visible.is_empty)
+        return xy
 
 
     def _update_tag_position_for_patch(self, patch):
@@ -881,10 +1619,27 @@ class Canvas(QWidget):
 
 
     def _patch_to_geom(self, patch):
-        stored = self._shape_geom.get(id(patch))
-        if stored is not None:
-            return stored
-
+        """
+        Shapely geometry of a shape, built once per shape version and prepared
+        for fast predicates. Every geometry consumer on the canvas goes through
+        here; edits invalidate the entry via _bump_shape_version().
+        """
+        key = id(patch)
+        version = self._shape_version.get(key, 0)
+        hit = self._geom_cache.get(key)
+        # the entry holds the patch itself, so a recycled id() can never match
+        if hit is not None and hit[0] is patch and hit[1] == version:
+            return hit[2]
+
+        geom = self._shape_geom.get(key)
+        if geom is None:
+            geom = self._build_patch_geom(patch)
+        shapely.prepare(geom)
+        self._geom_cache[key] = (patch, version, geom)
+        return geom
+
+    def _build_patch_geom(self, patch):
+        """Convert a patch to Shapely geometry from scratch (uncached)."""
         if isinstance(patch, MplPolygon):
             coords = patch.get_xy()
             if len(coords) >= 3:
@@ -983,37 +1738,49 @@ class Canvas(QWidget):
         return compound
 
     
-    def _geom_to_patches(self, geom):
-        patches = []
-        if geom.is_empty:
-            return patches
+    def _geom_to_path(self, geom):
+        """Compound Path for a Polygon, MultiPolygon or collection of polygons."""
+        if isinstance(geom, ShapelyPoly):
+            polys = [geom]
+        else:
+            polys = [g for g in getattr(geom, "geoms", []) if isinstance(g, ShapelyPoly)]
+        polys = [p for p in polys if not p.is_empty]
+        if not polys:
+            return Path(np.empty((0, 2)))
+        compound = Path.make_compound_path(*[self._polygon_to_path(p) for p in polys])
+        compound.should_simplify = False
+        return compound
 
- 
-        def make_patch(poly: ShapelyPoly):
-            path = self._polygon_to_path(poly)
-            path.should_simplify = False
-            p = PathPatch(path)
+    def _make_path_patch(self, geom):
+        path = self._geom_to_path(geom)
+        p = PathPatch(path)
 
-            # keep holes as holes
-            try:
-                p.set_fillrule('evenodd')
-            except Exception:
-                pass
+        # keep holes as holes
+        try:
+            p.set_fillrule('evenodd')
+        except Exception:
+            pass
 
-            # SAFE STROKE SETTINGS --> prevent spokes
-            try:
-                p.set_joinstyle('round')
-                p.set_capstyle('butt')
-                # avoid snapping across subpaths
-                p.set_snap(False)
-                p.set_antialiased(True)
-            except Exception:
-                pass
+        # SAFE STROKE SETTINGS --> prevent spokes
+        try:
+            p.set_joinstyle('round')
+            p.set_capstyle('butt')
+            # avoid snapping across subpaths
+            p.set_snap(False)
+            p.set_antialiased(True)
+        except Exception:
+            pass
 
-            # remember geometry for moving
-            self._shape_geom[id(p)] = poly
-            return p
+        # remember geometry for moving
+        self._shape_geom[id(p)] = geom
+        return p
 
+    def _geom_to_patches(self, geom):
+        patches = []
+        if geom.is_empty:
+            return patches
+
+        make_patch = self._make_path_patch
 
         if isinstance(geom, ShapelyPoly):
             patches.append(make_patch(geom))
@@ -1073,37 +1840,32 @@ class Canvas(QWidget):
         return out
 
     def _eval_rpn(self, rpn):
-        stack = []
         # Complement universe = current axes rectangle
-        x0, x1 = self.ax.get_xlim()
-        y0, y1 = self.ax.get_ylim()
-        universe = shapely_box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
-
-        for t in rpn:
-            if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', t):
-                if t not in self._tag_to_shape:
-                    raise KeyError(f"Unknown tag: {t}")
-                stack.append(self._patch_to_geom(self._tag_to_shape[t]))
-            elif t == '!':
-                a = stack.pop()
-                stack.append(universe.difference(a))
-            elif t in ('*', '&', '+', '-'):
-                b = stack.pop()
-                a = stack.pop()
-                if t in ('*', '&'):
-                    stack.append(a.intersection(b))
-                elif t == '+':
-                    stack.append(a.union(b))
-                else:
-                    stack.append(a.difference(b))
-            else:
-                raise ValueError(f"Bad token: {t}")
-        if len(stack) != 1:
-            raise ValueError("Invalid expression")
-        return stack[0]
+        root = self._domain_exprs.compile(rpn)
+        return self._domain_exprs.evaluate(root, self._tag_geom, self._view_bounds())
+
+    def _tag_geom(self, tag):
+        if tag not in self._tag_to_shape:
+            raise KeyError(f"Unknown tag: {tag}")
+        return self._patch_to_geom(self._tag_to_shape[tag])
+
+    def _evaluate_expression(self, expr: str):
+        """Tokenize/compile an expression once, then evaluate it against the memo."""
+        self._update_csg()      # result tags used as operands must be current
+        return self._eval_rpn(self._expr_to_rpn(expr))
+
+    def _expr_to_rpn(self, expr: str):
+        rpn = self._expr_rpn.get(expr)
+        if rpn is None:
+            rpn = self._to_rpn(self._tokenize(expr))
+            self._expr_rpn[expr] = rpn
+        return rpn
 
     def domain_calculator(self):
-        """Open the domain calculator dialog and replace existing shapes with the result."""
+        """
+        Open the domain calculator dialog and add the result as a derived CSG
+        shape. The operands stay on the canvas as editable outlines.
+        """
         tags = self.get_shape_tags()
         dlg = DomainCalculatorDialog(self, tags)
         if not dlg.exec():
@@ -1115,73 +1877,195 @@ class Canvas(QWidget):
             return
 
         try:
-            tokens = self._tokenize(expr)
-            rpn = self._to_rpn(tokens)
-            geom = self._eval_rpn(rpn)
+            geom = self._evaluate_expression(expr)
         except Exception as e:
             QMessageBox.critical(self, "Domain Calculator", f"Could not evaluate expression:\n{e}")
             return
 
-        # convert to patches
-        patches = self._geom_to_patches(geom)
-        if not patches:
+        if geom.is_empty:
             QMessageBox.information(self, "Domain Calculator", "Resulting geometry is empty.")
             return
 
-        # --- clear everything else ---
-        for p in self.shapes:
-            try: p.remove()
-            except Exception: pass
-        self.shapes.clear()
-
-        for t in list(self._tag_text.values()):
-            try: t.remove()
-            except Exception: pass
-        self._tag_text.clear()
-        self._shape_tags.clear()
-        self._tag_to_shape.clear()
-        self._shape_geom.clear()
-
-        # add only the result --> auto-tag if none provided 
-        new_tag = requested_tag.strip() or f"P{self._tag_counter}"
-        # If result has multiple disjoint pieces -->  suffix the same base tag
-        if len(patches) == 1:
-            p = patches[0]
-            self.shapes.append(p)
-            self._shape_tags[id(p)] = new_tag
-            self._tag_to_shape[new_tag] = p
-        else:
-            for i, p in enumerate(patches, start=1):
-                tag_i = f"{new_tag}_{i}"
-                self.shapes.append(p)
-                self._shape_tags[id(p)] = tag_i
-                self._tag_to_shape[tag_i] = p
+        # auto-tag if none provided
+        new_tag = requested_tag.strip()
+        if new_tag in self._tag_to_shape:
+            QMessageBox.warning(self, "Domain Calculator", f"Tag '{new_tag}' is already in use.")
+            return
+        if not new_tag:
+            new_tag = self._next_tag()
 
-        self._tag_counter += 1  # advance counter so next auto tag is fresh
+        patch = self.add_csg_result(new_tag, expr, geom)
+        self._history.record(("csg", new_tag, expr, self._csg[id(patch)].universe, self._tag_counter))
         self.redraw_shapes()
         
         # Auto-remesh after boolean ops if we already had a mesh layer
-        if getattr(self, "_auto_remesh", True) and self._mesh_cache is not None:
+        if self._auto_remesh_due():
             try:
                 self.generate_and_show_mesh()
             except Exception:
                 pass
 
-        
-        # auto-regenerate mesh if a mesh existed or if we have remembered options
-        if self._mesh_collection is not None or self._last_mesh_kwargs:
-            from pdekit.mesh.generator import generate_mesh
+    ############
+    # CSG TREE #
+    ############
+
+    def add_csg_result(self, tag, expr, geom=None, universe=None):
+        """
+        Add the result of `expr` as a derived shape tagged `tag`. Multi-part
+        results stay one shape. `universe` is the complement extent (defaults
+        to the current view). Returns the result patch.
+        """
+        universe = tuple(universe) if universe is not None else self._view_bounds()
+        rpn = tuple(self._expr_to_rpn(expr))
+        root = self._domain_exprs.compile(rpn)
+        if geom is None:
+            self._update_csg()
+            geom = self._domain_exprs.evaluate(root, self._tag_geom, universe)
+
+        patch = self._make_path_patch(geom)
+        self._csg[id(patch)] = CSGResult(
+            tag=tag, expr=expr, rpn=rpn, operands=root.leaves,
+            universe=universe, patch=patch, geom=geom,
+        )
+        self.shapes.append(patch)
+        self._shape_tags[id(patch)] = tag
+        self._tag_to_shape[tag] = patch
+        return patch
+
+    def _csg_operands(self):
+        """ids of the shapes used as operands by some CSG result."""
+        ids = set()
+        for rec in self._csg.values():
+            for t in rec.operands:
+                p = self._tag_to_shape.get(t)
+                if p is not None:
+                    ids.add(id(p))
+        return ids
+
+    def _update_csg(self):
+        """
+        Re-derive CSG results after operand edits. Unchanged subtrees come
+        straight from the expression memo, so only the path from an edited
+        leaf to the root is recomputed. Results are visited in creation order,
+        which is also dependency order.
+        """
+        for rec in list(self._csg.values()):
+            root = self._domain_exprs.compile(rec.rpn)
             try:
-                # we already have `geom` here from the calculator; clean and reuse it
-                new_geom = geom.buffer(0)
-                mesh = generate_mesh(new_geom, **(self._last_mesh_kwargs or {}))
-                self.show_mesh(mesh)  # updates the faint overlay in-place
-            except Exception as e:
-                # Don't block geometry update; just notify about mesh failure
-                QMessageBox.warning(self, "Remesh", f"Remeshing failed:\n{e}")
+                geom = self._domain_exprs.evaluate(root, self._tag_geom, rec.universe)
+            except Exception:
+                continue    # keep the last good result
+            if geom is rec.geom:
+                continue
+            rec.geom = geom
+            self._shape_geom[id(rec.patch)] = geom
+            rec.patch.set_path(self._geom_to_path(geom))
+            self._bump_shape_version(rec.patch)
+
+    def _csg_leaves(self, patch, out=None):
+        """Non-CSG shapes a shape is built from, each once (operands may be shared)."""
+        if out is None:
+            out = {}
+        rec = self._csg.get(id(patch))
+        if rec is None:
+            out[id(patch)] = patch
+            return out
+        for t in rec.operands:
+            op = self._tag_to_shape.get(t)
+            if op is not None and id(op) not in out:
+                self._csg_leaves(op, out)
+        return out
+
+    def _translate_shape(self, patch, dx, dy):
+        """Move a shape; a CSG result moves by moving its operands."""
+        if id(patch) in self._csg:
+            for leaf in self._csg_leaves(patch).values():
+                self._translate_shape(leaf, dx, dy)
+            return
 
+        if isinstance(patch, MplPolygon):
+            pts = patch.get_xy() + [dx, dy]
+            patch.set_xy(pts)
+        elif isinstance(patch, MplEllipse):
+            xc, yc = patch.center
+            patch.center = (xc + dx, yc + dy)
+        elif isinstance(patch, MplRectangle):
+            patch.set_x(patch.get_x() + dx)
+            patch.set_y(patch.get_y() + dy)
+        elif isinstance(patch, PathPatch):
+            # translate the stored geometry, then update the patch path
+            geom = self._patch_to_geom(patch)
+            if not geom.is_empty:
+                geom2 = shapely_aff.translate(geom, xoff=dx, yoff=dy)
+                self._shape_geom[id(patch)] = geom2
+                patch.set_path(self._geom_to_path(geom2))
+        self._bump_shape_version(patch)
 
     
+    ############
+    # PATTERNS #
+    ############
+
+    def add_pattern(self, source, kind="grid", *, subtract_from=None, tag=None,
+                    keep_source=False, **params):
+        """
+        Replicate the shape tagged `source` over a rectangular ('grid': nx, ny,
+        dx, dy) or polar ('polar': count, center, sweep, start_angle, rings,
+        ring_step, rotate) array; see pdekit.shapes.pattern.
+
+        The copies are made from the meshing-time geometry of the source (so
+        circles carry the segment count the mesher would use) and merged by
+        one n-ary union. With `subtract_from` the union is cut out of that
+        shape (also at meshing resolution) right away, giving a single
+        perforated domain. The new shape replaces the consumed ones and is
+        one undo step; with keep_source the source keeps its tag. A consumed
+        CSG result takes its operands with it.
+        """
+        if source not in self._tag_to_shape:
+            raise KeyError(f"Unknown tag: {source}")
+        if subtract_from is not None and subtract_from not in self._tag_to_shape:
+            raise KeyError(f"Unknown tag: {subtract_from}")
+        if tag is not None and tag in self._tag_to_shape and tag not in (source, subtract_from):
+            raise ValueError(f"Tag '{tag}' is already in use.")
+
+        self._update_csg()
+        geom = pattern_geometry(self._mesh_geom(self._tag_to_shape[source]), kind, **params)
+        if subtract_from is not None:
+            geom = self._mesh_geom(self._tag_to_shape[subtract_from]).difference(geom)
+        if geom.is_empty:
+            raise ValueError("Resulting geometry is empty.")
+
+        removed = [] if keep_source else [source]
+        if subtract_from is not None:
+            removed.append(subtract_from)
+        if not tag or (keep_source and tag == source):
+            # a kept source still holds its tag
+            tag = self._next_tag()
+        state = ("path", tag, geom)
+        self._apply_op(("replace", tuple(removed), state, self._tag_counter))
+        self._history.record(("replace", tuple(removed), state, self._tag_counter))
+        return self._tag_to_shape[tag]
+
+    def pattern_tool(self):
+        """Open the pattern dialog and add the replicated shape."""
+        dlg = PatternDialog(self, self.get_shape_tags())
+        if not dlg.exec():
+            return
+        try:
+            source, kind, subtract_from, tag, params = dlg.getValues()
+            self.add_pattern(source, kind, subtract_from=subtract_from, tag=tag, **params)
+        except Exception as e:
+            QMessageBox.critical(self, "Pattern", f"Could not build pattern:\n{e}")
+            return
+        self.selected_idx = None
+        self.redraw_shapes()
+
+        if self._auto_remesh_due():
+            try:
+                self.generate_and_show_mesh()
+            except Exception:
+                pass
+
     ###############
     ### MESHING ###
     ###############
@@ -1214,22 +2098,82 @@ class Canvas(QWidget):
         return lc
 
     def _translate_mesh_overlay(self, dx: float, dy: float):
-        """Translate the mesh LineCollection in data coordinates."""
-        if self._mesh_collection is None:
+        """
+        Translate the mesh overlay in data coordinates during a drag. The
+        offset is accumulated into an Affine2D on the artists (no data copies)
+        and only written into the points by _bake_mesh_offset().
+        """
+        if not self._mesh_cache:
             return
-        segs = self._mesh_collection.get_segments()
-        if not segs:
+        self._mesh_offset += (dx, dy)
+        self._apply_mesh_offset()
+
+    def _mesh_overlay_transform(self):
+        ox, oy = self._mesh_offset
+        if not (ox or oy):
+            return self.ax.transData
+        return Affine2D().translate(ox, oy) + self.ax.transData
+
+    def _apply_mesh_offset(self):
+        """Push the current drag offset onto the mesh and field artists."""
+        tr = self._mesh_overlay_transform()
+        for art in (*self._mesh_artists, self._field_artist, self._field_contours):
+            if art is not None:
+                art.set_transform(tr)
+
+    def _bake_mesh_offset(self):
+        """Write the accumulated drag offset into the mesh points once."""
+        if not self._mesh_cache or not self._mesh_offset.any():
+            self._mesh_offset = np.zeros(2)
             return
-        off = np.array([dx, dy], dtype=float)
-        segs2 = [s + off for s in segs]   # each s is (2,2)
-        self._mesh_collection.set_segments(segs2)
+        P = self._mesh_cache["points"] + self._mesh_offset
+        self._mesh_cache["points"] = P
+        if isinstance(self._mesh, TriMesh):
+            self._mesh.vertices = P
+        elif self._mesh is not None and hasattr(self._mesh, "load"):
+            # a mapped project mesh is read-only --> continue with an in-memory copy
+            self._mesh = dataclasses.replace(self._mesh.load(), vertices=P)
+        self._mesh_offset = np.zeros(2)
+
+        # the field triangulation holds its own copy of the coordinates
+        self._field_tri = None
+        if self._field_artist is not None and self._field_raw is not None:
+            opts = self._field_opts
+            self.show_field(self._field_raw, location=opts["location"], shading=opts["shading"],
+                            contours=opts["contours"], cmap=self._field_artist.get_cmap(),
+                            colorbar=self._field_cbar is not None)
+        self._apply_mesh_offset()
 
     
+    def _mesh_geom(self, patch):
+        """
+        Geometry of a shape as it should enter the PSLG. Ellipses are sampled
+        with a segment count derived from the target triangle area and a chord
+        tolerance instead of the fixed high-resolution display polygon.
+        """
+        if isinstance(patch, MplEllipse):
+            xc, yc = patch.center
+            rx, ry = patch.width / 2.0, patch.height / 2.0
+            n = ellipse_segment_count(rx, ry, max_area=self._mesh_params.get("max_area"),
+                                      **self._curve_params)
+            return discretize_ellipse(xc, yc, rx, ry, n)
+
+        rec = self._csg.get(id(patch))
+        if rec is not None:
+            # re-derive the result from meshing-time operands (ellipses resampled)
+            root = self._mesh_exprs.compile(rec.rpn)
+            return self._mesh_exprs.evaluate(
+                root, lambda t: self._mesh_geom(self._tag_to_shape[t]), rec.universe)
+        return self._patch_to_geom(patch)
+
     def get_polygons_for_meshing(self):
         """Return a list of Shapely Polygons that represent the current domain(s)."""
         polys = []
+        consumed = self._csg_operands()
         for patch in self.shapes:
-            g = self._shape_geom.get(id(patch)) or self._patch_to_geom(patch)
+            if id(patch) in consumed:
+                continue
+            g = self._mesh_geom(patch)
             if g is None or g.is_empty:
                 continue
             if isinstance(g, ShapelyPoly):
@@ -1247,8 +2191,11 @@ class Canvas(QWidget):
         Uses the exact stored geometry for PathPatch results when available.
         """
         geoms = []
+        consumed = self._csg_operands()
         for p in self.shapes:
-            g = self._shape_geom.get(id(p), self._patch_to_geom(p))
+            if id(p) in consumed:
+                continue    # represented by the CSG result built from it
+            g = self._mesh_geom(p)
             if not g.is_empty:
                 geoms.append(g)
         if not geoms:
@@ -1262,6 +2209,11 @@ class Canvas(QWidget):
             return geoms[0].buffer(0)
         
 
+    def _auto_remesh_due(self) -> bool:
+        """A generated mesh is on screen and should follow geometry edits."""
+        return (getattr(self, "_auto_remesh", True) and self._mesh_cache is not None
+                and not self._mesh_external)
+
     def generate_and_show_mesh(self):
         """
         Re-mesh current domain and overlay results.
@@ -1273,16 +2225,31 @@ class Canvas(QWidget):
             QMessageBox.information(self, "Mesh", "No domain to mesh.")
             return
 
+        geom, report = preprocess_geometry(geom, self._mesh_params.get("max_area"), self._preprocess)
+        self._last_preprocess_report = report
+        if self._preprocess.enabled:
+            print(report.summary())
+
         mesh = generate_mesh(geom, **self._mesh_params)
 
         # remember last params so Refine dialog can prefill
         self._last_mesh_params = self._mesh_params
 
+        # the field on the old mesh is carried over after show_mesh() clears it
+        carry = None
+        if self._field_transfer and self._field_raw is not None and self._mesh is not None:
+            carry = (self._mesh, self._field_raw, dict(self._field_opts),
+                     self._field_artist.get_cmap(), self._field_cbar is not None)
+
         # store and draw overlay
+        self.detach_results()
         self._mesh = mesh
+        self._mesh_external = False
         self._mesh_geom_tag = self.get_shape_tags()[:]
 
         self.show_mesh(mesh)
+        if carry is not None:
+            self._carry_field(*carry)
 
             
     def _clear_mesh_layer(self):
@@ -1297,7 +2264,8 @@ class Canvas(QWidget):
     def _repaint_mesh_layer(self, alpha=0.35):
         """
         Re-add the mesh overlay after a redraw (axes was cleared). Requires
-        self._mesh_cache to be set. Draws a single LineCollection for speed.
+        self._mesh_cache to be set. Draws a single LineCollection for speed;
+        the collection is reused until the mesh points change.
         """
         self._clear_mesh_layer()
         if not self._mesh_cache:
@@ -1308,25 +2276,65 @@ class Canvas(QWidget):
         if P is None or T is None or len(P) == 0 or len(T) == 0:
             return
 
-        # Build edge segments for each triangle (closed loop per tri)
-        segments = []
-        for tri in np.asarray(T, dtype=int):
-            i, j, k = tri
-            segments.append([(P[i, 0], P[i, 1]), (P[j, 0], P[j, 1])])
-            segments.append([(P[j, 0], P[j, 1]), (P[k, 0], P[k, 1])])
-            segments.append([(P[k, 0], P[k, 1]), (P[i, 0], P[i, 1])])
+        if self._mesh_lc is None or self._mesh_lc_src is not P:
+            # edge segments for each triangle (closed loop per tri)
+            T = np.asarray(T, dtype=int)
+            segments = P[T[:, [0, 1, 1, 2, 2, 0]]].reshape(-1, 2, 2)
+            self._mesh_lc = LineCollection(
+                segments,
+                linewidths=0.8,
+                colors="orange",
+                zorder=5,
+                clip_on=True,
+            )
+            self._mesh_lc_src = P
 
-        lc = LineCollection(
-            segments,
-            linewidths=0.8,
-            alpha=alpha,
-            colors="orange",
-            zorder=5,
-            clip_on=True,
-        )
-        self.ax.add_collection(lc)
+        lc = self._mesh_lc
+        lc.set_alpha(alpha)
+        lc.set_transform(self._mesh_overlay_transform())
+        self.ax.add_collection(lc, autolim=False)
         self._mesh_artists.append(lc)
 
+    def export_mesh(self, path, fmt=None, with_field=True):
+        """
+        Write the current mesh (Gmsh .msh, VTK .vtu or Triangle .node/.ele,
+        see pdekit.mesh.exporters). The shown nodal field is added as point
+        data to .vtu files.
+        """
+        self._bake_mesh_offset()
+        mesh = self._mesh
+        if mesh is None and self._mesh_cache:
+            mesh = TriMesh(vertices=self._mesh_cache["points"], triangles=self._mesh_cache["triangles"])
+        if mesh is None:
+            raise ValueError("No mesh to export.")
+        kwargs = {}
+        is_vtu = (fmt or str(path)).lower().endswith("vtu")
+        if with_field and is_vtu and self._field_values is not None:
+            kwargs["point_data"] = {"field": self._field_values}
+        export_mesh(path, mesh, fmt, **kwargs)
+
+    def load_mesh(self, path, fmt=None, fit_view=True):
+        """
+        Read a mesh (Gmsh .msh, VTK .vtu or Triangle .node/.ele, see
+        pdekit.mesh.importers) and show it as the current mesh. Shapes are
+        left untouched.
+        """
+        mesh = read_mesh(path, fmt)
+        self.detach_results()
+        self._mesh = mesh
+        self.show_mesh(mesh)
+        # overlaid as is: geometry edits must not replace it
+        self._mesh_external = True
+        if fit_view and len(mesh.vertices):
+            V = mesh.vertices
+            (x0, y0), (x1, y1) = V.min(axis=0), V.max(axis=0)
+            pad = 0.05 * max(x1 - x0, y1 - y0, 1e-9)
+            self.ax.set_xlim(x0 - pad, x1 + pad)
+            self.ax.set_ylim(y0 - pad, y1 + pad)
+            self.canvas.draw_idle()
+        print(f"Loaded mesh: {len(mesh.vertices)} nodes, {len(mesh.triangles)} triangles.")
+        return mesh
+
     # store and reuse last-used meshing params
     def get_mesh_params(self) -> dict:
         return getattr(self, "_mesh_params", {}) or {}
@@ -1336,4 +2344,276 @@ class Canvas(QWidget):
         mp.update({k: v for k, v in kwargs.items() if v is not None})
         self._mesh_params = mp
 
-    
\ No newline at end of file
+    def get_preprocess_options(self) -> PreprocessOptions:
+        return self._preprocess
+
+    def set_preprocess_options(self, **kwargs):
+        """Update geometry preprocessing (see pdekit.mesh.preprocess.PreprocessOptions)."""
+        self._preprocess = dataclasses.replace(self._preprocess, **kwargs)
+
+    ###############
+    # FIELD LAYER #
+    ###############
+
+    def _field_triangulation(self):
+        """
+        Triangulation of the cached mesh, built once per mesh. Its edge and
+        neighbour arrays are computed up front so contouring and later frames
+        reuse them instead of re-triangulating.
+        """
+        if not self._mesh_cache:
+            raise ValueError("No mesh to display the field on.")
+        if self._field_tri is None or self._field_tri_src is not self._mesh_cache:
+            P = self._mesh_cache["points"]
+            T = self._mesh_cache["triangles"]
+            tri = Triangulation(P[:, 0], P[:, 1], T)
+            tri.edges
+            tri.neighbors
+            self._field_tri = tri
+            self._field_tri_src = self._mesh_cache
+        return self._field_tri
+
+    def _field_arrays(self, values):
+        """
+        Validate *values* against the mesh and return (nodal, shaded) where
+        'shaded' is the color array the tripcolor artist expects.
+        """
+        tri = self._field_triangulation()
+        T = tri.triangles
+        n_nodes, n_tris = len(tri.x), len(T)
+        values = np.asarray(values, dtype=float).ravel()
+
+        location = self._field_opts["location"]
+        if location == "auto":
+            location = "node" if len(values) == n_nodes else "element"
+        expected = n_nodes if location == "node" else n_tris
+        if len(values) != expected:
+            raise ValueError(
+                f"Field has {len(values)} values, mesh has {n_nodes} nodes and {n_tris} triangles."
+            )
+
+        if location == "node":
+            nodal = values
+            face = values[T].mean(axis=1)
+        else:
+            face = values
+            # per-element --> nodal by averaging over incident triangles
+            counts = np.bincount(T.ravel(), minlength=n_nodes)
+            sums = np.bincount(T.ravel(), weights=np.repeat(values, 3), minlength=n_nodes)
+            nodal = sums / np.maximum(counts, 1)
+
+        shaded = nodal if self._field_opts["shading"] == "gouraud" else face
+        return nodal, shaded
+
+    def set_field_transfer(self, method):
+        """How a shown field follows remeshing: None (dropped), 'interpolate' or 'l2'."""
+        if method not in (None, "interpolate", "l2"):
+            raise ValueError(f"Unknown transfer method: {method}")
+        self._field_transfer = method
+
+    def _carry_field(self, old_mesh, values, opts, cmap, colorbar):
+        """Redraw a field of the previous mesh on the current one (see pdekit.fem.transfer)."""
+        values = np.asarray(values, dtype=float)
+        location = opts["location"]
+        if location == "auto":
+            location = "node" if len(values) == len(old_mesh.vertices) else "element"
+        try:
+            new = transfer_field(old_mesh, self._mesh, values, self._field_transfer, location)
+        except Exception as e:
+            print(f"Field transfer failed: {e}")
+            return
+        self.show_field(new, location=location, shading=opts["shading"],
+                        contours=opts["contours"], cmap=cmap, colorbar=colorbar)
+
+    def probe_field(self, points):
+        """
+        Values of the field on screen at points (N, 2) (NaN off the mesh),
+        interpolated like the stored values: linearly for nodal fields,
+        constant per triangle for element fields.
+        """
+        if self._field_raw is None or self._mesh is None:
+            raise ValueError("No field to probe.")
+        # the mesh only moves when a drag offset is baked
+        pts = np.reshape(np.asarray(points, dtype=float), (-1, 2)) - self._mesh_offset
+        return self._field_at(*self._mesh.locate(pts))
+
+    def _field_at(self, tri, bary):
+        values = np.asarray(self._field_raw, dtype=float).ravel()
+        location = self._field_opts["location"]
+        if location == "auto":
+            location = "node" if len(values) == len(self._mesh.vertices) else "element"
+        return interpolate(np.asarray(self._mesh.triangles), tri, bary, values, location)
+
+    def _update_hover(self, event):
+        """Locate the cursor in the mesh and prepare the readout (walks from the last hit)."""
+        self._hover_readout = ""
+        mesh = self._mesh
+        if (event.inaxes is not self.ax or event.xdata is None or mesh is None
+                or not self._mesh_cache or not hasattr(mesh, "locate")):
+            return
+        p = np.array([[event.xdata, event.ydata]]) - self._mesh_offset
+        try:
+            tri, bary = mesh.locate(p, start=[self._hover_tri])
+        except Exception:
+            return
+        self._hover_tri = t = int(tri[0])
+        if t < 0:
+            return
+        self._hover_readout = f"triangle {t}"
+        if self._field_raw is not None:
+            self._hover_readout += f"  u={self._field_at(tri, bary)[0]:.6g}"
+
+    def _format_coord(self, x, y):
+        text = f"x={x:.4g}, y={y:.4g}"
+        return f"{text}  {self._hover_readout}" if self._hover_readout else text
+
+    def _field_limits(self, values):
+        """Color limits for this frame according to the autoscale mode."""
+        sc = self._field_scale
+        finite = values[np.isfinite(values)]
+        lo, hi = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+        if sc["mode"] == "fixed":
+            lo = lo if sc["vmin"] is None else sc["vmin"]
+            hi = hi if sc["vmax"] is None else sc["vmax"]
+        elif sc["mode"] == "expand":
+            # grow limits over the playback so colors stay comparable across frames
+            lo = lo if sc["vmin"] is None else min(lo, sc["vmin"])
+            hi = hi if sc["vmax"] is None else max(hi, sc["vmax"])
+            sc["vmin"], sc["vmax"] = lo, hi
+        if hi <= lo:
+            hi = lo + 1e-12
+        return lo, hi
+
+    def show_field(self, values, *, location="auto", shading="gouraud",
+                   contours=0, cmap="viridis", colorbar=True):
+        """
+        Draw a solution field on the cached mesh.
+          values:   one value per node or per triangle
+          location: 'node', 'element' or 'auto' (decided by length)
+          shading:  'gouraud' (interpolated) or 'flat' (one color per triangle)
+          contours: number of contour lines drawn on top (0 = none)
+        Use update_field() for subsequent frames of a time series.
+        """
+        if shading not in ("gouraud", "flat"):
+            raise ValueError(f"Unknown shading: {shading}")
+        if location not in ("auto", "node", "element"):
+            raise ValueError(f"Unknown field location: {location}")
+
+        tri = self._field_triangulation()
+        self._field_opts = {"location": location, "shading": shading, "contours": int(contours)}
+        nodal, shaded = self._field_arrays(values)
+        self._field_raw = values
+
+        if self._field_artist is not None:
+            try: self._field_artist.remove()
+            except Exception: pass
+        if shading == "gouraud":
+            self._field_artist = self.ax.tripcolor(tri, shaded, shading="gouraud",
+                                                   cmap=cmap, zorder=3)
+        else:
+            self._field_artist = self.ax.tripcolor(tri, facecolors=shaded, shading="flat",
+                                                   cmap=cmap, zorder=3)
+
+        if colorbar:
+            if self._field_cbar is None:
+                self._field_cbar = self.figure.colorbar(self._field_artist, ax=self.ax)
+            else:
+                self._field_cbar.update_normal(self._field_artist)
+
+        self._set_field_frame(nodal, shaded)
+        self.canvas.draw_idle()
+
+    def update_field(self, values):
+        """
+        Show the next frame of a field: only the color array (and contours, if
+        enabled) is updated; the triangulation and artists are reused.
+        """
+        if self._field_artist is None:
+            self.show_field(values)
+            return
+        nodal, shaded = self._field_arrays(values)
+        self._field_raw = values
+        self._field_artist.set_array(shaded)
+        self._set_field_frame(nodal, shaded)
+        self.schedule_redraw(shapes=False)
+
+    def _set_field_frame(self, nodal, shaded):
+        self._field_values = nodal
+        lo, hi = self._field_limits(shaded)
+        self._field_artist.set_clim(lo, hi)
+        if self._field_cbar is not None:
+            self._field_cbar.update_normal(self._field_artist)
+        self._draw_field_contours()
+
+    def _draw_field_contours(self):
+        """
+        Contour lines of the shown frame. The ContourSet is kept per (field,
+        triangulation, levels) and only re-attached with the current offset
+        transform, so redraws and drag frames do not re-run tricontour.
+        """
+        key = None
+        n = self._field_opts.get("contours", 0)
+        if n and self._field_values is not None:
+            lo, hi = self._field_artist.get_clim()
+            key = (self._field_values, self._field_tri, tuple(np.linspace(lo, hi, n + 2)[1:-1]))
+        old, cs = self._field_contour_key, self._field_contours
+        if (cs is not None and key is not None and old[0] is key[0]
+                and old[1] is key[1] and old[2] == key[2]):
+            if cs.axes is None:     # removed together with the axes children
+                self.ax.add_collection(cs, autolim=False)
+            cs.set_transform(self._mesh_overlay_transform())
+            return
+
+        if cs is not None:
+            try: cs.remove()
+            except Exception: pass
+            self._field_contours = None
+        self._field_contour_key = key
+        if key is None:
+            return
+        self._field_contours = self.ax.tricontour(
+            self._field_tri, self._field_values, levels=np.array(key[2]),
+            colors="white", linewidths=0.6, zorder=4,
+            transform=self._mesh_overlay_transform(),
+        )
+
+    def _attach_field_layer(self):
+        """Re-add the field artists after ax.cla() in redraw_shapes()."""
+        if self._field_artist is None:
+            return
+        if self._field_artist.axes is None:
+            self.ax.add_collection(self._field_artist, autolim=False)
+        self._field_artist.set_transform(self._mesh_overlay_transform())
+        self._draw_field_contours()
+
+    def set_field_autoscale(self, mode="frame", vmin=None, vmax=None):
+        """
+        Colorbar scaling for field playback:
+          'frame'  : rescale to each frame's range
+          'expand' : only grow the range over the frames seen so far
+          'fixed'  : keep vmin/vmax (None = take that end from the data)
+        """
+        if mode not in ("frame", "expand", "fixed"):
+            raise ValueError(f"Unknown autoscale mode: {mode}")
+        self._field_scale = {"mode": mode, "vmin": vmin, "vmax": vmax}
+        if self._field_artist is not None and self._field_values is not None:
+            self._set_field_frame(self._field_values, self._field_artist.get_array())
+            self.schedule_redraw(shapes=False)
+
+    def clear_field(self, draw=True):
+        """Remove the field layer and its colorbar."""
+        for art in (self._field_contours, self._field_artist):
+            if art is not None:
+                try: art.remove()
+                except Exception: pass
+        if self._field_cbar is not None:
+            try: self._field_cbar.remove()
+            except Exception: pass
+        self._field_artist = None
+        self._field_contours = None
+        self._field_contour_key = None
+        self._field_cbar = None
+        self._field_values = None
+        self._field_raw = None
+        if draw:
+            self.canvas.draw_idle()
@@ -0,0 +1,170 @@
+# pdekit/canvas/history.py
+from __future__ import annotations
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+
+def _own_nbytes(obj: Any) -> int:
+    """Footprint of one object, without the objects it contains."""
+    if isinstance(obj, np.ndarray):
+        return 112 + obj.nbytes
+    if isinstance(obj, BaseGeometry):
+        return 128 + 16 * int(shapely.get_num_coordinates(obj))
+    if isinstance(obj, (tuple, list)):
+        return 56 + 8 * len(obj)
+    if isinstance(obj, dict):
+        return 232
+    return 32
+
+
+def _children(obj: Any):
+    if isinstance(obj, (tuple, list)):
+        return obj
+    if isinstance(obj, dict):
+        return [x for kv in obj.items() for x in kv]
+    return ()
+
+
+class History:
+    """
+    Undo/redo as a log of compact forward operations plus a full scene
+    snapshot every `snapshot_every` operations.
+
+    Undo restores the nearest snapshot at or before the target position and
+    replays the operations after it; redo just applies the next operation.
+    Snapshots are built by the owner and may share unchanged objects with
+    earlier ones. When the estimated size exceeds `max_bytes`, the oldest
+    snapshot segment is evicted first, down to one segment of undo.
+
+      snapshot(): current scene state
+      restore(state): rebuild the scene from a snapshot
+      apply(op): apply one recorded operation to the scene
+    """
+
+    def __init__(self, snapshot: Callable[[], Any], restore: Callable[[Any], None],
+                 apply: Callable[[Any], None], *, snapshot_every: int = 20,
+                 max_bytes: int = 64 * 2**20):
+        self._snapshot = snapshot
+        self._restore = restore
+        self._apply = apply
+        self.snapshot_every = max(int(snapshot_every), 1)
+        self.max_bytes = int(max_bytes)
+        self._ops: List[Any] = []
+        self._snaps: Dict[int, Any] = {}    # position -> state after ops[:position]
+        self._cursor = 0
+        # running size: every object reachable from the log, counted once
+        self._refs: Dict[int, list] = {}    # id(obj) -> [references, obj, own nbytes]
+        self._nbytes = 0
+        self._over_cap = False              # warned that the cap cannot be met
+
+    def reset(self):
+        """Forget everything and take the current scene as the new base."""
+        self._ops.clear()
+        self._refs.clear()
+        self._nbytes = 0
+        self._over_cap = False
+        self._snaps = {0: self._take_snapshot()}
+        self._cursor = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._ops)
+
+    def record(self, op):
+        """Log an operation that has already been applied to the scene."""
+        if not self._snaps:
+            raise RuntimeError("History.reset() must be called before recording.")
+        # a new edit discards the redo branch
+        self._drop_ops(self._cursor, len(self._ops))
+        self._drop_snaps(lambda k: k > self._cursor)
+
+        self._ops.append(op)
+        self._charge(op)
+        self._cursor += 1
+        if self._cursor % self.snapshot_every == 0:
+            self._snaps[self._cursor] = self._take_snapshot()
+        self._enforce_cap()
+
+    def undo(self) -> bool:
+        if not self.can_undo:
+            return False
+        target = self._cursor - 1
+        base = max(k for k in self._snaps if k <= target)
+        self._restore(self._snaps[base])
+        for op in self._ops[base:target]:
+            self._apply(op)
+        self._cursor = target
+        return True
+
+    def redo(self) -> bool:
+        if not self.can_redo:
+            return False
+        self._apply(self._ops[self._cursor])
+        self._cursor += 1
+        return True
+
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def _take_snapshot(self):
+        state = self._snapshot()
+        self._charge(state)
+        return state
+
+    def _charge(self, entry):
+        stack = [entry]
+        while stack:
+            obj = stack.pop()
+            ref = self._refs.get(id(obj))
+            if ref is not None:
+                ref[0] += 1
+                continue
+            size = _own_nbytes(obj)
+            self._refs[id(obj)] = [1, obj, size]
+            self._nbytes += size
+            stack.extend(_children(obj))
+
+    def _release(self, entry):
+        stack = [entry]
+        while stack:
+            obj = stack.pop()
+            ref = self._refs[id(obj)]
+            ref[0] -= 1
+            if ref[0]:
+                continue
+            del self._refs[id(obj)]
+            self._nbytes -= ref[2]
+            stack.extend(_children(obj))
+
+    def _drop_ops(self, start: int, stop: int):
+        for op in self._ops[start:stop]:
+            self._release(op)
+        del self._ops[start:stop]
+
+    def _drop_snaps(self, pred: Callable[[int], bool]):
+        for k in [k for k in self._snaps if pred(k)]:
+            self._release(self._snaps.pop(k))
+
+    def _enforce_cap(self):
+        while self._nbytes > self.max_bytes:
+            keys = sorted(self._snaps)
+            # cut only at periodic snapshots and keep at least one segment of
+            # undo, even if a single snapshot is larger than the cap
+            if len(keys) < 2 or self._cursor - keys[1] < self.snapshot_every:
+                if not self._over_cap:
+                    print(f"Undo history exceeds {self.max_bytes / 2**20:g} MB; "
+                          f"keeping at least the last {self.snapshot_every} steps.")
+                    self._over_cap = True
+                break
+            cut = keys[1]
+            self._drop_ops(0, cut)
+            self._drop_snaps(lambda k: k < cut)
+            self._snaps = {k - cut: v for k, v in self._snaps.items()}
+            self._cursor -= cut
@@ -0,0 +1,123 @@
+# pdekit/fem/assembly.py
+"""
+Vectorized P1 (linear triangle) element kernels and global assembly.
+
+A matrix kernel maps the corner coordinates of a block of triangles,
+P (m, 3, 2), and an optional per-triangle coefficient c (m,) to element
+matrices (m, 3, 3); a vector kernel returns (m, 3). Kernels must be
+module-level functions so worker processes can import them by name (see
+pdekit.fem.parallel).
+
+Global matrices are CSR with the sparsity pattern computed once per mesh
+(SparsityPattern); assembling is then a single bincount of the element
+values onto the pattern, so repeated assemblies (time stepping, nonlinear
+iterations) only pay for the kernels.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+
+# local (i, j) order of the 9 entries of an element matrix
+_ROW = np.repeat(np.arange(3), 3)
+_COL = np.tile(np.arange(3), 3)
+
+
+# -------- kernels --------
+def _area_and_gradients(P: np.ndarray):
+    x, y = P[..., 0], P[..., 1]
+    bx = np.stack([y[:, 1] - y[:, 2], y[:, 2] - y[:, 0], y[:, 0] - y[:, 1]], -1)
+    by = np.stack([x[:, 2] - x[:, 1], x[:, 0] - x[:, 2], x[:, 1] - x[:, 0]], -1)
+    det = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+    return 0.5 * np.abs(det), bx / det[:, None], by / det[:, None]
+
+
+def p1_stiffness(P: np.ndarray, c: np.ndarray | None = None) -> np.ndarray:
+    """Element matrices of -div(c grad u)."""
+    A, gx, gy = _area_and_gradients(P)
+    k = gx[:, :, None] * gx[:, None, :] + gy[:, :, None] * gy[:, None, :]
+    s = A if c is None else A * c
+    return k * s[:, None, None]
+
+
+_MASS = (np.ones((3, 3)) + np.eye(3)) / 12.0
+
+
+def p1_mass(P: np.ndarray, c: np.ndarray | None = None) -> np.ndarray:
+    """Consistent mass matrices (times c)."""
+    A, _, _ = _area_and_gradients(P)
+    s = A if c is None else A * c
+    return _MASS[None, :, :] * s[:, None, None]
+
+
+def p1_load(P: np.ndarray, f: np.ndarray | None = None) -> np.ndarray:
+    """Load vectors of a per-triangle constant source f (default 1)."""
+    A, _, _ = _area_and_gradients(P)
+    s = A if f is None else A * f
+    return np.repeat((s / 3.0)[:, None], 3, axis=1)
+
+
+# -------- sparse storage --------
+@dataclass
+class CSRMatrix:
+    """Minimal CSR matrix (scipy is optional)."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    shape: tuple
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return np.bincount(rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    __matmul__ = dot
+
+    def to_scipy(self):
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class SparsityPattern:
+    """
+    CSR pattern of a P1 matrix on a mesh plus, for every element entry
+    (triangle-major, 9 per triangle), its position in the CSR data array.
+    """
+
+    def __init__(self, triangles: np.ndarray, n_vertices: int):
+        T = np.asarray(triangles, dtype=np.int64)
+        n = int(n_vertices)
+        rows = T[:, _ROW].ravel()
+        cols = T[:, _COL].ravel()
+        key, self.scatter = np.unique(rows * n + cols, return_inverse=True)
+        self.indices = (key % n).astype(np.int32)
+        self.indptr = np.searchsorted(key // n, np.arange(n + 1)).astype(np.int64)
+        self.shape = (n, n)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def matrix(self, element_values: np.ndarray) -> CSRMatrix:
+        """Sum element matrices (M, 3, 3) or their flat (9 M,) values into CSR."""
+        data = np.bincount(self.scatter, weights=np.ravel(element_values), minlength=self.nnz)
+        return CSRMatrix(self.indptr, self.indices, data, self.shape)
+
+
+def assemble_matrix(mesh, kernel=p1_stiffness, coeff=None,
+                    pattern: SparsityPattern | None = None) -> CSRMatrix:
+    """Serial assembly of a matrix kernel over all triangles."""
+    V = np.asarray(mesh.vertices, dtype=np.float64)
+    T = np.asarray(mesh.triangles)
+    pattern = pattern or SparsityPattern(T, len(V))
+    return pattern.matrix(kernel(V[T], coeff))
+
+
+def assemble_vector(mesh, kernel=p1_load, coeff=None) -> np.ndarray:
+    """Serial assembly of a vector kernel over all triangles."""
+    V = np.asarray(mesh.vertices, dtype=np.float64)
+    T = np.asarray(mesh.triangles)
+    return np.bincount(T.ravel(), weights=kernel(V[T], coeff).ravel(), minlength=len(V))
+
+
+__all__ = ["p1_stiffness", "p1_mass", "p1_load", "CSRMatrix", "SparsityPattern",
+           "assemble_matrix", "assemble_vector"]
@@ -0,0 +1,192 @@
+# pdekit/fem/parallel.py
+"""
+Multiprocess element evaluation and assembly over shared memory.
+
+The mesh arrays (vertices, triangles), an optional per-triangle coefficient
+and the element output buffers live in multiprocessing.shared_memory
+blocks created once per ParallelAssembler. Workers of a persistent process
+pool attach to the blocks by name on their first task and keep them
+mapped, so a task only carries a kernel reference and an index range: no
+mesh data is pickled in either direction. Each worker writes its element
+matrices straight into the shared output at the rows of its triangles;
+the parent then sums all of them onto the cached CSR pattern with one
+bincount.
+
+Work is split into contiguous triangle blocks (several per worker for
+load balance) or, given a pdekit.mesh.partition.PartitionResult, into one
+task per part.
+
+Workers are started with the 'spawn' method (safe next to the Qt event
+loop), so scripts using this module need the usual
+`if __name__ == "__main__":` guard.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+from pdekit.fem.assembly import CSRMatrix, SparsityPattern, p1_load, p1_stiffness
+
+Spec = Dict[str, Tuple[str, tuple, str]]     # array name -> (block name, shape, dtype)
+
+
+class SharedArrays:
+    """Named NumPy arrays backed by shared memory blocks owned by this process."""
+
+    def __init__(self):
+        self._blocks: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+    def put(self, name: str, a: np.ndarray) -> np.ndarray:
+        """Copy `a` into a new block (replacing `name`) and return the shared view."""
+        a = np.ascontiguousarray(a)
+        self.drop(name)
+        shm = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+        view = np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)
+        view[...] = a
+        self._blocks[name] = (shm, view)
+        return view
+
+    def empty(self, name: str, shape, dtype) -> np.ndarray:
+        return self.put(name, np.zeros(shape, dtype=dtype))
+
+    def get(self, name: str) -> np.ndarray | None:
+        b = self._blocks.get(name)
+        return None if b is None else b[1]
+
+    def spec(self) -> Spec:
+        return {k: (shm.name, a.shape, a.dtype.str) for k, (shm, a) in self._blocks.items()}
+
+    def drop(self, name: str) -> None:
+        b = self._blocks.pop(name, None)
+        if b is not None:
+            shm, view = b
+            del view
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        for name in list(self._blocks):
+            self.drop(name)
+
+
+# -------- worker side --------
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _attached(spec: Spec) -> Dict[str, np.ndarray]:
+    """Views on the blocks of `spec`, attaching on first use; stale blocks are released."""
+    live = {block for block, _, _ in spec.values()}
+    for block in [b for b in _ATTACHED if b not in live]:
+        shm, _ = _ATTACHED.pop(block)
+        shm.close()
+    out = {}
+    for name, (block, shape, dtype) in spec.items():
+        if block not in _ATTACHED:
+            shm = shared_memory.SharedMemory(name=block)
+            _ATTACHED[block] = (shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+        out[name] = _ATTACHED[block][1]
+    return out
+
+
+def _run_block(spec: Spec, kernel, output: str, lo: int, hi: int) -> int:
+    A = _attached(spec)
+    tri = A["ids"][lo:hi] if "ids" in A else slice(lo, hi)
+    T = A["triangles"][tri]
+    c = A["coeff"][tri] if "coeff" in A else None
+    values = kernel(A["vertices"][T], c)
+    out = A[output]
+    out[tri] = values.reshape(len(T), out.shape[1])
+    return len(T)
+
+
+# -------- parent side --------
+class ParallelAssembler:
+    """
+    Persistent worker pool bound to one mesh.
+
+        with ParallelAssembler(mesh, workers=8) as pa:
+            K = pa.assemble_matrix(p1_stiffness, coeff=kappa)
+            b = pa.assemble_vector(p1_load)
+    """
+
+    def __init__(self, mesh, workers: int | None = None, blocks_per_worker: int = 4):
+        self.workers = max(int(workers or os.cpu_count() or 1), 1)
+        self.blocks_per_worker = max(int(blocks_per_worker), 1)
+        self._shared = SharedArrays()
+        V = self._shared.put("vertices", np.asarray(mesh.vertices, dtype=np.float64))
+        T = self._shared.put("triangles", np.asarray(mesh.triangles, dtype=np.int32))
+        self.n_vertices, self.n_triangles = len(V), len(T)
+        self._pattern: SparsityPattern | None = None
+        self._partition = None
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=mp.get_context("spawn"))
+
+    @property
+    def pattern(self) -> SparsityPattern:
+        if self._pattern is None:
+            self._pattern = SparsityPattern(self._shared.get("triangles"), self.n_vertices)
+        return self._pattern
+
+    def _ranges(self, partition):
+        if partition is None:
+            self._shared.drop("ids")
+            self._partition = None
+            n = self.n_triangles
+            bounds = np.linspace(0, n, min(self.workers * self.blocks_per_worker, max(n, 1)) + 1)
+            bounds = np.unique(bounds.astype(np.int64))
+        else:
+            if partition is not self._partition:
+                order = np.argsort(partition.parts, kind="stable")
+                self._shared.put("ids", order)
+                self._partition = partition
+            parts = partition.parts[self._shared.get("ids")]
+            bounds = np.searchsorted(parts, np.arange(partition.nparts + 1))
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _evaluate(self, kernel, coeff, output: str, width: int, partition) -> np.ndarray:
+        out = self._shared.get(output)
+        if out is None:
+            out = self._shared.empty(output, (self.n_triangles, width), np.float64)
+        if coeff is None:
+            self._shared.drop("coeff")
+        else:
+            c = self._shared.get("coeff")
+            if c is None:
+                c = self._shared.empty("coeff", (self.n_triangles,), np.float64)
+            c[:] = np.broadcast_to(np.asarray(coeff, dtype=np.float64), c.shape)
+        ranges = self._ranges(partition)
+        spec = self._shared.spec()
+        futures = [self._pool.submit(_run_block, spec, kernel, output, int(lo), int(hi))
+                   for lo, hi in ranges if hi > lo]
+        for f in futures:
+            f.result()
+        return out
+
+    def assemble_matrix(self, kernel=p1_stiffness, coeff=None, partition=None) -> CSRMatrix:
+        """
+        Global matrix of a matrix kernel (see pdekit.fem.assembly); `coeff`
+        is a scalar or one value per triangle.
+        """
+        return self.pattern.matrix(self._evaluate(kernel, coeff, "element_matrices", 9, partition))
+
+    def assemble_vector(self, kernel=p1_load, coeff=None, partition=None) -> np.ndarray:
+        vals = self._evaluate(kernel, coeff, "element_vectors", 3, partition)
+        T = self._shared.get("triangles")
+        return np.bincount(T.ravel(), weights=vals.ravel(), minlength=self.n_vertices)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+__all__ = ["SharedArrays", "ParallelAssembler"]
@@ -1,7 +1,7 @@
 import sys
 from math import hypot, atan2, cos, sin
 from PyQt6.QtWidgets import QMainWindow, QToolBar, QMenu, QToolButton, QWidget, QVBoxLayout, QSizePolicy
-from PyQt6.QtGui import QAction, QFont
+from PyQt6.QtGui import QAction, QActionGroup, QFont, QKeySequence
 from shapely.geometry import Polygon as ShapelyPoly, Point as ShapelyPoint
 from matplotlib.patches import Polygon as MplPolygon, Ellipse as MplEllipse, Rectangle as MplRectangle
 
@@ -9,7 +9,7 @@ from pdekit.canvas.canvas import Canvas
 from pdekit.shapes.dialogs import EllipseDialog, RectangleDialog
 from pdekit.mesh.dialogs import MeshRefineDialog
 
-from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtWidgets import QMessageBox, QFileDialog
 
 
 class MainWindow(QMainWindow):
@@ -43,10 +43,35 @@ class MainWindow(QMainWindow):
         ref_act         = QAction("Refine Mesh", self)
         delete_act      = QAction("Delete", self)
         domain_act      = QAction("Domain", self)
+        pattern_act     = QAction("Pattern", self)
+        undo_act        = QAction("Undo", self)
+        redo_act        = QAction("Redo", self)
+        undo_act.setShortcut(QKeySequence.StandardKey.Undo)
+        redo_act.setShortcut(QKeySequence.StandardKey.Redo)
         ref_act.setStatusTip("Adjust meshing parameters and re-mesh the current domain")
         mesh_menu.addAction(canvas_act)
         mesh_menu.addAction(gen_act)
         mesh_menu.addAction(ref_act)
+        load_mesh_act = mesh_menu.addAction("Import Mesh...")
+        export_act = mesh_menu.addAction("Export Mesh...")
+
+        # Field transfer menu: how a shown field follows remeshing
+        transfer_menu = mesh_menu.addMenu("Field Transfer")
+        transfer_group = QActionGroup(self)
+        self._field_transfer = "interpolate"
+        for label, method in (("Off", None), ("Interpolate", "interpolate"), ("L2 Projection", "l2")):
+            act = transfer_menu.addAction(label)
+            act.setCheckable(True)
+            act.setChecked(method == self._field_transfer)
+            transfer_group.addAction(act)
+            act.triggered.connect(lambda _=False, m=method: self.on_field_transfer(m))
+
+        # geometry clean-up before meshing (see pdekit.mesh.preprocess), opt-in
+        self._preprocess_enabled = False
+        preprocess_act = mesh_menu.addAction("Clean Up Geometry")
+        preprocess_act.setCheckable(True)
+        preprocess_act.setChecked(self._preprocess_enabled)
+        preprocess_act.toggled.connect(self.on_preprocess)
         
         # Draw menu: mesh (parent) --> draw (child)
         draw_menu = mesh_menu.addMenu("Draw")
@@ -71,6 +96,23 @@ class MainWindow(QMainWindow):
         condition_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup) if hasattr(QToolButton, 'ToolButtonPopupMode') else condition_btn.setPopupMode(QToolButton.ToolButtonPopup)
         toolbar.addWidget(condition_btn)
 
+        # project button: open/save .pdk files
+        project_btn = QToolButton(self)
+        project_btn.setText("Project")
+        project_btn.setFont(font)
+        project_menu = QMenu(self)
+        project_menu.setFont(font)
+        open_act = project_menu.addAction("Open...")
+        save_act = project_menu.addAction("Save As...")
+        import_act = project_menu.addAction("Import Geometry...")
+        results_act = project_menu.addAction("Open Results...")
+        open_act.setShortcut(QKeySequence.StandardKey.Open)
+        save_act.setShortcut(QKeySequence.StandardKey.Save)
+
+        project_btn.setMenu(project_menu)
+        project_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup) if hasattr(QToolButton, 'ToolButtonPopupMode') else project_btn.setPopupMode(QToolButton.ToolButtonPopup)
+        toolbar.addWidget(project_btn)
+
         boundary_condition_act = QAction("Boundary", self)
         initial_condition_act = QAction("Initial", self)
         condition_menu.addAction(boundary_condition_act)
@@ -79,16 +121,28 @@ class MainWindow(QMainWindow):
         # navigation toolbar (parent) --> Delete and Domain (child)
         toolbar.addAction(delete_act)
         toolbar.addAction(domain_act)
+        toolbar.addAction(pattern_act)
+        toolbar.addAction(undo_act)
+        toolbar.addAction(redo_act)
 
         # connect actions
         canvas_act.triggered.connect(self.on_generate_canvas)
         gen_act.triggered.connect(self.on_generate_mesh)
         ref_act.triggered.connect(self.on_refine_mesh)
+        load_mesh_act.triggered.connect(self.on_import_mesh)
+        export_act.triggered.connect(self.on_export_mesh)
         poly_act.triggered.connect(self.on_draw_polygon)
         circle_act.triggered.connect(self.on_draw_circle)
         rect_act.triggered.connect(self.on_draw_rectangle)
         delete_act.triggered.connect(self.on_delete)
         domain_act.triggered.connect(self.on_domain)
+        pattern_act.triggered.connect(self.on_pattern)
+        undo_act.triggered.connect(self.on_undo)
+        redo_act.triggered.connect(self.on_redo)
+        open_act.triggered.connect(self.on_open_project)
+        save_act.triggered.connect(self.on_save_project)
+        import_act.triggered.connect(self.on_import_geometry)
+        results_act.triggered.connect(self.on_open_results)
         boundary_condition_act.triggered.connect(self.on_boundary_condition)
         initial_condition_act.triggered.connect(self.on_initial_condition)
         
@@ -103,9 +157,21 @@ class MainWindow(QMainWindow):
     def on_generate_canvas(self):
         if self.canvas is None:
             self.canvas = Canvas(self)
+            self.canvas.set_field_transfer(self._field_transfer)
+            self.canvas.set_preprocess_options(enabled=self._preprocess_enabled)
             self.layout.addWidget(self.canvas)
         self.canvas.initialize()
 
+    def on_field_transfer(self, method):
+        self._field_transfer = method
+        if self.canvas:
+            self.canvas.set_field_transfer(method)
+
+    def on_preprocess(self, enabled):
+        self._preprocess_enabled = bool(enabled)
+        if self.canvas:
+            self.canvas.set_preprocess_options(enabled=self._preprocess_enabled)
+
     def on_draw_polygon(self):
         if not self.canvas:
             self.on_generate_canvas()
@@ -129,6 +195,67 @@ class MainWindow(QMainWindow):
         if self.canvas:
             self.canvas.domain_calculator()
 
+    def on_pattern(self):
+        if self.canvas:
+            self.canvas.pattern_tool()
+
+    def on_undo(self):
+        if self.canvas:
+            self.canvas.undo()
+
+    def on_redo(self):
+        if self.canvas:
+            self.canvas.redo()
+
+    def on_open_project(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Project", "", "PDEKit project (*.pdk)")
+        if not path:
+            return
+        if not self.canvas:
+            self.on_generate_canvas()
+        try:
+            self.canvas.load_project(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Open Project", f"Failed to open project:\n{e}")
+
+    def on_open_results(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Results", "", "PDEKit time series (*.pdks)")
+        if not path:
+            return
+        if not self.canvas:
+            self.on_generate_canvas()
+        try:
+            self.canvas.open_results(path)
+            self.canvas.play_results()
+        except Exception as e:
+            QMessageBox.critical(self, "Open Results", f"Failed to open results:\n{e}")
+
+    def on_save_project(self):
+        if not self.canvas:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Project", "", "PDEKit project (*.pdk)")
+        if not path:
+            return
+        if not path.endswith(".pdk"):
+            path += ".pdk"
+        try:
+            self.canvas.save_project(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Save Project", f"Failed to save project:\n{e}")
+
+    def on_import_geometry(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Geometry", "",
+            "Geometry (*.geojson *.json *.wkt *.txt *.svg);;All files (*)")
+        if not path:
+            return
+        if not self.canvas:
+            self.on_generate_canvas()
+        try:
+            self.canvas.import_geometry(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Geometry", f"Failed to import geometry:\n{e}")
+
     def on_generate_mesh(self):
         """
         Generate a mesh for the current domain and show it on the canvas.
@@ -161,6 +288,32 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Generate Mesh", f"Failed to generate mesh:\n{e}")
 
 
+    def on_import_mesh(self):
+        if not self.canvas:
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Mesh", "",
+            "Meshes (*.msh *.vtu *.node);;Gmsh (*.msh);;VTK unstructured grid (*.vtu);;Triangle (*.node)")
+        if not path:
+            return
+        try:
+            self.canvas.load_mesh(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Mesh", f"Failed to import mesh:\n{e}")
+
+    def on_export_mesh(self):
+        if not self.canvas:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Mesh", "",
+            "Gmsh 4.1 binary (*.msh);;VTK unstructured grid (*.vtu);;Triangle (*.node)")
+        if not path:
+            return
+        try:
+            self.canvas.export_mesh(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Export Mesh", f"Failed to export mesh:\n{e}")
+
     def on_refine_mesh(self):
     
         # Ensure there is a domain to mesh
@@ -0,0 +1,200 @@
+# pdekit/io/project.py
+"""
+Binary project files (.pdk).
+
+Layout:
+    8 bytes   magic b"PDKPROJ1"
+    8 bytes   little-endian uint64: length of the JSON header
+    N bytes   JSON header (metadata, shapes, block directory)
+    padding   to a 64-byte boundary = start of the data section
+    blocks    raw array payloads, each 64-byte aligned
+
+Primitives are stored as parameters in the header, geometry that only
+exists as a boolean result is stored as WKB in a block, and the mesh and
+fields are stored as raw array blocks so they can be memory-mapped.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import json
+import os
+import struct
+
+import numpy as np
+import shapely
+
+from pdekit.mesh.generator import TriMesh
+from pdekit.mesh.locator import PointLocator
+from pdekit.mesh.topology import Topology
+
+MAGIC = b"PDKPROJ1"
+_ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_project(path, meta: Dict[str, Any], shapes: List[Dict[str, Any]],
+                  arrays: Dict[str, np.ndarray] | None = None) -> None:
+    """
+    Write a project file.
+      meta:   JSON-serializable settings (tags, mesh options, view, ...)
+      shapes: JSON-serializable shape records; a record may carry a Shapely
+              geometry under "geom", which is stored as a WKB block
+      arrays: named arrays (mesh, fields) written as raw blocks
+    """
+    blocks: Dict[str, np.ndarray] = {}
+    records = []
+    for i, rec in enumerate(shapes):
+        rec = dict(rec)
+        geom = rec.pop("geom", None)
+        if geom is not None:
+            name = f"shape/{i}"
+            blocks[name] = np.frombuffer(shapely.to_wkb(geom), dtype=np.uint8)
+            rec["wkb"] = name
+        records.append(rec)
+    for name, a in (arrays or {}).items():
+        if a is not None:
+            blocks[name] = np.ascontiguousarray(a)
+
+    directory, offset = {}, 0
+    for name, a in blocks.items():
+        directory[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset = _aligned(offset + a.nbytes)
+
+    header = json.dumps({"version": 1, "meta": meta, "shapes": records,
+                         "blocks": directory}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    # write next to the target and swap it in: an open project may still
+    # have the old file memory-mapped
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for name, a in blocks.items():
+            f.write(b"\0" * (data_start + directory[name]["offset"] - f.tell()))
+            f.write(memoryview(a.reshape(-1)).cast("B"))
+    os.replace(tmp, path)
+
+
+@dataclass
+class ProjectFile:
+    """An opened project: header parsed eagerly, array blocks mapped on demand."""
+    path: str
+    meta: Dict[str, Any]
+    shapes: List[Dict[str, Any]]
+    blocks: Dict[str, Dict[str, Any]]
+    data_start: int
+    _maps: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def has(self, name: str) -> bool:
+        return name in self.blocks
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only memory map of a block (created on first access)."""
+        a = self._maps.get(name)
+        if a is None:
+            b = self.blocks[name]
+            shape = tuple(b["shape"])
+            if 0 in shape:
+                a = np.empty(shape, dtype=np.dtype(b["dtype"]))
+            else:
+                a = np.memmap(self.path, dtype=np.dtype(b["dtype"]), mode="r",
+                              offset=self.data_start + b["offset"], shape=shape)
+            self._maps[name] = a
+        return a
+
+    def geometry(self, rec: Dict[str, Any]):
+        """Shapely geometry of a shape record stored as WKB."""
+        return shapely.from_wkb(bytes(self.array(rec["wkb"])))
+
+    def mesh(self, prefix: str = "mesh") -> "LazyTriMesh | None":
+        if not self.has(f"{prefix}/vertices"):
+            return None
+        return LazyTriMesh(self, prefix)
+
+
+def read_project(path) -> ProjectFile:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a PDEKit project file.")
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n).decode("utf-8"))
+    return ProjectFile(path=str(path), meta=header["meta"], shapes=header["shapes"],
+                       blocks=header["blocks"], data_start=_aligned(len(MAGIC) + 8 + n))
+
+
+class LazyTriMesh:
+    """
+    TriMesh-compatible view of a mesh stored in a project file. Nothing is
+    mapped until the arrays are first used (overlay, solver, export).
+    """
+
+    def __init__(self, project: ProjectFile, prefix: str = "mesh"):
+        self._project = project
+        self._prefix = prefix
+        self._topology: Topology | None = None
+        self._locator: PointLocator | None = None
+
+    @property
+    def vertices(self) -> np.ndarray:
+        return self._project.array(f"{self._prefix}/vertices")
+
+    @property
+    def triangles(self) -> np.ndarray:
+        return self._project.array(f"{self._prefix}/triangles")
+
+    @property
+    def segments(self) -> np.ndarray | None:
+        return self._optional("segments")
+
+    @property
+    def segment_markers(self) -> np.ndarray | None:
+        return self._optional("segment_markers")
+
+    @property
+    def regions(self) -> np.ndarray | None:
+        return self._optional("regions")
+
+    @property
+    def topology(self) -> Topology:
+        if self._topology is None:
+            self._topology = Topology.build(self.triangles, len(self.vertices))
+        return self._topology
+
+    @property
+    def locator(self) -> PointLocator:
+        if self._locator is None:
+            self._locator = PointLocator(self.vertices, self.triangles, self.topology.neighbors)
+        return self._locator
+
+    def locate(self, points: np.ndarray, start: np.ndarray | None = None):
+        return self.locator.locate(points, start)
+
+    def _optional(self, name):
+        name = f"{self._prefix}/{name}"
+        return self._project.array(name) if self._project.has(name) else None
+
+    @property
+    def points(self):
+        return self.vertices
+
+    @property
+    def elements(self):
+        return self.load().elements
+
+    def load(self) -> TriMesh:
+        """Copy into an in-memory TriMesh."""
+        opt = lambda a: None if a is None else np.array(a, dtype=np.int32)
+        return TriMesh(vertices=np.array(self.vertices, dtype=np.float64),
+                       triangles=np.array(self.triangles, dtype=np.int32),
+                       segments=opt(self.segments),
+                       segment_markers=opt(self.segment_markers),
+                       regions=opt(self.regions))
+
+
+__all__ = ["write_project", "read_project", "ProjectFile", "LazyTriMesh"]
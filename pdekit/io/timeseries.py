@@ -0,0 +1,219 @@
+# pdekit/io/timeseries.py
+"""
+Solution time series (.pdks): the mesh once, then one raw field chunk per
+time step, appended as the solver produces them.
+
+Layout of <path>:
+    8 bytes   magic b"PDKSTEP1"
+    8 bytes   little-endian uint64: length of the JSON header
+    N bytes   JSON header (meta, field dtype/shape, mesh block directory)
+    padding   to a 64-byte boundary = start of the data section
+    blocks    mesh arrays, each 64-byte aligned (as in .pdk project files)
+    steps     one field chunk per step, each 64-byte aligned, append-only
+
+Layout of <path>.idx (append-only):
+    one record per finished step: float64 time, uint64 file offset
+
+A step's index record is only written after its chunk is on disk, so a
+reader (also one following a run in progress) never sees a partial step.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+import json
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from pdekit.io.project import ProjectFile, LazyTriMesh, _aligned
+
+MAGIC = b"PDKSTEP1"
+INDEX_DTYPE = np.dtype([("time", "<f8"), ("offset", "<u8")])
+_STOP = object()
+
+
+class TimeSeriesWriter:
+    """
+    Append-only result writer. append() copies the step and hands it to a
+    background thread, so the solver only waits when `max_pending` steps are
+    already queued (bounded memory). Errors from the writer thread are
+    raised by the next append() / flush() / close().
+
+        with TimeSeriesWriter("run.pdks", mesh) as w:
+            for t, u in solver:
+                w.append(t, u)
+    """
+
+    def __init__(self, path, mesh, *, dtype=np.float64, components: int = 1,
+                 location: str = "node", meta: Dict[str, Any] | None = None,
+                 max_pending: int = 8):
+        if location not in ("node", "element"):
+            raise ValueError(f"Unknown field location: {location}")
+        self.path = str(path)
+        n = len(mesh.vertices) if location == "node" else len(mesh.triangles)
+        self.shape: Tuple[int, ...] = (n,) if components == 1 else (n, int(components))
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self._closed = False
+        self._error: BaseException | None = None
+
+        arrays = {"mesh/vertices": np.asarray(mesh.vertices, dtype=np.float64),
+                  "mesh/triangles": np.asarray(mesh.triangles, dtype=np.int32)}
+        for name in ("segments", "segment_markers", "regions"):
+            a = getattr(mesh, name, None)
+            if a is not None:
+                arrays[f"mesh/{name}"] = np.asarray(a, dtype=np.int32)
+        directory, offset = {}, 0
+        for name, a in arrays.items():
+            a = arrays[name] = np.ascontiguousarray(a)
+            directory[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset = _aligned(offset + a.nbytes)
+        header = json.dumps({"version": 1, "meta": meta or {}, "location": location,
+                             "field": {"dtype": self.dtype.str, "shape": list(self.shape)},
+                             "blocks": directory}).encode("utf-8")
+        data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+        self._f = open(self.path, "wb")
+        self._f.write(MAGIC)
+        self._f.write(struct.pack("<Q", len(header)))
+        self._f.write(header)
+        for name, a in arrays.items():
+            self._f.write(b"\0" * (data_start + directory[name]["offset"] - self._f.tell()))
+            self._f.write(memoryview(a.reshape(-1)).cast("B"))
+        self._end = self._f.tell()
+        self._idx = open(self.path + ".idx", "wb")
+        self._f.flush()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(int(max_pending), 1))
+        self._thread = threading.Thread(target=self._run, name="pdks-writer", daemon=True)
+        self._thread.start()
+
+    # ---- solver side ----
+    def append(self, time: float, values) -> None:
+        """Queue one step; `values` is copied, the caller may reuse its buffer."""
+        if self._closed:
+            raise RuntimeError(f"{self.path} is closed.")
+        self._check()
+        a = np.array(values, dtype=self.dtype, order="C", copy=True)
+        if a.shape != self.shape:
+            raise ValueError(f"Step has shape {a.shape}, expected {self.shape}.")
+        self._queue.put((float(time), a))
+        self.count += 1
+
+    def flush(self) -> None:
+        """Block until every queued step is on disk and indexed."""
+        self._queue.join()
+        self._check()
+
+    def close(self) -> None:
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._f.close()
+        self._idx.close()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError(f"Writing {self.path} failed: {err}") from err
+
+    # ---- writer thread ----
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if self._error is None:
+                    self._write_step(*item)
+            except BaseException as e:  # surfaced on the solver thread
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_step(self, time: float, a: np.ndarray):
+        start = _aligned(self._end)
+        self._f.write(b"\0" * (start - self._end))
+        self._f.write(memoryview(a.reshape(-1)).cast("B"))
+        self._f.flush()
+        self._end = start + a.nbytes
+        # index last: a recorded step is always complete
+        self._idx.write(struct.pack("<dQ", time, start))
+        self._idx.flush()
+
+
+@dataclass
+class TimeSeries:
+    """An opened .pdks file; steps are memory-mapped one at a time."""
+    path: str
+    meta: Dict[str, Any]
+    location: str
+    dtype: np.dtype
+    shape: Tuple[int, ...]
+    _project: ProjectFile
+    index: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.index["time"]
+
+    def mesh(self) -> LazyTriMesh:
+        return LazyTriMesh(self._project, "mesh")
+
+    def step(self, i: int) -> np.ndarray:
+        """Read-only memory map of step i (negative indices count from the end)."""
+        offset = int(self.index["offset"][i])
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=offset, shape=self.shape)
+
+    def nearest(self, time: float) -> int:
+        """Index of the step closest to `time`."""
+        t = self.times
+        if not len(t):
+            raise IndexError("The time series has no steps.")
+        return int(np.argmin(np.abs(t - time)))
+
+    def refresh(self) -> int:
+        """Re-read the index (to follow a run still being written). Returns the step count."""
+        self.index = _read_index(self.path)
+        return len(self.index)
+
+
+def _read_index(path: str) -> np.ndarray:
+    data = b""
+    if os.path.exists(path + ".idx"):
+        with open(path + ".idx", "rb") as f:
+            data = f.read()
+    n = len(data) // INDEX_DTYPE.itemsize
+    return np.frombuffer(data, dtype=INDEX_DTYPE, count=n).copy()
+
+
+def read_timeseries(path) -> TimeSeries:
+    path = str(path)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a PDEKit time series file.")
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n).decode("utf-8"))
+    project = ProjectFile(path=path, meta=header["meta"], shapes=[], blocks=header["blocks"],
+                          data_start=_aligned(len(MAGIC) + 8 + n))
+    return TimeSeries(path=path, meta=header["meta"], location=header["location"],
+                      dtype=np.dtype(header["field"]["dtype"]),
+                      shape=tuple(header["field"]["shape"]), _project=project,
+                      index=_read_index(path))
+
+
+__all__ = ["TimeSeriesWriter", "TimeSeries", "read_timeseries"]
@@ -36,6 +36,9 @@ class MeshRefineDialog(QDialog):
         self._smooth_iters.setRange(0, 1000)
         self._smooth_iters.setValue(0)
 
+        self._structured = QCheckBox("Structured grid for rectangular domains")
+        self._structured.setChecked(False)
+
         if defaults:
             self._quality.setChecked(bool(defaults.get("quality", True)))
             self._min_angle.setValue(float(defaults.get("min_angle", 25.0)))
@@ -47,6 +50,7 @@ class MeshRefineDialog(QDialog):
             self._conforming.setChecked(bool(defaults.get("conforming_delaunay", True)))
             self._max_steiner.setValue(int(defaults.get("max_steiner", -1) or -1))
             self._smooth_iters.setValue(int(defaults.get("smooth_iters", 0)))
+            self._structured.setChecked(bool(defaults.get("structured", False)))
 
         form = QFormLayout(self)
         form.addRow(self._quality)
@@ -56,6 +60,7 @@ class MeshRefineDialog(QDialog):
         form.addRow(self._conforming)
         form.addRow("Max Steiner points (-1 = none):", self._max_steiner)
         form.addRow("Smoothing iterations:", self._smooth_iters)
+        form.addRow(self._structured)
 
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -72,4 +77,5 @@ class MeshRefineDialog(QDialog):
             "conforming_delaunay": self._conforming.isChecked(),
             "max_steiner": None if self._max_steiner.value() < 0 else int(self._max_steiner.value()),
             "smooth_iters": int(self._smooth_iters.value()),
+            "structured": self._structured.isChecked(),
         }
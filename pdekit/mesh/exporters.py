@@ -0,0 +1,324 @@
+# pdekit/mesh/exporters.py
+"""
+Mesh exporters: Gmsh MSH 4.1 (binary), VTK XML UnstructuredGrid (.vtu,
+appended raw) and Triangle (.node/.ele/.poly).
+
+All writers stream straight from the mesh arrays in fixed-size chunks, so
+the extra memory stays bounded regardless of mesh size (memory-mapped
+meshes from project files are never loaded whole). Boundary segments carry
+their markers and triangles their region attribute where the mesh has them.
+"""
+from __future__ import annotations
+import os
+from typing import Dict
+
+import numpy as np
+
+CHUNK = 1 << 20         # rows converted/written per step
+TEXT_CHUNK = 1 << 16    # rows per step for the text formats
+
+
+def _mesh_arrays(mesh):
+    V = mesh.vertices
+    T = mesh.triangles
+    S = getattr(mesh, "segments", None)
+    SM = getattr(mesh, "segment_markers", None)
+    R = getattr(mesh, "regions", None)
+    if S is not None and len(S) == 0:
+        S = None
+    if S is not None and (SM is None or len(SM) != len(S)):
+        SM = np.ones(len(S), dtype=np.int32)
+    if R is None or len(R) != len(T):
+        R = None
+    return V, T, S, SM, R
+
+
+def _chunks(n: int, size: int = CHUNK):
+    for a in range(0, n, size):
+        yield a, min(a + size, n)
+
+
+def _labels(values, n: int) -> Dict[int, int]:
+    """Distinct non-negative integer labels -> count, computed chunk-wise."""
+    if values is None:
+        return {1: n} if n else {}
+    counts = np.zeros(0, dtype=np.int64)
+    for a, b in _chunks(len(values)):
+        c = np.bincount(np.asarray(values[a:b], dtype=np.int64))
+        if len(c) > len(counts):
+            c[:len(counts)] += counts
+            counts = c
+        else:
+            counts[:len(c)] += c
+    return {int(k): int(c) for k, c in enumerate(counts) if c}
+
+
+# -------- Gmsh MSH 4.1 binary --------
+def write_gmsh(path, mesh) -> None:
+    """
+    Gmsh MSH 4.1 binary. Every region attribute becomes a surface entity and
+    every boundary marker a curve entity, each with a physical group of the
+    same number ("region_<r>", "boundary_<m>").
+    """
+    V, T, S, SM, R = _mesh_arrays(mesh)
+    regions = _labels(R, len(T))
+    markers = _labels(SM, len(S)) if S is not None else {}
+    bbox = np.zeros(6)
+    if len(V):
+        lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+        for a, b in _chunks(len(V)):
+            lo = np.minimum(lo, V[a:b].min(axis=0))
+            hi = np.maximum(hi, V[a:b].max(axis=0))
+        bbox = np.array([lo[0], lo[1], 0.0, hi[0], hi[1], 0.0])
+
+    i32 = lambda *v: np.asarray(v, dtype="<i4").tobytes()
+    u64 = lambda *v: np.asarray(v, dtype="<u8").tobytes()
+
+    with open(path, "wb") as f:
+        f.write(b"$MeshFormat\n4.1 1 8\n")
+        f.write(i32(1))
+        f.write(b"\n$EndMeshFormat\n")
+
+        f.write(b"$PhysicalNames\n%d\n" % (len(markers) + len(regions)))
+        for m in markers:
+            f.write(b'1 %d "boundary_%d"\n' % (m, m))
+        for r in regions:
+            f.write(b'2 %d "region_%d"\n' % (r, r))
+        f.write(b"$EndPhysicalNames\n")
+
+        f.write(b"$Entities\n")
+        f.write(u64(0, len(markers), len(regions), 0))
+        for m in markers:
+            f.write(i32(m) + bbox.astype("<f8").tobytes() + u64(1) + i32(m) + u64(0))
+        for r in regions:
+            f.write(i32(r) + bbox.astype("<f8").tobytes() + u64(1) + i32(r) + u64(0))
+        f.write(b"\n$EndEntities\n")
+
+        # all nodes in one block on the first surface
+        n = len(V)
+        surf = next(iter(regions), 1)
+        f.write(b"$Nodes\n")
+        f.write(u64(1, n, 1 if n else 0, n))
+        f.write(i32(2, surf, 0) + u64(n))
+        for a, b in _chunks(n):
+            f.write(np.arange(a + 1, b + 1, dtype="<u8").tobytes())
+        for a, b in _chunks(n):
+            xyz = np.zeros((b - a, 3), dtype="<f8")
+            xyz[:, :2] = V[a:b]
+            f.write(xyz.tobytes())
+        f.write(b"\n$EndNodes\n")
+
+        # one element block per boundary marker (lines) and region (triangles);
+        # one stable sort by label makes every block a contiguous slice of the
+        # order, gathered chunk-wise in increasing element order
+        n_el = (len(S) if S is not None else 0) + len(T)
+        f.write(b"$Elements\n")
+        f.write(u64(len(markers) + len(regions), n_el, 1 if n_el else 0, n_el))
+        tag = 1
+        for dim, etype, conn, labels, groups in ((1, 1, S, SM, markers), (2, 2, T, R, regions)):
+            if not groups:
+                continue
+            order = None if labels is None else np.argsort(np.asarray(labels), kind="stable")
+            start = 0
+            for g, count in groups.items():     # ascending labels, as in the sort
+                f.write(i32(dim, g, etype) + u64(count))
+                for a, b in _chunks(count):
+                    idx = slice(start + a, start + b) if order is None else order[start + a:start + b]
+                    c = np.asarray(conn[idx])
+                    rows = np.empty((len(c), c.shape[1] + 1), dtype="<u8")
+                    rows[:, 0] = np.arange(tag, tag + len(c))
+                    rows[:, 1:] = c + 1
+                    f.write(rows.tobytes())
+                    tag += len(c)
+                start += count
+        f.write(b"\n$EndElements\n")
+
+
+# -------- VTK XML (.vtu, appended raw) --------
+_VTK_LINE, _VTK_TRIANGLE = 3, 5
+
+
+def write_vtu(path, mesh, point_data: Dict[str, np.ndarray] | None = None,
+              cell_data: Dict[str, np.ndarray] | None = None) -> None:
+    """
+    VTK UnstructuredGrid with all arrays in one appended raw block. Boundary
+    segments are written as line cells after the triangles; the cell arrays
+    "region" and "boundary_marker" are 0 on the other cell kind.
+    `cell_data` arrays are per triangle (lines get 0).
+    """
+    V, T, S, SM, R = _mesh_arrays(mesh)
+    nT, nS = len(T), (len(S) if S is not None else 0)
+    n_cells = nT + nS
+
+    # (name, dtype, ncomp, nbytes, writer) in the order they appear in the block
+    arrays = []
+
+    def add(section, name, dtype, ncomp, n, rows):
+        arrays.append((section, name, np.dtype(dtype), ncomp, n * ncomp * np.dtype(dtype).itemsize, rows))
+
+    def pts(f):
+        for a, b in _chunks(len(V)):
+            xyz = np.zeros((b - a, 3), dtype="<f8")
+            xyz[:, :2] = V[a:b]
+            f.write(xyz.tobytes())
+
+    def conn(f):
+        for a, b in _chunks(nT):
+            f.write(np.asarray(T[a:b], dtype="<i8").tobytes())
+        for a, b in _chunks(nS):
+            f.write(np.asarray(S[a:b], dtype="<i8").tobytes())
+
+    def offs(f):
+        for a, b in _chunks(nT):
+            f.write((3 * np.arange(a + 1, b + 1, dtype="<i8")).tobytes())
+        for a, b in _chunks(nS):
+            f.write((3 * nT + 2 * np.arange(a + 1, b + 1, dtype="<i8")).tobytes())
+
+    def types(f):
+        for a, b in _chunks(nT):
+            f.write(np.full(b - a, _VTK_TRIANGLE, dtype="u1").tobytes())
+        for a, b in _chunks(nS):
+            f.write(np.full(b - a, _VTK_LINE, dtype="u1").tobytes())
+
+    def per_cell(tri_values, seg_values, dtype, ncomp=1):
+        def w(f):
+            for src, n in ((tri_values, nT), (seg_values, nS)):
+                for a, b in _chunks(n):
+                    if src is None:
+                        f.write(np.zeros((b - a) * ncomp, dtype=dtype).tobytes())
+                    else:
+                        f.write(np.asarray(src[a:b], dtype=dtype).tobytes())
+        return w
+
+    def per_point(values, dtype):
+        def w(f):
+            for a, b in _chunks(len(V)):
+                f.write(np.asarray(values[a:b], dtype=dtype).tobytes())
+        return w
+
+    add("Points", "Points", "<f8", 3, len(V), pts)
+    add("Cells", "connectivity", "<i8", 1, 3 * nT + 2 * nS, conn)
+    add("Cells", "offsets", "<i8", 1, n_cells, offs)
+    add("Cells", "types", "u1", 1, n_cells, types)
+    add("CellData", "region", "<i4", 1, n_cells, per_cell(R, None, "<i4"))
+    if S is not None:
+        add("CellData", "boundary_marker", "<i4", 1, n_cells, per_cell(None, SM, "<i4"))
+    for name, vals in (cell_data or {}).items():
+        k = 1 if np.ndim(vals) == 1 else np.shape(vals)[1]
+        add("CellData", name, "<f8", k, n_cells, per_cell(vals, None, "<f8", k))
+    for name, vals in (point_data or {}).items():
+        k = 1 if np.ndim(vals) == 1 else np.shape(vals)[1]
+        add("PointData", name, "<f8", k, len(V), per_point(vals, "<f8"))
+
+    vtk_type = {"<f8": "Float64", "<i8": "Int64", "<i4": "Int32", "|u1": "UInt8"}
+    offset, xml = 0, {"Points": [], "Cells": [], "CellData": [], "PointData": []}
+    for section, name, dt, k, nbytes, _ in arrays:
+        xml[section].append(
+            f'        <DataArray type="{vtk_type[dt.str]}" Name="{name}" NumberOfComponents="{k}" '
+            f'format="appended" offset="{offset}"/>')
+        offset += 8 + nbytes
+
+    def block(tag, lines):
+        return [f"      <{tag}>", *lines, f"      </{tag}>"] if lines else []
+
+    header = "\n".join([
+        '<?xml version="1.0"?>',
+        '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+        "  <UnstructuredGrid>",
+        f'    <Piece NumberOfPoints="{len(V)}" NumberOfCells="{n_cells}">',
+        *block("PointData", xml["PointData"]),
+        *block("CellData", xml["CellData"]),
+        *block("Points", xml["Points"]),
+        *block("Cells", xml["Cells"]),
+        "    </Piece>",
+        "  </UnstructuredGrid>",
+        '  <AppendedData encoding="raw">',
+        "   _",
+    ])
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        for *_, nbytes, write in arrays:
+            f.write(np.uint64(nbytes).astype("<u8").tobytes())
+            write(f)
+        f.write(b"\n  </AppendedData>\n</VTKFile>\n")
+
+
+# -------- Triangle .node / .ele / .poly --------
+def _write_rows(f, fmt: str, first_index: int, arrays):
+    """
+    Write numbered text rows in TEXT_CHUNK steps. Each chunk is formatted by
+    one `%` operation over the flattened values (the loop runs in C); the
+    small chunk bounds the Python objects that holds alive.
+    """
+    n = len(arrays[0])
+    for a, b in _chunks(n, TEXT_CHUNK):
+        cols = [np.arange(a + first_index, b + first_index)[:, None]]
+        cols += [np.asarray(x[a:b]).reshape(b - a, -1) for x in arrays]
+        # mixed int/float rows become float64; '%d' prints those exactly
+        f.write((fmt * (b - a)) % tuple(np.hstack(cols).ravel().tolist()))
+
+
+def write_triangle(basepath, mesh) -> None:
+    """
+    Triangle files <base>.node (vertices with boundary markers), <base>.ele
+    (triangles with the region attribute) and, if the mesh has boundary
+    segments, <base>.poly (segments with their markers). Indices start at 1.
+    """
+    base = os.path.splitext(str(basepath))[0]
+    V, T, S, SM, R = _mesh_arrays(mesh)
+
+    # boundary marker of a vertex = marker of a segment touching it
+    vmark = np.zeros(len(V), dtype=np.int64)
+    if S is not None:
+        for a, b in _chunks(len(S)):
+            vmark[np.asarray(S[a:b]).reshape(-1)] = np.repeat(np.asarray(SM[a:b]), 2)
+
+    with open(base + ".node", "w") as f:
+        f.write(f"{len(V)} 2 0 1\n")
+        _write_rows(f, "%d %.17g %.17g %d\n", 1, [V, vmark])
+
+    with open(base + ".ele", "w") as f:
+        if R is None:
+            f.write(f"{len(T)} 3 0\n")
+            _write_rows(f, "%d %d %d %d\n", 1, [_plus_one(T)])
+        else:
+            f.write(f"{len(T)} 3 1\n")
+            _write_rows(f, "%d %d %d %d %d\n", 1, [_plus_one(T), R])
+
+    if S is not None:
+        with open(base + ".poly", "w") as f:
+            f.write("0 2 0 1\n")        # vertices are in the .node file
+            f.write(f"{len(S)} 1\n")
+            _write_rows(f, "%d %d %d %d\n", 1, [_plus_one(S), SM])
+            f.write("0\n")              # holes are already carved out of the mesh
+
+
+class _plus_one:
+    """Lazy 1-based view of an index array (sliced chunk-wise by _write_rows)."""
+    def __init__(self, a):
+        self._a = a
+
+    def __len__(self):
+        return len(self._a)
+
+    def __getitem__(self, s):
+        return np.asarray(self._a[s], dtype=np.int64) + 1
+
+
+# -------- dispatch --------
+_WRITERS = {".msh": write_gmsh, ".vtu": write_vtu,
+            ".node": write_triangle, ".ele": write_triangle, ".poly": write_triangle}
+
+
+def export_mesh(path, mesh, fmt: str | None = None, **kwargs) -> None:
+    """Write `mesh` in the format given by `fmt` ('msh', 'vtu', 'triangle') or the extension."""
+    ext = f".{fmt.lower().lstrip('.')}" if fmt else os.path.splitext(str(path))[1].lower()
+    if ext == ".triangle":
+        ext = ".node"
+    writer = _WRITERS.get(ext)
+    if writer is None:
+        raise ValueError(f"Unsupported mesh format: {fmt or ext or path}")
+    writer(path, mesh, **kwargs)
+
+
+__all__ = ["write_gmsh", "write_vtu", "write_triangle", "export_mesh"]
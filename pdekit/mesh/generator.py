@@ -1,12 +1,15 @@
 # pdekit/mesh/generator.py
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Iterable, List, Tuple
 
 import numpy as np
 from shapely.geometry import Polygon, MultiPolygon, LinearRing
 from shapely.ops import unary_union
 
+from pdekit.mesh.locator import PointLocator
+from pdekit.mesh.topology import Topology
+
 try:
     import triangle
 except Exception as e:
@@ -21,6 +24,34 @@ class TriMesh:
     vertices: np.ndarray     # (N, 2) float64
     triangles: np.ndarray    # (M, 3) int32 (indices into vertices)
     segments: np.ndarray | None = None  # (K, 2) int32 (boundary edges)
+    segment_markers: np.ndarray | None = None  # (K,) int32 boundary marker per segment
+    regions: np.ndarray | None = None   # (M,) int32 region attribute per triangle
+    _topology: Topology | None = field(default=None, init=False, repr=False, compare=False)
+    _locator: PointLocator | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # adjacency and search grid belong to the arrays they were built from
+        if name in ("vertices", "triangles"):
+            object.__setattr__(self, "_topology", None)
+            object.__setattr__(self, "_locator", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def topology(self) -> Topology:
+        """Neighbours, edges, vertex-to-triangle CSR and boundary loops (built on first use)."""
+        if self._topology is None:
+            self._topology = Topology.build(self.triangles, len(self.vertices))
+        return self._topology
+
+    @property
+    def locator(self) -> PointLocator:
+        if self._locator is None:
+            self._locator = PointLocator(self.vertices, self.triangles, self.topology.neighbors)
+        return self._locator
+
+    def locate(self, points: np.ndarray, start: np.ndarray | None = None):
+        """Containing triangles (N,) and barycentric weights (N, 3) of points (N, 2), see PointLocator."""
+        return self.locator.locate(points, start)
 
     # alias for Canvas.show_mesh() that expects elements
     @property
@@ -39,9 +70,50 @@ class TriMesh:
         return self.vertices
 
 
+# -------- curved boundaries --------
+def ellipse_segment_count(rx: float, ry: float,
+                          max_area: float | None = None,
+                          chord_tol: float = 1e-3,
+                          min_segments: int = 12,
+                          max_segments: int = 1024) -> int:
+    """
+    Number of boundary segments for an ellipse at meshing time.
+
+    Two bounds are combined and the larger one wins:
+      * mesh size: edges no longer than the side of an equilateral triangle
+        of area `max_area`, so the boundary matches the interior resolution;
+      * chord error: the sagitta of each chord stays below
+        `chord_tol * max(rx, ry)` (relative tolerance).
+    """
+    rx, ry = abs(float(rx)), abs(float(ry))
+    r = max(rx, ry)
+    if r == 0.0:
+        return min_segments
+
+    # chord error: r * (1 - cos(pi / n)) <= tol * r
+    tol = min(max(float(chord_tol), 1e-12), 1.0)
+    n = int(np.ceil(np.pi / np.arccos(1.0 - tol)))
+
+    if max_area is not None and max_area > 0:
+        h = np.sqrt(4.0 * float(max_area) / np.sqrt(3.0))
+        # Ramanujan's perimeter approximation
+        perim = np.pi * (3 * (rx + ry) - np.sqrt((3 * rx + ry) * (rx + 3 * ry)))
+        n = max(n, int(np.ceil(perim / h)))
+
+    return int(min(max(n, min_segments), max_segments))
+
+
+def discretize_ellipse(xc: float, yc: float, rx: float, ry: float,
+                       n_segments: int) -> Polygon:
+    """Axis-aligned ellipse as a polygon with `n_segments` boundary vertices."""
+    t = np.linspace(0.0, 2.0 * np.pi, int(n_segments), endpoint=False)
+    return Polygon(np.column_stack([xc + rx * np.cos(t), yc + ry * np.sin(t)]))
+
+
 def _ring_to_vertices_and_segments(ring: LinearRing,
                                    verts: List[Tuple[float, float]],
-                                   segs: List[Tuple[int, int]]) -> None:
+                                   segs: List[Tuple[int, int]],
+                                   markers: List[int] | None = None) -> None:
     # Shapely rings repeat the first vertex at the end — drop it
     coords = list(ring.coords)
     if len(coords) > 1 and coords[0] == coords[-1]:
@@ -51,17 +123,21 @@ def _ring_to_vertices_and_segments(ring: LinearRing,
     n = len(coords)
     for i in range(n):
         segs.append((start + i, start + ((i + 1) % n)))
+    if markers is not None:
+        # one marker per ring, numbered from 1 in PSLG order
+        markers.extend([markers[-1] + 1 if markers else 1] * n)
 
 
 def _polygon_to_pslg(poly: Polygon,
                      verts: List[Tuple[float, float]],
                      segs: List[Tuple[int, int]],
-                     holes: List[Tuple[float, float]]) -> None:
+                     holes: List[Tuple[float, float]],
+                     markers: List[int] | None = None) -> None:
     # Exterior boundary
-    _ring_to_vertices_and_segments(poly.exterior, verts, segs)
+    _ring_to_vertices_and_segments(poly.exterior, verts, segs, markers)
     # Holes: add their rings as segments and supply one interior point each
     for interior in poly.interiors:
-        _ring_to_vertices_and_segments(interior, verts, segs)
+        _ring_to_vertices_and_segments(interior, verts, segs, markers)
         hole_poly = Polygon(interior)
         p = hole_poly.representative_point()
         holes.append((float(p.x), float(p.y)))
@@ -82,11 +158,16 @@ def _geom_to_pslg(geom: Polygon | MultiPolygon) -> dict:
     verts: List[Tuple[float, float]] = []
     segs: List[Tuple[int, int]] = []
     holes: List[Tuple[float, float]] = []
+    markers: List[int] = []
+    regions: List[Tuple[float, float, float, float]] = []
 
     for p in polys:
         if p.is_empty:
             continue
-        _polygon_to_pslg(p, verts, segs, holes)
+        _polygon_to_pslg(p, verts, segs, holes, markers)
+        # region attribute = 1-based index of the polygon part
+        q = p.representative_point()
+        regions.append((float(q.x), float(q.y), float(len(regions) + 1), 0.0))
 
     if not verts or not segs:
         raise ValueError("Empty PSLG – the geometry has no boundary to mesh.")
@@ -94,6 +175,8 @@ def _geom_to_pslg(geom: Polygon | MultiPolygon) -> dict:
     A = {
         "vertices": np.asarray(verts, dtype=np.float64),
         "segments": np.asarray(segs, dtype=np.int32),
+        "segment_markers": np.asarray(markers, dtype=np.int32),
+        "regions": np.asarray(regions, dtype=np.float64),
     }
     if holes:
         A["holes"] = np.asarray(holes, dtype=np.float64)
@@ -107,11 +190,26 @@ def generate_mesh(geom,
                   quality: bool = True,
                   conforming_delaunay: bool = True,
                   max_steiner: int | None = None,
-                  smooth_iters: int = 0) -> TriMesh:
+                  smooth_iters: int = 0,
+                  structured: bool = False) -> TriMesh:
+
+    if structured:
+        # rectangles, unions of axis-aligned rectangles and convex quads get a
+        # regular grid straight away (see pdekit.mesh.structured)
+        from pdekit.mesh.structured import structured_mesh, min_angle as grid_min_angle
+        mesh = structured_mesh(geom, max_area)
+        if mesh is None:
+            print("Structured grid not applicable (shape or size), using Triangle.")
+        elif quality and grid_min_angle(mesh) < float(min_angle) - 1e-9:
+            print(f"Structured grid has angles below {float(min_angle):g} deg, using Triangle.")
+        else:
+            if smooth_iters and len(mesh.triangles):
+                mesh = _laplacian_smooth(mesh, iters=int(smooth_iters))
+            return mesh
 
     A = _geom_to_pslg(geom)
 
-    opts = "p"                   # PSLG
+    opts = "pA"                  # PSLG, propagate region attributes
     if quality:
         # include numeric min angle, Triangle uses 'qXX'
         opts += f"q{float(min_angle):.6g}"
@@ -132,9 +230,15 @@ def generate_mesh(geom,
     if V is None or T is None:
         raise RuntimeError("Triangle failed to return vertices/triangles.")
 
+    S = result.get("segments")
+    SM = result.get("segment_markers")
+    TA = result.get("triangle_attributes")
     mesh = TriMesh(
         vertices=np.asarray(V, dtype=np.float64),
         triangles=np.asarray(T, dtype=np.int32),
+        segments=None if S is None else np.asarray(S, dtype=np.int32),
+        segment_markers=None if SM is None else np.asarray(SM, dtype=np.int32).reshape(-1),
+        regions=None if TA is None else np.rint(np.asarray(TA)[:, 0]).astype(np.int32),
     )
 
     if smooth_iters and len(mesh.vertices) and len(mesh.triangles):
@@ -145,34 +249,13 @@ def generate_mesh(geom,
 
 # -------- optional helper (only smoothing) --------
 def _laplacian_smooth(mesh: TriMesh, iters: int = 1) -> TriMesh:
-    V = mesh.vertices.copy()
-    T = mesh.triangles
-
-    # build adjacency and detect boundary vertices
-    from collections import Counter
-    edges = []
-    for a, b, c in T:
-        edges.extend([(a, b), (b, c), (c, a)])
-    edges = [tuple(sorted(e)) for e in edges]
-    counts = Counter(edges)
-    boundary = set([i for e, c in counts.items() if c == 1 for i in e])
-
-    nbrs = [[] for _ in range(len(V))]
-    for a, b, c in T:
-        nbrs[a] += [b, c]
-        nbrs[b] += [a, c]
-        nbrs[c] += [a, b]
-    nbrs = [list(set(ns)) for ns in nbrs]
-
-    for _ in range(iters):
-        newV = V.copy()
-        for i, ns in enumerate(nbrs):
-            if i in boundary or not ns:
-                continue
-            newV[i] = V[ns].mean(axis=0)
-        V = newV
-    return TriMesh(vertices=V, triangles=T)
-
-
-
-__all__ = ["TriMesh", "generate_mesh"]
+    from pdekit.utils.accel import laplacian_smooth
+    topo = mesh.topology
+    # boundary vertices stay fixed
+    V = laplacian_smooth(mesh.vertices, topo.vertex_neighbors_ptr, topo.vertex_neighbors,
+                         topo.boundary_vertices, iters)
+    return TriMesh(vertices=V, triangles=mesh.triangles, segments=mesh.segments,
+                   segment_markers=mesh.segment_markers, regions=mesh.regions)
+
+
+__all__ = ["TriMesh", "generate_mesh", "ellipse_segment_count", "discretize_ellipse"]
@@ -0,0 +1,442 @@
+# pdekit/mesh/importers.py
+"""
+Mesh readers: Gmsh .msh (2.2 and 4.1, ASCII and binary), Triangle
+.node/.ele(/.poly) and VTK XML .vtu.
+
+Files are opened as read-only memory maps. Binary payloads are taken as
+NumPy views on the map (node coordinates stay mapped); ASCII payloads are
+tokenized in one pass (bytes.split) and converted by NumPy, then reshaped
+block-wise, never parsed line by line in Python. Boundary line elements
+become TriMesh.segments with their physical (or entity) tag as marker, and
+triangle physical tags become TriMesh.regions.
+"""
+from __future__ import annotations
+import base64
+import mmap
+import os
+import re
+import struct
+import zlib
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from pdekit.mesh.generator import TriMesh
+
+
+def _map(path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _numbers(buf) -> np.ndarray:
+    """All whitespace-separated numbers of an ASCII buffer as float64."""
+    return np.array(bytes(buf).split(), dtype=np.float64)
+
+
+def _ragged(buf):
+    """Numbers of an ASCII buffer plus the token count of each line."""
+    c = np.frombuffer(buf, dtype=np.uint8)
+    space = (c == 32) | (c == 9) | (c == 10) | (c == 13)
+    starts = ~space
+    starts[1:] &= space[:-1]
+    ends = np.flatnonzero(c == 10)
+    if not len(ends) or ends[-1] != len(c) - 1:
+        ends = np.append(ends, len(c) - 1)
+    per_line = np.diff(np.concatenate([[0], np.cumsum(starts, dtype=np.int64)[ends]]))
+    return _numbers(buf), per_line
+
+
+def _index(tags: np.ndarray, node_tags: np.ndarray) -> np.ndarray:
+    """Map node tags to 0-based row indices (fast path for 1..N numbering)."""
+    node_tags = np.asarray(node_tags, dtype=np.int64)
+    tags = np.asarray(tags, dtype=np.int64)
+    if len(node_tags) and node_tags[0] == 1 and node_tags[-1] == len(node_tags) \
+            and np.array_equal(node_tags, np.arange(1, len(node_tags) + 1)):
+        return (tags - 1).astype(np.int32)
+    lut = np.full(int(node_tags.max()) + 1 if len(node_tags) else 1, -1, dtype=np.int64)
+    lut[node_tags] = np.arange(len(node_tags))
+    out = lut[tags]
+    if (out < 0).any():
+        raise ValueError("Element refers to an undefined node.")
+    return out.astype(np.int32)
+
+
+def _build(V, T, S=None, SM=None, R=None) -> TriMesh:
+    seg = lambda a: None if a is None or len(a) == 0 else np.asarray(a, dtype=np.int32)
+    return TriMesh(vertices=V, triangles=np.asarray(T, dtype=np.int32), segments=seg(S),
+                   segment_markers=seg(SM) if S is not None and len(S) else None,
+                   regions=None if R is None else np.asarray(R, dtype=np.int32))
+
+
+# -------- Gmsh --------
+# nodes per element type; only the corner nodes of types 8/9 are kept
+_GMSH_NPE = {1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5, 8: 3, 9: 6, 15: 1}
+_GMSH_LINES, _GMSH_TRIS = (1, 8), (2, 9)
+
+
+def _section(mm, name: str):
+    """Byte range of the body of $name ... $Endname, or None."""
+    i = mm.find(b"$" + name.encode() + b"\n")
+    if i < 0:
+        i = mm.find(b"$" + name.encode() + b"\r\n")
+        if i < 0:
+            return None
+    start = mm.find(b"\n", i) + 1
+    end = mm.find(b"$End" + name.encode(), start)
+    return start, end
+
+
+class _Cursor:
+    """Sequential reader over either ASCII tokens or binary bytes."""
+
+    def __init__(self, mm, start, end, binary, size_t=8):
+        self.binary = binary
+        self.mm = mm
+        self.pos = start
+        self.zfmt = "<Q" if size_t == 8 else "<I"
+        if not binary:
+            self.tok = _numbers(mm[start:end])
+            self.pos = 0
+
+    def _scalar(self, fmt):
+        if self.binary:
+            v = struct.unpack_from(fmt, self.mm, self.pos)[0]
+            self.pos += struct.calcsize(fmt)
+            return v
+        v = self.tok[self.pos]
+        self.pos += 1
+        return v if fmt == "<d" else int(v)
+
+    def i(self):
+        return self._scalar("<i")
+
+    def z(self):
+        return self._scalar(self.zfmt)
+
+    def d(self):
+        return self._scalar("<d")
+
+    def array(self, dtype, count):
+        dtype = np.dtype(dtype)
+        if self.binary:
+            a = np.frombuffer(self.mm, dtype=dtype, count=count, offset=self.pos)
+            self.pos += dtype.itemsize * count
+            return a
+        a = self.tok[self.pos:self.pos + count]
+        self.pos += count
+        return a if dtype.kind == "f" else a.astype(np.int64)
+
+    def skip_line(self):
+        # binary blocks in MSH 2.2 start after the ASCII count line
+        self.pos = self.mm.find(b"\n", self.pos) + 1
+
+
+def _gmsh_entities41(mm, binary, size_t):
+    """(dim, entity tag) -> first physical tag."""
+    sec = _section(mm, "Entities")
+    phys = {}
+    if sec is None:
+        return phys
+    c = _Cursor(mm, *sec, binary, size_t)
+    counts = [c.z() for _ in range(4)]
+    for dim, n in enumerate(counts):
+        for _ in range(n):
+            tag = c.i()
+            for _ in range(3 if dim == 0 else 6):
+                c.d()
+            tags = [c.i() for _ in range(c.z())]
+            if tags:
+                phys[(dim, tag)] = abs(tags[0])
+            if dim > 0:
+                for _ in range(c.z()):
+                    c.i()
+    return phys
+
+
+def _read_gmsh41(mm, binary, size_t):
+    phys = _gmsh_entities41(mm, binary, size_t)
+
+    c = _Cursor(mm, *_section(mm, "Nodes"), binary, size_t)
+    n_blocks, n_nodes = c.z(), c.z()
+    c.z(), c.z()
+    tags, coords = [], []
+    for _ in range(n_blocks):
+        dim = c.i()
+        c.i()                       # entity tag: nodes are matched by node tag
+        parametric, n = c.i(), c.z()
+        tags.append(c.array("<u8" if size_t == 8 else "<u4", n))
+        k = 3 + (dim if parametric else 0)
+        coords.append(c.array("<f8", n * k).reshape(n, k)[:, :2])
+    node_tags = np.concatenate(tags) if tags else np.empty(0, np.int64)
+    if len(node_tags) != n_nodes:
+        raise ValueError(f"Gmsh $Nodes header lists {n_nodes} nodes, blocks hold {len(node_tags)}.")
+    V = coords[0] if len(coords) == 1 else (np.vstack(coords) if coords else np.empty((0, 2)))
+
+    c = _Cursor(mm, *_section(mm, "Elements"), binary, size_t)
+    n_blocks = c.z()
+    c.z(), c.z(), c.z()
+    tris, tri_reg, lines, line_mark = [], [], [], []
+    for _ in range(n_blocks):
+        dim, tag, etype, n = c.i(), c.i(), c.i(), c.z()
+        npe = _GMSH_NPE.get(etype)
+        if npe is None:
+            raise ValueError(f"Unsupported Gmsh element type {etype}.")
+        rows = c.array("<u8" if size_t == 8 else "<u4", n * (1 + npe)).reshape(n, 1 + npe)
+        label = phys.get((dim, tag), tag)
+        if etype in _GMSH_TRIS:
+            tris.append(rows[:, 1:4])
+            tri_reg.append(np.full(n, label, dtype=np.int32))
+        elif etype in _GMSH_LINES:
+            lines.append(rows[:, 1:3])
+            line_mark.append(np.full(n, label, dtype=np.int32))
+    return V, node_tags, tris, tri_reg, lines, line_mark
+
+
+def _read_gmsh22(mm, binary):
+    c = _Cursor(mm, *_section(mm, "Nodes"), binary)
+    if binary:
+        n = int(mm[c.pos:mm.find(b"\n", c.pos)])
+        c.skip_line()
+        rec = np.dtype([("tag", "<i4"), ("xyz", "<f8", 3)])
+        nodes = np.frombuffer(mm, dtype=rec, count=n, offset=c.pos)
+        node_tags, V = nodes["tag"], nodes["xyz"][:, :2]
+    else:
+        n = int(c.tok[0])
+        rows = c.tok[1:1 + 4 * n].reshape(n, 4)
+        node_tags, V = rows[:, 0].astype(np.int64), rows[:, 1:3]
+
+    tris, tri_reg, lines, line_mark = [], [], [], []
+
+    def take(etype, tags, conn):
+        label = tags if tags is not None else np.zeros(len(conn), dtype=np.int32)
+        if etype in _GMSH_TRIS:
+            tris.append(conn[:, :3])
+            tri_reg.append(label)
+        elif etype in _GMSH_LINES:
+            lines.append(conn[:, :2])
+            line_mark.append(label)
+
+    start, end = _section(mm, "Elements")
+    if binary:
+        pos = mm.find(b"\n", start) + 1
+        total = int(mm[start:pos])
+        done = 0
+        while done < total:
+            etype, n, ntags = struct.unpack_from("<3i", mm, pos)
+            pos += 12
+            npe = _GMSH_NPE[etype]
+            rows = np.frombuffer(mm, dtype="<i4", count=n * (1 + ntags + npe), offset=pos)
+            rows = rows.reshape(n, 1 + ntags + npe)
+            pos += rows.nbytes
+            take(etype, rows[:, 1] if ntags else None, rows[:, 1 + ntags:])
+            done += n
+    else:
+        tok, width = _ragged(mm[mm.find(b"\n", start) + 1:end])
+        first = np.concatenate([[0], np.cumsum(width)[:-1]])
+        # rows have a length that depends on type and tag count: gather each
+        # distinct token count as one rectangular block
+        for w in np.unique(width[width > 0]):
+            at = first[width == w]
+            rows = tok[at[:, None] + np.arange(w)].astype(np.int64)
+            for etype in np.unique(rows[:, 1]):
+                sub = rows[rows[:, 1] == etype]
+                ntags = int(sub[0, 2])
+                take(int(etype), sub[:, 3] if ntags else None, sub[:, 3 + ntags:])
+    return V, node_tags, tris, tri_reg, lines, line_mark
+
+
+def read_gmsh(path) -> TriMesh:
+    """Gmsh MSH 2.2 or 4.1, ASCII or binary. Triangles (also 6-node, corners only) and lines are kept."""
+    mm = _map(path)
+    start, _ = _section(mm, "MeshFormat")
+    head = mm[start:mm.find(b"\n", start)].split()
+    version, binary, size_t = float(head[0]), int(head[1]) == 1, int(head[2])
+    if binary:
+        # endianness check: the int 1 right after the header line
+        one = struct.unpack_from("<i", mm, mm.find(b"\n", start) + 1)[0]
+        if one != 1:
+            raise ValueError("Big-endian Gmsh files are not supported.")
+    if version >= 4.1:
+        V, node_tags, tris, reg, lines, marks = _read_gmsh41(mm, binary, size_t)
+    elif version < 3:
+        V, node_tags, tris, reg, lines, marks = _read_gmsh22(mm, binary)
+    else:
+        raise ValueError(f"Unsupported Gmsh format version {version}.")
+
+    if not tris:
+        raise ValueError("The file contains no triangles.")
+    T = _index(np.vstack(tris), node_tags)
+    R = np.concatenate(reg)
+    S = _index(np.vstack(lines), node_tags) if lines else None
+    SM = np.concatenate(marks) if lines else None
+    return _build(V, T, S, SM, R)
+
+
+# -------- Triangle --------
+def _triangle_tokens(path) -> np.ndarray:
+    mm = _map(path)
+    data = bytes(mm) if mm.find(b"#") < 0 else re.sub(rb"#[^\n]*", b"", bytes(mm))
+    return _numbers(data)
+
+
+def read_triangle(basepath) -> TriMesh:
+    """
+    Triangle <base>.node and <base>.ele (first attribute = region), plus
+    segments with markers from <base>.poly if present. 0- and 1-based
+    numbering are both accepted.
+    """
+    base = os.path.splitext(str(basepath))[0]
+    tok = _triangle_tokens(base + ".node")
+    n, dim, nattr, nb = (int(v) for v in tok[:4])
+    rows = tok[4:4 + n * (1 + dim + nattr + nb)].reshape(n, 1 + dim + nattr + nb)
+    first = int(rows[0, 0]) if n else 0
+    V = rows[:, 1:3]
+    vmark = rows[:, 1 + dim + nattr] if nb else None
+
+    tok = _triangle_tokens(base + ".ele")
+    m, npe, eattr = (int(v) for v in tok[:3])
+    rows = tok[3:3 + m * (1 + npe + eattr)].reshape(m, 1 + npe + eattr)
+    T = rows[:, 1:4].astype(np.int64) - first
+    R = rows[:, 1 + npe] if eattr else None
+
+    S = SM = None
+    if os.path.exists(base + ".poly"):
+        tok = _triangle_tokens(base + ".poly")
+        pn, pdim, pattr, pnb = (int(v) for v in tok[:4])
+        pos = 4 + pn * (1 + pdim + pattr + pnb)
+        k, smk = int(tok[pos]), int(tok[pos + 1])
+        srows = tok[pos + 2:pos + 2 + k * (3 + smk)].reshape(k, 3 + smk)
+        S = srows[:, 1:3].astype(np.int64) - first
+        SM = srows[:, 3] if smk else np.ones(k)
+    elif vmark is not None and vmark.any():
+        # no .poly: recover boundary edges (used once) and mark them by vertex marker
+        e = np.sort(np.vstack([T[:, [0, 1]], T[:, [1, 2]], T[:, [2, 0]]]), axis=1)
+        key, cnt = np.unique(e[:, 0] * len(V) + e[:, 1], return_counts=True)
+        key = key[cnt == 1]
+        S = np.column_stack([key // len(V), key % len(V)])
+        SM = np.maximum(vmark[S[:, 0]], vmark[S[:, 1]])
+    return _build(V, T, S, SM, R)
+
+
+# -------- VTK XML --------
+_VTK_DTYPES = {"Float32": "<f4", "Float64": "<f8", "Int8": "i1", "UInt8": "u1",
+               "Int16": "<i2", "UInt16": "<u2", "Int32": "<i4", "UInt32": "<u4",
+               "Int64": "<i8", "UInt64": "<u8"}
+_VTK_LINE, _VTK_TRIANGLE, _VTK_QUADRATIC_TRIANGLE = 3, 5, 22
+
+
+def _vtk_array(el, root, mm, appended_start):
+    dtype = np.dtype(_VTK_DTYPES[el.get("type")])
+    ncomp = int(el.get("NumberOfComponents", 1))
+    fmt = el.get("format", "ascii")
+    header = np.dtype(_VTK_DTYPES[root.get("header_type", "UInt32")])
+    compressed = root.get("compressor") is not None
+    if root.get("byte_order", "LittleEndian") != "LittleEndian":
+        raise ValueError("Big-endian VTK files are not supported.")
+
+    if fmt == "ascii":
+        a = _numbers((el.text or "").encode()).astype(dtype)
+    elif fmt == "appended":
+        pos = appended_start + int(el.get("offset"))
+        if compressed:
+            nblocks = int(np.frombuffer(mm, header, 1, pos)[0])
+            hdr = np.frombuffer(mm, header, 3 + nblocks, pos).astype(np.int64)
+            pos += hdr.nbytes
+            parts = []
+            for size in hdr[3:]:
+                parts.append(zlib.decompress(mm[pos:pos + size]))
+                pos += size
+            a = np.frombuffer(b"".join(parts), dtype=dtype)
+        else:
+            nbytes = int(np.frombuffer(mm, header, 1, pos)[0])
+            a = np.frombuffer(mm, dtype=dtype, count=nbytes // dtype.itemsize,
+                              offset=pos + header.itemsize)
+    elif fmt == "binary":
+        text = "".join((el.text or "").split())
+        b64len = lambda nbytes: 4 * ((nbytes + 2) // 3)
+        # header: [nbytes] or, compressed, [nblocks, block, last, sizes...]
+        first = int(np.frombuffer(base64.b64decode(text[:b64len(header.itemsize)]), header, 1)[0])
+        hbytes = header.itemsize * ((3 + first) if compressed else 1)
+        hdr = np.frombuffer(base64.b64decode(text[:b64len(hbytes)]), header, hbytes // header.itemsize)
+        sizes = hdr[3:].astype(np.int64) if compressed else hdr[:1].astype(np.int64)
+        # VTK encodes the header on its own, other writers encode header and
+        # data as one stream: accept both
+        raw = base64.b64decode(text[b64len(hbytes):])
+        if len(raw) < sizes.sum():
+            raw = base64.b64decode(text)[hbytes:]
+        if compressed:
+            bounds = np.concatenate([[0], np.cumsum(sizes)])
+            raw = b"".join(zlib.decompress(raw[s:e]) for s, e in zip(bounds[:-1], bounds[1:]))
+        else:
+            raw = raw[:sizes[0]]
+        a = np.frombuffer(raw, dtype=dtype)
+    else:
+        raise ValueError(f"Unknown VTK data format: {fmt}")
+    return a.reshape(-1, ncomp) if ncomp > 1 else a
+
+
+def read_vtu(path) -> TriMesh:
+    """
+    VTK XML UnstructuredGrid (single piece). Raw appended arrays are mapped;
+    zlib-compressed appended, inline ascii and inline base64 are decoded.
+    Triangle cells (also quadratic, corners only) become triangles, line
+    cells boundary segments; "region"/"boundary_marker" cell arrays (as
+    written by pdekit.mesh.exporters) become regions/markers.
+    """
+    mm = _map(path)
+    i = mm.find(b"<AppendedData")
+    appended_start = -1
+    if i >= 0:
+        if b'encoding="raw"' not in mm[i:mm.find(b">", i)]:
+            raise ValueError("Only raw appended VTK data is supported.")
+        appended_start = mm.find(b"_", i) + 1
+        xml_text = mm[:i] + b"</VTKFile>"
+    else:
+        xml_text = bytes(mm)
+    root = ET.fromstring(xml_text)
+    piece = root.find("UnstructuredGrid/Piece")
+    if piece is None:
+        raise ValueError("Not a VTK UnstructuredGrid file.")
+
+    arr = lambda el: _vtk_array(el, root, mm, appended_start)
+    P = arr(piece.find("Points/DataArray"))
+    V = P[:, :2]
+    cells = {el.get("Name"): arr(el) for el in piece.findall("Cells/DataArray")}
+    conn = cells["connectivity"].astype(np.int64)
+    offs = cells["offsets"].astype(np.int64)
+    types = cells["types"].astype(np.int64)
+    starts = np.concatenate([[0], offs[:-1]])
+    cdata = {el.get("Name"): arr(el) for el in piece.findall("CellData/DataArray")}
+
+    is_tri = (types == _VTK_TRIANGLE) | (types == _VTK_QUADRATIC_TRIANGLE)
+    is_line = types == _VTK_LINE
+    if not is_tri.any():
+        raise ValueError("The file contains no triangle cells.")
+    if is_tri.all() and np.array_equal(offs, 3 * np.arange(1, len(offs) + 1)):
+        T = conn.reshape(-1, 3)
+    else:
+        T = conn[starts[is_tri, None] + np.arange(3)]
+    S = conn[starts[is_line, None] + np.arange(2)] if is_line.any() else None
+
+    reg = cdata.get("region", cdata.get("CellEntityIds"))
+    mark = cdata.get("boundary_marker", cdata.get("CellEntityIds"))
+    R = reg[is_tri] if reg is not None else None
+    SM = mark[is_line] if (mark is not None and S is not None) else None
+    return _build(V, T, S, SM, R)
+
+
+# -------- dispatch --------
+def read_mesh(path, fmt: str | None = None) -> TriMesh:
+    """Pick a reader from `fmt` ('msh', 'vtu', 'triangle') or the file extension."""
+    ext = f".{fmt.lower().lstrip('.')}" if fmt else os.path.splitext(str(path))[1].lower()
+    if ext == ".msh":
+        return read_gmsh(path)
+    if ext == ".vtu":
+        return read_vtu(path)
+    if ext in (".node", ".ele", ".poly", ".triangle"):
+        return read_triangle(path)
+    raise ValueError(f"Unsupported mesh format: {fmt or ext or path}")
+
+
+__all__ = ["read_gmsh", "read_triangle", "read_vtu", "read_mesh"]
@@ -0,0 +1,184 @@
+# pdekit/mesh/locator.py
+"""
+Batched point location and field probing on triangle meshes.
+
+PointLocator answers "which triangle contains each of these N points, and
+with which barycentric weights" in one vectorized call:
+
+  * a uniform bucket grid over the mesh bounding box lists, per cell, the
+    triangles whose bounding box overlaps it (about `cell_load` triangles
+    per cell); a query tests each point only against its cell's list;
+  * when a good starting triangle is known (cursor hover, consecutive
+    probes along a line, the previous time step) the points instead walk
+    through the triangle neighbours (pdekit.utils.accel.locate_walk) and
+    only walks that leave the mesh fall back to the grid.
+
+Points outside the mesh get triangle -1 and NaN weights. probe() and
+sample_line() interpolate nodal (P1) or per-triangle fields on top of it.
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+from pdekit.utils.accel import locate_walk
+
+_EPS = 1e-300
+
+
+def barycentric(vertices: np.ndarray, triangles: np.ndarray, tri: np.ndarray,
+                points: np.ndarray) -> np.ndarray:
+    """Barycentric coordinates (k, 3) of points (k, 2) in triangles tri (k,)."""
+    T = triangles[tri]
+    A, B, C = vertices[T[:, 0]], vertices[T[:, 1]], vertices[T[:, 2]]
+    v0, v1, v2 = B - A, C - A, points - A
+    det = v0[:, 0] * v1[:, 1] - v1[:, 0] * v0[:, 1]
+    det = np.where(np.abs(det) < _EPS, _EPS, det)
+    l1 = (v2[:, 0] * v1[:, 1] - v1[:, 0] * v2[:, 1]) / det
+    l2 = (v0[:, 0] * v2[:, 1] - v2[:, 0] * v0[:, 1]) / det
+    return np.column_stack([1.0 - l1 - l2, l1, l2])
+
+
+class PointLocator:
+    """
+    Bucket grid over a triangle mesh. `neighbors` (Topology.neighbors) is
+    only needed for walks from a start triangle.
+    """
+
+    def __init__(self, vertices: np.ndarray, triangles: np.ndarray,
+                 neighbors: np.ndarray | None = None, cell_load: float = 2.0):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        self.triangles = np.asarray(triangles, dtype=np.int64)
+        self.neighbors = neighbors
+        V, T = self.vertices, self.triangles
+        M = len(T)
+
+        self.origin = V.min(axis=0) if len(V) else np.zeros(2)
+        extent = np.maximum((V.max(axis=0) if len(V) else np.ones(2)) - self.origin, 1e-12)
+        cells = max(M / max(cell_load, 1e-3), 1.0)
+        nx = max(int(np.ceil(np.sqrt(cells * extent[0] / extent[1]))), 1)
+        ny = max(int(np.ceil(cells / nx)), 1)
+        self.shape = (nx, ny)
+        self.cell = extent / (nx, ny)
+
+        # every (triangle, cell) pair of the triangles' bounding boxes
+        P = V[T]
+        i0 = self._cell_index(P.min(axis=1))
+        i1 = self._cell_index(P.max(axis=1))
+        cx, cy = i1[:, 0] - i0[:, 0] + 1, i1[:, 1] - i0[:, 1] + 1
+        count = cx * cy
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        cxr = np.repeat(cx, count)
+        ix = np.repeat(i0[:, 0], count) + k % cxr
+        iy = np.repeat(i0[:, 1], count) + k // cxr
+        cell = iy * nx + ix
+        order = np.argsort(cell, kind="stable")
+        self.cell_ptr = np.concatenate([[0], np.cumsum(np.bincount(cell, minlength=nx * ny))])
+        self.cell_triangles = np.repeat(np.arange(M), count)[order]
+
+    def _cell_index(self, xy: np.ndarray) -> np.ndarray:
+        i = np.floor((xy - self.origin) / self.cell).astype(np.int64)
+        return np.clip(i, 0, np.array(self.shape) - 1)
+
+    def locate(self, points: np.ndarray, start: np.ndarray | None = None,
+               tol: float = 1e-10, chunk: int = 1 << 18) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Containing triangle (N,) and barycentric weights (N, 3) of points
+        (N, 2); -1 / NaN outside the mesh. `start` (N,) are optional
+        starting triangles for a neighbour walk (-1 entries use the grid).
+        """
+        pts = np.ascontiguousarray(np.reshape(points, (-1, 2)), dtype=np.float64)
+        tri = np.full(len(pts), -1, dtype=np.int64)
+        bary = np.full((len(pts), 3), np.nan)
+        if not len(pts) or not len(self.triangles):
+            return tri, bary
+
+        todo = np.arange(len(pts))
+        if start is not None and self.neighbors is not None:
+            start = np.broadcast_to(np.asarray(start, dtype=np.int64), (len(pts),))
+            walk = np.flatnonzero(start >= 0)
+            if len(walk):
+                found = locate_walk(self.vertices, self.triangles, self.neighbors,
+                                    pts[walk], start[walk], tol=tol)
+                tri[walk] = found
+                todo = np.flatnonzero(tri < 0)
+
+        for s in range(0, len(todo), chunk):
+            idx = todo[s:s + chunk]
+            tri[idx] = self._grid_locate(pts[idx], tol)
+        hit = tri >= 0
+        bary[hit] = barycentric(self.vertices, self.triangles, tri[hit], pts[hit])
+        return tri, bary
+
+    def _grid_locate(self, pts: np.ndarray, tol: float) -> np.ndarray:
+        out = np.full(len(pts), -1, dtype=np.int64)
+        raw = np.floor((pts - self.origin) / self.cell).astype(np.int64)
+        inside = np.all((raw >= 0) & (raw <= np.array(self.shape)), axis=1)
+        c = self._cell_index(pts)
+        c = c[:, 1] * self.shape[0] + c[:, 0]
+        lo = self.cell_ptr[c]
+        count = np.where(inside, self.cell_ptr[c + 1] - lo, 0)
+        if not count.sum():
+            return out
+
+        # test every point against its cell's candidates, keep the best fit
+        owner = np.repeat(np.arange(len(pts)), count)
+        k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        cand = self.cell_triangles[np.repeat(lo, count) + k]
+        score = barycentric(self.vertices, self.triangles, cand, pts[owner]).min(axis=1)
+        has = count > 0
+        first = (np.cumsum(count) - count)[has]
+        best = np.full(len(pts), -np.inf)
+        best[has] = np.maximum.reduceat(score, first)
+        pick = np.flatnonzero((score == best[owner]) & (score >= -tol))
+        pick = pick[np.concatenate([[True], owner[pick][1:] != owner[pick][:-1]])] if len(pick) else pick
+        out[owner[pick]] = cand[pick]
+        return out
+
+
+# -------- probing --------
+def interpolate(triangles: np.ndarray, tri: np.ndarray, bary: np.ndarray,
+                values: np.ndarray, location: str = "node") -> np.ndarray:
+    """
+    Evaluate a field at located points: nodal values (n,) or (n, k) are
+    interpolated linearly, per-triangle ('element') values taken as
+    constant. NaN where tri is -1.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    hit = tri >= 0
+    out = np.full((len(tri),) + values.shape[1:], np.nan)
+    if location == "element":
+        out[hit] = values[tri[hit]]
+    elif location == "node":
+        T = triangles[tri[hit]]
+        w = bary[hit].reshape(bary[hit].shape + (1,) * (values.ndim - 1))
+        out[hit] = (values[T] * w).sum(axis=1)
+    else:
+        raise ValueError(f"Unknown field location: {location}")
+    return out
+
+
+def probe(mesh, values: np.ndarray, points: np.ndarray, location: str = "auto") -> np.ndarray:
+    """
+    Values of a field on `mesh` at points (N, 2); NaN outside the mesh.
+    location: 'node', 'element' or 'auto' (decided by length).
+    """
+    if location == "auto":
+        location = "node" if len(values) == len(mesh.vertices) else "element"
+    tri, bary = mesh.locate(points)
+    return interpolate(np.asarray(mesh.triangles), tri, bary, values, location)
+
+
+def sample_line(mesh, values: np.ndarray, a, b, n: int = 200,
+                location: str = "auto") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Field along the segment a -> b at n equally spaced points: returns the
+    arc length s (n,), the points (n, 2) and the values (NaN off the mesh).
+    """
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    t = np.linspace(0.0, 1.0, max(int(n), 2))
+    xy = a + t[:, None] * (b - a)
+    return t * np.hypot(*(b - a)), xy, probe(mesh, values, xy, location)
+
+
+__all__ = ["barycentric", "PointLocator", "interpolate", "probe", "sample_line"]
@@ -0,0 +1,184 @@
+# pdekit/mesh/preprocess.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, MultiPolygon, GeometryCollection
+
+
+@dataclass
+class PreprocessOptions:
+    """
+    Geometry clean-up applied before the PSLG is built. Tolerances are
+    fractions of the target edge length h (derived from max_area, or from
+    the domain size when no area limit is set); 0 disables a step. Off by
+    default: simplification and edge collapse also thin out the rings the
+    curve discretizer sized for the mesh.
+    """
+    enabled: bool = False
+    snap_frac: float = 1e-4          # snap vertices to the power-of-ten grid at or below snap_frac * h
+    simplify_frac: float = 1e-2      # topology-preserving simplification tolerance
+    short_edge_frac: float = 0.1     # collapse edges shorter than this * h
+    sliver_area_frac: float = 0.05   # drop holes/parts with area below this * h^2 ...
+    sliver_width_frac: float = 0.1   # ... that are also thinner (2 A / P) than this * h
+
+
+@dataclass
+class PreprocessReport:
+    """Feature counts before/after preprocessing."""
+    vertices_before: int
+    vertices_after: int
+    rings_before: int
+    rings_after: int
+    holes_removed: int
+    parts_removed: int
+    target_size: float
+    rings_collapsed: int = 0     # rings that vanished in snapping / short-edge collapse
+
+    def summary(self) -> str:
+        dv = self.vertices_before - self.vertices_after
+        pct = 100.0 * dv / self.vertices_before if self.vertices_before else 0.0
+        return (f"Preprocess: {self.vertices_before} -> {self.vertices_after} vertices "
+                f"(-{pct:.1f}%), {self.rings_before} -> {self.rings_after} rings, "
+                f"{self.rings_collapsed} rings collapsed, "
+                f"{self.holes_removed} sliver holes and {self.parts_removed} sliver parts removed")
+
+
+def target_edge_length(geom, max_area: float | None = None) -> float:
+    """Edge length of an equilateral triangle of area max_area (or 2% of the domain diagonal)."""
+    if max_area is not None and max_area > 0:
+        return float(np.sqrt(4.0 * float(max_area) / np.sqrt(3.0)))
+    x0, y0, x1, y1 = geom.bounds
+    return 0.02 * float(np.hypot(x1 - x0, y1 - y0)) or 1.0
+
+
+def _polygons(geom) -> List[Polygon]:
+    if isinstance(geom, Polygon):
+        return [] if geom.is_empty else [geom]
+    if isinstance(geom, (MultiPolygon, GeometryCollection)):
+        return [g for g in geom.geoms if isinstance(g, Polygon) and not g.is_empty]
+    return []
+
+
+def _counts(polys: List[Polygon]) -> Tuple[int, int]:
+    rings = sum(1 + len(p.interiors) for p in polys)
+    # closed rings repeat their first vertex
+    verts = int(shapely.get_num_coordinates(np.asarray(polys, dtype=object)).sum()) - rings if polys else 0
+    return verts, rings
+
+
+def _is_sliver(ring_poly: Polygon, min_area: float, max_width: float) -> bool:
+    """Small and thin: long channels or slots of real size are kept."""
+    a = ring_poly.area
+    if a >= min_area:
+        return False
+    perim = ring_poly.length
+    return perim <= 0 or 2.0 * a / perim < max_width
+
+
+def _collapse_ring(ring, tol: float):
+    """Ring without edges shorter than tol, or None if it degenerates."""
+    try:
+        out = shapely.remove_repeated_points(ring, tol)
+    except shapely.errors.GEOSException:
+        return None
+    if out.is_empty or len(out.coords) < 4 or Polygon(out).area <= 0:
+        return None
+    return out
+
+
+def _collapse_short_edges(polys: List[Polygon], tol: float, min_area: float,
+                          max_width: float) -> Tuple[List[Polygon], int]:
+    """
+    Collapse short edges ring by ring. A ring that degenerates is dropped
+    only if it is a sliver itself; otherwise it is kept as it was, so thin
+    slots and channels of real size survive. Returns (polygons, rings dropped).
+    """
+    out, collapsed = [], 0
+    for p in polys:
+        shell = _collapse_ring(p.exterior, tol)
+        if shell is None:
+            if _is_sliver(p, min_area, max_width):
+                collapsed += 1 + len(p.interiors)
+                continue
+            shell = p.exterior
+        holes = []
+        for ring in p.interiors:
+            r = _collapse_ring(ring, tol)
+            if r is None:
+                if _is_sliver(Polygon(ring), min_area, max_width):
+                    collapsed += 1
+                    continue
+                r = ring
+            holes.append(r)
+        out.append(Polygon(shell, holes))
+    return out, collapsed
+
+
+def preprocess_geometry(geom, max_area: float | None = None,
+                        options: PreprocessOptions | None = None):
+    """
+    Clean a (Multi)Polygon domain before meshing:
+      1. snap vertices to a tolerance grid (shapely.set_precision),
+      2. topology-preserving simplification,
+      3. collapse edges shorter than a fraction of the target size,
+      4. remove sliver holes and sliver parts left over from boolean ops.
+    Returns (clean_geometry, PreprocessReport).
+    """
+    opts = options or PreprocessOptions()
+    polys = _polygons(geom)
+    v0, r0 = _counts(polys)
+    h = target_edge_length(geom, max_area) if polys else 1.0
+
+    if not opts.enabled or not polys:
+        return geom, PreprocessReport(v0, v0, r0, r0, 0, 0, h)
+
+    g = MultiPolygon(polys) if len(polys) > 1 else polys[0]
+    if not g.is_valid:
+        g = shapely.make_valid(g)
+
+    if opts.snap_frac > 0:
+        # a round grid leaves exactly placed coordinates (0.5, 1.25, ...) alone
+        g = shapely.set_precision(g, 10.0 ** np.floor(np.log10(opts.snap_frac * h)))
+    if opts.simplify_frac > 0:
+        g = g.simplify(opts.simplify_frac * h, preserve_topology=True)
+    min_area = opts.sliver_area_frac * h * h
+    max_width = opts.sliver_width_frac * h
+    # rings lost to snapping / simplification so far
+    rings_collapsed = max(r0 - _counts(_polygons(g))[1], 0)
+    if opts.short_edge_frac > 0:
+        parts, n = _collapse_short_edges(_polygons(g), opts.short_edge_frac * h, min_area, max_width)
+        rings_collapsed += n
+        g = MultiPolygon(parts) if len(parts) != 1 else parts[0]
+        if not g.is_valid:
+            g = shapely.make_valid(g)
+
+    # sliver removal on holes and on whole parts
+    holes_removed = parts_removed = 0
+    kept = []
+    for p in _polygons(g):
+        if _is_sliver(p, min_area, max_width):
+            parts_removed += 1
+            continue
+        holes = []
+        for ring in p.interiors:
+            if _is_sliver(Polygon(ring), min_area, max_width):
+                holes_removed += 1
+            else:
+                holes.append(ring)
+        if len(holes) != len(p.interiors):
+            p = Polygon(p.exterior, holes)
+        kept.append(p)
+
+    if not kept:
+        # everything looked like noise --> keep the input rather than nothing
+        return geom, PreprocessReport(v0, v0, r0, r0, 0, 0, h)
+
+    out = kept[0] if len(kept) == 1 else MultiPolygon(kept)
+    v1, r1 = _counts(kept)
+    return out, PreprocessReport(v0, v1, r0, r1, holes_removed, parts_removed, h, rings_collapsed)
+
+
+__all__ = ["PreprocessOptions", "PreprocessReport", "preprocess_geometry", "target_edge_length"]
@@ -0,0 +1,282 @@
+# pdekit/mesh/structured.py
+"""
+Structured meshes for rectangles, unions of axis-aligned rectangles and
+convex quadrilaterals, built with NumPy index arithmetic only (no PSLG, no
+Triangle). Every grid cell is split into two triangles, so a single
+rectangle with nx * ny cells has exactly (nx + 1) * (ny + 1) nodes and
+2 * nx * ny triangles.
+
+Boundary segments, markers (one per ring, numbered from 1 in PSLG order)
+and regions (1-based polygon part) follow pdekit.mesh.generator, so the
+result can be used wherever a Triangle mesh is.
+"""
+from __future__ import annotations
+from typing import Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, MultiPolygon
+
+from pdekit.mesh.generator import TriMesh
+
+
+def graded_spacing(a: float, b: float, n: int, ratio: float = 1.0,
+                   symmetric: bool = False) -> np.ndarray:
+    """
+    n + 1 coordinates from a to b. `ratio` is last cell size / first cell
+    size (geometric progression); with symmetric=True the grading runs from
+    both ends towards the middle (e.g. cells clustered at channel walls when
+    ratio > 1 grows them towards the center).
+    """
+    n = max(int(n), 1)
+    ratio = float(ratio)
+    if ratio == 1.0 or n == 1:
+        return np.linspace(a, b, n + 1)
+    if symmetric:
+        m = (n + 1) // 2
+        half = (ratio ** (1.0 / max(m - 1, 1))) ** np.arange(m)
+        sizes = np.concatenate([half, half[::-1] if n % 2 == 0 else half[-2::-1]])
+    else:
+        sizes = (ratio ** (1.0 / (n - 1))) ** np.arange(n)
+    t = np.concatenate([[0.0], np.cumsum(sizes)])
+    t /= t[-1]
+    return a + (b - a) * t
+
+
+def _tensor_mesh(X: np.ndarray, Y: np.ndarray, keep: np.ndarray, region: np.ndarray,
+                 diagonal: str = "right"):
+    """
+    Triangulate the kept cells of a logical (ny, nx) grid whose nodes sit at
+    X, Y (both (ny + 1, nx + 1)). Returns vertices, triangles, per-triangle
+    region ids and the grid node -> vertex lookup; unused grid nodes are
+    dropped.
+    """
+    ny, nx = keep.shape
+    j, i = np.nonzero(keep)
+    a = j * (nx + 1) + i                    # lower-left node of each cell
+    b, c, d = a + 1, a + nx + 2, a + nx + 1  # lower-right, upper-right, upper-left
+    if diagonal == "right":
+        flip = np.zeros(len(a), dtype=bool)
+    elif diagonal == "left":
+        flip = np.ones(len(a), dtype=bool)
+    elif diagonal == "alternate":
+        flip = (i + j) % 2 == 1
+    else:
+        raise ValueError(f"Unknown diagonal: {diagonal}")
+    # a-c diagonal: (a, b, c), (a, c, d); b-d diagonal: (a, b, d), (b, c, d)
+    t0 = np.where(flip[:, None], np.column_stack([a, b, d]), np.column_stack([a, b, c]))
+    t1 = np.where(flip[:, None], np.column_stack([b, c, d]), np.column_stack([a, c, d]))
+    T = np.empty((2 * len(a), 3), dtype=np.int64)
+    T[0::2], T[1::2] = t0, t1
+
+    used = np.zeros((ny + 1) * (nx + 1), dtype=bool)
+    used[T.ravel()] = True
+    lut = np.cumsum(used) - 1
+    V = np.column_stack([X.ravel()[used], Y.ravel()[used]])
+    return V, lut[T].astype(np.int32), np.repeat(region[j, i], 2).astype(np.int32), lut
+
+
+def _boundary_edges(keep: np.ndarray) -> np.ndarray:
+    """Grid-node index pairs of the cell-mask boundary (outside on the right)."""
+    ny, nx = keep.shape
+    k = np.pad(keep, 1)
+    # horizontal edges on grid line j between columns i, i+1
+    below, above = k[:-1, 1:-1], k[1:, 1:-1]        # (ny + 1, nx)
+    j, i = np.nonzero(below != above)
+    n0 = j * (nx + 1) + i
+    fwd = above[j, i]                                # cell above is inside: run +x
+    h = np.where(fwd[:, None], np.column_stack([n0, n0 + 1]), np.column_stack([n0 + 1, n0]))
+    # vertical edges on grid line i between rows j, j+1
+    left, right = k[1:-1, :-1], k[1:-1, 1:]         # (ny, nx + 1)
+    j, i = np.nonzero(left != right)
+    n0 = j * (nx + 1) + i
+    fwd = left[j, i]                                 # cell on the left is inside: run +y
+    v = np.where(fwd[:, None], np.column_stack([n0, n0 + nx + 1]), np.column_stack([n0 + nx + 1, n0]))
+    return np.vstack([h, v])
+
+
+def _finish(X, Y, keep, region, geom, diagonal) -> TriMesh:
+    V, T, R, lut = _tensor_mesh(X, Y, keep, region, diagonal)
+    # every boundary grid node belongs to a kept cell, so lut covers it
+    S = lut[_boundary_edges(keep)].astype(np.int32)
+    SM = _ring_markers(geom, V[S].mean(axis=1))
+    return TriMesh(vertices=V, triangles=T, segments=S, segment_markers=SM, regions=R)
+
+
+def _rings(geom):
+    polys = list(geom.geoms) if isinstance(geom, MultiPolygon) else [geom]
+    return [r for p in polys if not p.is_empty for r in (p.exterior, *p.interiors)]
+
+
+def _ring_markers(geom, points: np.ndarray) -> np.ndarray:
+    """1-based index of the ring (PSLG order) nearest to each point."""
+    rings = _rings(geom)
+    if len(rings) == 1:
+        return np.ones(len(points), dtype=np.int32)
+    tree = shapely.STRtree(rings)
+    pts = shapely.points(points)
+    idx = tree.query_nearest(pts, all_matches=False)
+    out = np.ones(len(points), dtype=np.int32)
+    out[idx[0]] = idx[1] + 1
+    return out
+
+
+# -------- public builders --------
+def structured_rectangle(x0: float, y0: float, x1: float, y1: float, nx: int, ny: int, *,
+                         grading: Tuple[float, float] = (1.0, 1.0),
+                         symmetric: Tuple[bool, bool] = (False, False),
+                         diagonal: str = "right") -> TriMesh:
+    """
+    Regular or graded mesh of the rectangle [x0, x1] x [y0, y1] with
+    nx * ny cells: (nx + 1) * (ny + 1) nodes, 2 * nx * ny triangles.
+    `grading`/`symmetric` are passed per axis to graded_spacing();
+    `diagonal` is 'right', 'left' or 'alternate'.
+    """
+    (x0, x1), (y0, y1) = sorted((x0, x1)), sorted((y0, y1))
+    xs = graded_spacing(x0, x1, nx, grading[0], symmetric[0])
+    ys = graded_spacing(y0, y1, ny, grading[1], symmetric[1])
+    X, Y = np.meshgrid(xs, ys)
+    keep = np.ones((len(ys) - 1, len(xs) - 1), dtype=bool)
+    return _finish(X, Y, keep, keep.astype(np.int32), shapely.box(x0, y0, x1, y1), diagonal)
+
+
+def mapped_quad(corners: Sequence[Tuple[float, float]], nx: int, ny: int, *,
+                diagonal: str = "right") -> TriMesh:
+    """
+    Mesh of a convex quadrilateral by bilinear mapping of an nx * ny grid;
+    corners are given counter-clockwise, the first one maps to (0, 0) and
+    the second to (1, 0).
+    """
+    P = np.asarray(corners, dtype=np.float64)
+    s, t = np.meshgrid(np.linspace(0, 1, int(nx) + 1), np.linspace(0, 1, int(ny) + 1))
+    w = np.stack([(1 - s) * (1 - t), s * (1 - t), s * t, (1 - s) * t], -1)
+    X, Y = w @ P[:, 0], w @ P[:, 1]
+    keep = np.ones((int(ny), int(nx)), dtype=bool)
+    return _finish(X, Y, keep, keep.astype(np.int32), Polygon(P), diagonal)
+
+
+def _breaks(v: np.ndarray, tol: float) -> np.ndarray:
+    v = np.sort(v)
+    return v[np.concatenate([[True], np.diff(v) > tol])]
+
+
+def _subdivide(breaks: np.ndarray, h: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Split each interval into ceil(len / h) equal cells: (coordinates, cells per interval)."""
+    L = np.diff(breaks)
+    n = np.maximum(np.ceil(L / h - 1e-9).astype(np.int64), 1)
+    k = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)     # index within interval
+    x = np.repeat(breaks[:-1], n) + np.repeat(L / n, n) * k
+    return np.append(x, breaks[-1]), n
+
+
+def rectilinear_mesh(geom, h: float | None = None, *, diagonal: str = "right") -> TriMesh:
+    """
+    Mesh of a (Multi)Polygon whose edges are all axis-aligned (a union of
+    rectangles, holes allowed). The distinct vertex x and y values define a
+    tensor grid of blocks; each block is split into cells of size <= h
+    (default: the smallest block width), cells outside the domain are
+    dropped. Blocks share grid lines, so the mesh is conforming.
+    """
+    xy = shapely.get_coordinates(geom)
+    span = np.ptp(xy, axis=0).max()
+    tol = 1e-9 * max(span, 1.0)
+    bx, by = _breaks(xy[:, 0], tol), _breaks(xy[:, 1], tol)
+    if h is None or h <= 0:
+        h = min(np.diff(bx).min(), np.diff(by).min())
+
+    # which block lies in which polygon part (block centers)
+    parts = list(geom.geoms) if isinstance(geom, MultiPolygon) else [geom]
+    cx, cy = np.meshgrid(0.5 * (bx[:-1] + bx[1:]), 0.5 * (by[:-1] + by[1:]))
+    hit = shapely.STRtree(parts).query(shapely.points(cx.ravel(), cy.ravel()), predicate="within")
+    block_region = np.zeros(cx.size, dtype=np.int32)
+    block_region[hit[0]] = hit[1] + 1
+    block_region = block_region.reshape(cx.shape)
+
+    xs, nxb = _subdivide(bx, h)
+    ys, nyb = _subdivide(by, h)
+    region = np.repeat(np.repeat(block_region, nyb, axis=0), nxb, axis=1)
+    X, Y = np.meshgrid(xs, ys)
+    return _finish(X, Y, region > 0, region, geom, diagonal)
+
+
+# -------- detection --------
+def is_rectilinear(geom, rtol: float = 1e-9) -> bool:
+    """True for a (Multi)Polygon whose ring edges are all horizontal or vertical."""
+    if not isinstance(geom, (Polygon, MultiPolygon)) or geom.is_empty:
+        return False
+    tol = rtol * max(np.ptp(shapely.get_coordinates(geom), axis=0).max(), 1.0)
+    for ring in _rings(geom):
+        d = np.abs(np.diff(np.asarray(ring.coords), axis=0))
+        if not np.all((d[:, 0] <= tol) | (d[:, 1] <= tol)):
+            return False
+    return True
+
+
+def _quad_corners(geom, min_angle: float = 45.0):
+    """Counter-clockwise corners of a convex, reasonably shaped quadrilateral, else None."""
+    if not isinstance(geom, Polygon) or geom.interiors:
+        return None
+    P = np.asarray(shapely.orient_polygons(geom).exterior.coords)[:-1]
+    if len(P) != 4:
+        return None
+    e = np.roll(P, -1, axis=0) - P
+    cross = e[:, 0] * np.roll(e, -1, axis=0)[:, 1] - e[:, 1] * np.roll(e, -1, axis=0)[:, 0]
+    if np.any(cross <= 0):
+        return None
+    cos = -(e * np.roll(e, 1, axis=0)).sum(1) / (np.hypot(*e.T) * np.hypot(*np.roll(e, 1, axis=0).T))
+    ang = np.degrees(np.arccos(np.clip(cos, -1, 1)))
+    if ang.min() < min_angle or ang.max() > 180.0 - min_angle:
+        return None
+    return P
+
+
+def _cells(breaks: np.ndarray, h: float) -> int:
+    return int(np.maximum(np.ceil(np.diff(breaks) / h - 1e-9), 1).sum())
+
+
+def structured_mesh(geom, max_area: float | None = None, diagonal: str = "right",
+                    max_nodes: int = 10_000) -> TriMesh | None:
+    """
+    Structured mesh of `geom` if it is rectilinear or a convex quadrilateral,
+    else None. Cells are sized so both triangles stay below max_area.
+    Without max_area the cell size follows the narrowest block, which a
+    slightly misaligned edge makes tiny: then the grid is only built if it
+    has at most `max_nodes` nodes.
+    """
+    h = np.sqrt(2.0 * float(max_area)) if max_area else None
+    if is_rectilinear(geom):
+        if h is None:
+            xy = shapely.get_coordinates(geom)
+            tol = 1e-9 * max(np.ptp(xy, axis=0).max(), 1.0)
+            bx, by = _breaks(xy[:, 0], tol), _breaks(xy[:, 1], tol)
+            h = min(np.diff(bx).min(), np.diff(by).min())
+            if (_cells(bx, h) + 1) * (_cells(by, h) + 1) > max_nodes:
+                return None
+        return rectilinear_mesh(geom, h, diagonal=diagonal)
+    P = _quad_corners(geom)
+    if P is None:
+        return None
+    e = np.hypot(*(np.roll(P, -1, axis=0) - P).T)
+    free = h is None
+    if free:
+        h = e.min()
+    # bilinear cells are not rectangles: leave some margin on the area bound
+    nx = max(int(np.ceil(max(e[0], e[2]) / (0.9 * h))), 1)
+    ny = max(int(np.ceil(max(e[1], e[3]) / (0.9 * h))), 1)
+    if free and (nx + 1) * (ny + 1) > max_nodes:
+        return None
+    return mapped_quad(P, nx, ny, diagonal=diagonal)
+
+
+def min_angle(mesh: TriMesh) -> float:
+    """Smallest interior angle of the mesh triangles, in degrees."""
+    P = mesh.vertices[mesh.triangles]
+    e = np.roll(P, -1, axis=1) - P                       # edge i: corner i -> i + 1
+    a, b = -np.roll(e, 1, axis=1), e                     # the two edges leaving corner i
+    norm = np.linalg.norm(a, axis=-1) * np.linalg.norm(b, axis=-1)
+    cos = (a * b).sum(-1) / np.maximum(norm, 1e-300)
+    return float(np.degrees(np.arccos(np.clip(cos, -1.0, 1.0))).min()) if len(P) else 180.0
+
+
+__all__ = ["graded_spacing", "structured_rectangle", "mapped_quad", "rectilinear_mesh",
+           "is_rectilinear", "structured_mesh", "min_angle"]
@@ -0,0 +1,141 @@
+# pdekit/mesh/topology.py
+"""
+Adjacency of a triangle mesh, built once with array operations.
+
+Conventions (as Triangle's `n` switch): local edge i of a triangle is the
+edge opposite its vertex i, running T[i+1] -> T[i+2]; neighbors[t, i] is
+the triangle across that edge, -1 on the boundary. Boundary loops follow
+the triangle orientation (counter-clockwise triangles give outer loops
+counter-clockwise and hole loops clockwise, domain on the left).
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+# local vertices of the edge opposite vertex i
+_EDGE_A = np.array([1, 2, 0])
+_EDGE_B = np.array([2, 0, 1])
+
+
+def _csr(rows: np.ndarray, values: np.ndarray, n: int):
+    # rows ascending, values ascending within a row
+    order = np.lexsort((values, rows))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+    return indptr, values[order]
+
+
+@dataclass
+class Topology:
+    n_vertices: int
+    edges: np.ndarray               # (E, 2) vertex pairs, a < b
+    edge_triangles: np.ndarray      # (E, 2) triangles on each side, -1 if none (boundary)
+    edge_opposite: np.ndarray       # (E, 2) vertex opposite the edge in those triangles, -1 if none
+    triangle_edges: np.ndarray      # (M, 3) edge id opposite each vertex
+    neighbors: np.ndarray           # (M, 3) triangle across the edge opposite each vertex, -1 if none
+    vertex_triangles_ptr: np.ndarray  # CSR: triangles around vertex v are
+    vertex_triangles: np.ndarray      #   vertex_triangles[ptr[v]:ptr[v + 1]]
+    vertex_neighbors_ptr: np.ndarray  # CSR vertex adjacency (edge-connected vertices, ascending)
+    vertex_neighbors: np.ndarray
+    boundary_halfedges: np.ndarray  # (B, 2) boundary edges oriented as in their triangle
+    _loops: List[np.ndarray] | None = field(default=None, repr=False)
+
+    @classmethod
+    def build(cls, triangles: np.ndarray, n_vertices: int) -> "Topology":
+        T = np.asarray(triangles, dtype=np.int64)
+        n, M = int(n_vertices), len(T)
+        ha, hb = T[:, _EDGE_A].ravel(), T[:, _EDGE_B].ravel()   # half-edge h = 3 t + i
+        lo, hi = np.minimum(ha, hb), np.maximum(ha, hb)
+        key, inv = np.unique(lo * n + hi, return_inverse=True)
+        E = len(key)
+
+        # the (up to) two half-edges of every edge
+        order = np.argsort(inv, kind="stable")
+        count = np.bincount(inv, minlength=E)
+        first = np.cumsum(count) - count
+        h0 = order[first]
+        h1 = np.where(count > 1, order[np.minimum(first + 1, len(order) - 1)], -1)
+
+        corner = T.ravel()
+        edge_triangles = np.column_stack([h0 // 3, np.where(h1 >= 0, h1 // 3, -1)])
+        edge_opposite = np.column_stack([corner[h0], np.where(h1 >= 0, corner[h1], -1)])
+        nb = np.full(3 * M, -1, dtype=np.int64)
+        two = h1 >= 0
+        nb[h0[two]] = h1[two] // 3
+        nb[h1[two]] = h0[two] // 3
+
+        edges = np.column_stack([key // n, key % n])
+        vt_ptr, vt = _csr(corner, np.repeat(np.arange(M), 3), n)
+        vv_ptr, vv = _csr(np.concatenate([edges[:, 0], edges[:, 1]]),
+                          np.concatenate([edges[:, 1], edges[:, 0]]), n)
+        hb_ = h0[count == 1]
+        return cls(n_vertices=n, edges=edges, edge_triangles=edge_triangles,
+                   edge_opposite=edge_opposite, triangle_edges=inv.reshape(M, 3),
+                   neighbors=nb.reshape(M, 3), vertex_triangles_ptr=vt_ptr, vertex_triangles=vt,
+                   vertex_neighbors_ptr=vv_ptr, vertex_neighbors=vv,
+                   boundary_halfedges=np.column_stack([ha[hb_], hb[hb_]]))
+
+    # ---- derived ----
+    @property
+    def boundary_edges(self) -> np.ndarray:
+        """Ids of the edges with a single triangle."""
+        return np.flatnonzero(self.edge_triangles[:, 1] < 0)
+
+    @property
+    def boundary_vertices(self) -> np.ndarray:
+        """Mask of the vertices on a boundary edge."""
+        mask = np.zeros(self.n_vertices, dtype=bool)
+        mask[self.boundary_halfedges.ravel()] = True
+        return mask
+
+    def triangles_of(self, v: int) -> np.ndarray:
+        return self.vertex_triangles[self.vertex_triangles_ptr[v]:self.vertex_triangles_ptr[v + 1]]
+
+    def neighbors_of(self, v: int) -> np.ndarray:
+        return self.vertex_neighbors[self.vertex_neighbors_ptr[v]:self.vertex_neighbors_ptr[v + 1]]
+
+    def boundary_loops(self) -> List[np.ndarray]:
+        """
+        Closed boundary loops as vertex sequences (first vertex not repeated),
+        ordered by list ranking with pointer jumping. Assumes a manifold
+        boundary (one outgoing boundary edge per boundary vertex).
+        """
+        if self._loops is not None:
+            return self._loops
+        H = self.boundary_halfedges
+        if not len(H):
+            self._loops = []
+            return self._loops
+        verts, local = np.unique(H.ravel(), return_inverse=True)
+        local = local.reshape(-1, 2)
+        nxt = np.arange(len(verts))
+        nxt[local[:, 0]] = local[:, 1]
+
+        # label each cycle by its smallest member
+        label, jump = np.arange(len(verts)), nxt.copy()
+        while True:
+            new = np.minimum(label, label[jump])
+            if np.array_equal(new, label):
+                break
+            label, jump = new, jump[jump]
+
+        # distance from the cycle's head (its label), by pointer jumping on
+        # predecessors with the head as root
+        prev = np.empty_like(nxt)
+        prev[nxt] = np.arange(len(verts))
+        head = label == np.arange(len(verts))
+        parent = np.where(head, np.arange(len(verts)), prev)
+        dist = np.where(head, 0, 1)
+        while not np.all(head[parent]):
+            step = ~head[parent]
+            dist = dist + np.where(step, dist[parent], 0)
+            parent = np.where(step, parent[parent], parent)
+
+        order = np.lexsort((dist, label))
+        cuts = np.flatnonzero(np.diff(label[order])) + 1
+        self._loops = [verts[g] for g in np.split(order, cuts)]
+        return self._loops
+
+
+__all__ = ["Topology"]
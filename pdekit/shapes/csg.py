@@ -0,0 +1,23 @@
+# pdekit/shapes/csg.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+
+@dataclass
+class CSGResult:
+    """
+    Derived node of the canvas' constructive-solid-geometry tree.
+
+    The result patch shows `expr` evaluated over the tagged operand shapes.
+    Operands stay on the canvas and remain editable; whenever one of them
+    changes the result is re-derived from the memoized expression DAG, so
+    only the path from the edited leaf to this node is recomputed.
+    """
+    tag: str
+    expr: str
+    rpn: Tuple[str, ...]
+    operands: Tuple[str, ...]                       # leaf tags of the expression
+    universe: Tuple[float, float, float, float]     # complement extent, fixed at creation
+    patch: Any                                      # matplotlib PathPatch showing the result
+    geom: Any = None                                # last evaluated Shapely geometry
@@ -1,4 +1,7 @@
-from PyQt6.QtWidgets import QDialog, QFormLayout, QLabel, QLineEdit, QDialogButtonBox
+from PyQt6.QtWidgets import (
+    QDialog, QFormLayout, QLabel, QLineEdit, QDialogButtonBox,
+    QComboBox, QCheckBox, QWidget, QHBoxLayout
+)
 
 class DomainCalculatorDialog(QDialog):
     """
@@ -92,3 +95,80 @@ class RectangleDialog(QDialog):
                 float(self.y1_edit.text()),
                 float(self.x2_edit.text()),
                 float(self.y2_edit.text()))
+
+
+class PatternDialog(QDialog):
+    """
+    Replicate a tagged shape over a grid or polar array.
+      grid:  nx x ny copies, spacing dx, dy
+      polar: count copies per ring around (cx, cy) over `sweep` degrees,
+             rings further out by `ring step`
+    Optionally cut the whole pattern out of another shape (e.g. a plate).
+    """
+    def __init__(self, parent, available_tags=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pattern")
+        form = QFormLayout(self)
+        tags = list(available_tags or [])
+
+        self.source_box = QComboBox()
+        self.source_box.addItems(tags)
+        form.addRow(QLabel("Source tag:"), self.source_box)
+
+        self.kind_box = QComboBox()
+        self.kind_box.addItems(["grid", "polar"])
+        form.addRow(QLabel("Pattern:"), self.kind_box)
+
+        self.nx_edit, self.ny_edit = QLineEdit("5"), QLineEdit("5")
+        self.dx_edit, self.dy_edit = QLineEdit("0.2"), QLineEdit("0.2")
+        form.addRow(QLabel("nx, ny (grid):"), self._pair(self.nx_edit, self.ny_edit))
+        form.addRow(QLabel("dx, dy (grid):"), self._pair(self.dx_edit, self.dy_edit))
+
+        self.count_edit, self.sweep_edit = QLineEdit("8"), QLineEdit("360")
+        self.cx_edit, self.cy_edit = QLineEdit("0"), QLineEdit("0")
+        self.rings_edit, self.ring_step_edit = QLineEdit("1"), QLineEdit("0")
+        self.rotate_check = QCheckBox("Rotate copies")
+        self.rotate_check.setChecked(True)
+        form.addRow(QLabel("count, sweep (polar):"), self._pair(self.count_edit, self.sweep_edit))
+        form.addRow(QLabel("center x, y (polar):"), self._pair(self.cx_edit, self.cy_edit))
+        form.addRow(QLabel("rings, ring step (polar):"), self._pair(self.rings_edit, self.ring_step_edit))
+        form.addRow(self.rotate_check)
+
+        self.target_box = QComboBox()
+        self.target_box.addItems(["(none)"] + tags)
+        form.addRow(QLabel("Subtract from:"), self.target_box)
+
+        self.tag_edit = QLineEdit()
+        self.tag_edit.setPlaceholderText("auto")
+        form.addRow(QLabel("Result tag:"), self.tag_edit)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok |
+                                   QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+
+    @staticmethod
+    def _pair(a, b):
+        w = QWidget()
+        row = QHBoxLayout(w)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.addWidget(a)
+        row.addWidget(b)
+        return w
+
+    def getValues(self):
+        kind = self.kind_box.currentText()
+        if kind == "grid":
+            params = {"nx": int(self.nx_edit.text()), "ny": int(self.ny_edit.text()),
+                      "dx": float(self.dx_edit.text()), "dy": float(self.dy_edit.text())}
+        else:
+            params = {"count": int(self.count_edit.text()), "sweep": float(self.sweep_edit.text()),
+                      "center": (float(self.cx_edit.text()), float(self.cy_edit.text())),
+                      "rings": int(self.rings_edit.text()),
+                      "ring_step": float(self.ring_step_edit.text()),
+                      "rotate": self.rotate_check.isChecked()}
+        target = self.target_box.currentText()
+        return (self.source_box.currentText(), kind,
+                None if target == "(none)" else target,
+                self.tag_edit.text().strip() or None, params)
@@ -0,0 +1,157 @@
+# pdekit/shapes/expression.py
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import box as shapely_box
+
+# operators as produced by Canvas._to_rpn; '*' and '&' are the same operation
+_BINARY = {"+": "union", "-": "difference", "*": "intersection", "&": "intersection"}
+_COMMUTATIVE = {"union", "intersection"}
+
+
+class ExprNode:
+    """
+    One node of a compiled domain expression. Nodes are hash-consed by
+    DomainExpressions, so structurally equal subexpressions (also across
+    different expressions) are the same object and share one memo entry.
+    """
+    __slots__ = ("uid", "op", "args", "tag", "leaves", "complement")
+
+    def __init__(self, uid: int, op: str, args: Tuple["ExprNode", ...] = (), tag: str | None = None):
+        self.uid = uid
+        self.op = op            # 'tag', 'union', 'difference', 'intersection', 'complement'
+        self.args = args        # n-ary; for 'difference' args[0] is the minuend
+        self.tag = tag
+        if op == "tag":
+            self.leaves = (tag,)
+            self.complement = False
+        else:
+            self.leaves = tuple(sorted({t for a in args for t in a.leaves}))
+            self.complement = op == "complement" or any(a.complement for a in args)
+
+    def __repr__(self):
+        if self.op == "tag":
+            return self.tag
+        return f"{self.op}({', '.join(map(repr, self.args))})"
+
+
+class DomainExpressions:
+    """
+    Compiled, memoized evaluation of domain-calculator expressions.
+
+    compile() turns an RPN token list into a DAG with common subexpressions
+    merged (e.g. `(A+B)-C` and `(A+B)&D` share the `A+B` node). Associative
+    chains are flattened into n-ary nodes: `P1 + P2 + ... + Pn` is one union
+    and `A - B - C` is one difference with several subtrahends, evaluated in
+    bulk by GEOS instead of as a left-deep pairwise chain. evaluate()
+    memoizes every intermediate geometry together with the leaf geometries
+    it was computed from; since the canvas hands out a new geometry object
+    per shape version, editing one primitive only recomputes the nodes that
+    depend on it.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[tuple, ExprNode] = {}     # structural key -> node
+        self._compiled: Dict[tuple, ExprNode] = {}  # rpn tuple -> root node
+        self._memo: Dict[ExprNode, tuple] = {}      # node -> (leaf geoms, universe, result)
+
+    def clear(self):
+        self._nodes.clear()
+        self._compiled.clear()
+        self._memo.clear()
+
+    def _intern(self, op: str, args: Tuple[ExprNode, ...] = (), tag: str | None = None) -> ExprNode:
+        if op in _COMMUTATIVE:
+            # idempotent as well: A + A == A
+            args = tuple(sorted({a.uid: a for a in args}.values(), key=lambda n: n.uid))
+        key = (op, tag, tuple(a.uid for a in args))
+        node = self._nodes.get(key)
+        if node is None:
+            node = ExprNode(len(self._nodes), op, args, tag)
+            self._nodes[key] = node
+        return node
+
+    def compile(self, rpn: Iterable[str]) -> ExprNode:
+        """Build (or fetch) the DAG root for an RPN token list."""
+        rpn = tuple(rpn)
+        root = self._compiled.get(rpn)
+        if root is not None:
+            return root
+
+        stack: List[ExprNode] = []
+        for t in rpn:
+            if t == "!":
+                if not stack:
+                    raise ValueError("Invalid expression")
+                stack.append(self._intern("complement", (stack.pop(),)))
+            elif t in _BINARY:
+                if len(stack) < 2:
+                    raise ValueError("Invalid expression")
+                b = stack.pop()
+                a = stack.pop()
+                op = _BINARY[t]
+                if op in _COMMUTATIVE:
+                    # (A + B) + C --> union(A, B, C), on either side
+                    args = (*(a.args if a.op == op else (a,)), *(b.args if b.op == op else (b,)))
+                elif a.op == "difference":
+                    # (A - B) - C --> difference(A, B, C) == A - (B + C)
+                    args = (*a.args, b)
+                else:
+                    args = (a, b)
+                stack.append(self._intern(op, args))
+            elif t[:1].isalpha() or t[:1] == "_":
+                stack.append(self._intern("tag", tag=t))
+            else:
+                raise ValueError(f"Bad token: {t}")
+        if len(stack) != 1:
+            raise ValueError("Invalid expression")
+
+        self._compiled[rpn] = stack[0]
+        return stack[0]
+
+    def evaluate(self, root: ExprNode,
+                 leaf_geom: Callable[[str], object],
+                 universe_bounds: Tuple[float, float, float, float]):
+        """
+        Evaluate a compiled expression.
+          leaf_geom:       tag -> current Shapely geometry (raises KeyError if unknown)
+          universe_bounds: (xmin, ymin, xmax, ymax) used by the complement '!'
+        """
+        geoms = {t: leaf_geom(t) for t in root.leaves}
+        universe = []   # built lazily, only if a complement has to be recomputed
+
+        def _universe():
+            if not universe:
+                universe.append(shapely_box(*universe_bounds))
+            return universe[0]
+
+        def _eval(node: ExprNode):
+            if node.op == "tag":
+                return geoms[node.tag]
+
+            stamp = tuple(geoms[t] for t in node.leaves)
+            uni = universe_bounds if node.complement else None
+            hit = self._memo.get(node)
+            if hit is not None and hit[1] == uni and all(a is b for a, b in zip(hit[0], stamp)):
+                return hit[2]
+
+            args = [_eval(a) for a in node.args]
+            if node.op == "complement":
+                result = _universe().difference(args[0])
+            elif node.op == "union":
+                # cascaded union over the whole operand array
+                result = shapely.union_all(np.asarray(args, dtype=object))
+            elif node.op == "intersection":
+                result = shapely.intersection_all(np.asarray(args, dtype=object))
+            elif len(args) == 2:
+                result = args[0].difference(args[1])
+            else:
+                # one union of all subtrahends, then a single difference
+                result = args[0].difference(shapely.union_all(np.asarray(args[1:], dtype=object)))
+
+            self._memo[node] = (stamp, uni, result)
+            return result
+
+        return _eval(root)
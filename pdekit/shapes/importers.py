@@ -0,0 +1,364 @@
+# pdekit/shapes/importers.py
+"""
+Streaming geometry importers.
+
+Every reader yields batches of `(geoms, names)`: an object ndarray of
+Shapely (Multi)Polygons and a list of the same length with an optional
+name per geometry (GeoJSON property / SVG id). Files are read
+incrementally and coordinates are decoded per ring or per path command
+with NumPy, so outlines with tens of thousands of rings never go through
+per-vertex Python objects.
+"""
+from __future__ import annotations
+from typing import Iterator, List, Tuple
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import shapely
+from shapely import GeometryType
+
+Batch = Tuple[np.ndarray, List[str | None]]
+
+_CHUNK = 1 << 20        # bytes read per step while streaming
+_BATCH = 2048           # geometries per yielded batch
+
+
+# -------- helpers --------
+def _ring(coords) -> np.ndarray:
+    """(n, 2) closed ring array from a nested coordinate list."""
+    a = np.asarray(coords, dtype=np.float64)
+    if a.ndim != 2 or len(a) < 3:
+        return np.empty((0, 2))
+    a = a[:, :2]
+    if (a[0] != a[-1]).any():
+        a = np.vstack([a, a[:1]])
+    return a
+
+
+def _multipolygons(polys: List[List[np.ndarray]]) -> np.ndarray:
+    """
+    Build one geometry per entry of `polys` (a list of polygons, each a list
+    of rings with the shell first) in a single from_ragged_array call.
+    Single-part results are returned as plain Polygons.
+    """
+    coords, ring_off, poly_off, geom_off = [], [0], [0], [0]
+    n = 0
+    for parts in polys:
+        for rings in parts:
+            for r in rings:
+                coords.append(r)
+                n += len(r)
+                ring_off.append(n)
+            poly_off.append(len(ring_off) - 1)
+        geom_off.append(len(poly_off) - 1)
+    xy = np.concatenate(coords) if coords else np.empty((0, 2))
+    offsets = (np.asarray(ring_off), np.asarray(poly_off), np.asarray(geom_off))
+    geoms = shapely.from_ragged_array(GeometryType.MULTIPOLYGON, xy, offsets)
+    single = shapely.get_num_geometries(geoms) == 1
+    geoms[single] = shapely.get_geometry(geoms[single], 0)
+    return geoms
+
+
+def _geojson_parts(g) -> List[List[np.ndarray]]:
+    """Polygons of a GeoJSON geometry dict as lists of ring arrays."""
+    if not g:
+        return []
+    kind = g.get("type")
+    if kind == "Polygon":
+        polys = [g["coordinates"]]
+    elif kind == "MultiPolygon":
+        polys = g["coordinates"]
+    elif kind == "GeometryCollection":
+        return [p for sub in g.get("geometries", []) for p in _geojson_parts(sub)]
+    else:
+        return []   # points and lines do not bound a domain
+    out = []
+    for poly in polys:
+        rings = [_ring(r) for r in poly]
+        if rings and len(rings[0]):
+            out.append([r for r in rings if len(r)])
+    return out
+
+
+# -------- GeoJSON --------
+def _iter_json_array(f, key: str) -> Iterator[dict]:
+    """Yield the objects of the top-level array `key` without loading the file."""
+    dec = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    m = None
+    while m is None and not eof:
+        more()
+        m = re.search(r'"%s"\s*:\s*\[' % re.escape(key), buf)
+    if m is None:
+        return
+    pos = m.end()
+    while True:
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            more()
+        if pos >= len(buf) or buf[pos] == "]":
+            return
+        try:
+            obj, end = dec.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more()
+            continue
+        pos = end
+        yield obj
+
+
+def iter_geojson(path, name_property: str | None = "name", batch: int = _BATCH) -> Iterator[Batch]:
+    """
+    Stream polygonal features of a GeoJSON FeatureCollection. A file holding
+    a single Feature or bare geometry is read in one go.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(4096)
+        f.seek(0)
+        if '"features"' in head or '"FeatureCollection"' in head:
+            features = _iter_json_array(f, "features")
+        else:
+            obj = json.load(f)
+            if obj.get("type") == "FeatureCollection":
+                features = iter(obj.get("features", []))
+            else:
+                features = iter([obj if obj.get("type") == "Feature" else {"geometry": obj}])
+
+        polys, names = [], []
+        for feat in features:
+            parts = _geojson_parts(feat.get("geometry"))
+            if not parts:
+                continue
+            polys.append(parts)
+            props = feat.get("properties") or {}
+            names.append(str(props[name_property]) if name_property and props.get(name_property) is not None
+                         else None)
+            if len(polys) >= batch:
+                yield _multipolygons(polys), names
+                polys, names = [], []
+        if polys:
+            yield _multipolygons(polys), names
+
+
+# -------- WKT --------
+def iter_wkt(path, batch: int = _BATCH) -> Iterator[Batch]:
+    """
+    Stream a WKT file with one geometry per line ('#' starts a comment line).
+    Each batch of lines is decoded by one vectorized shapely.from_wkt call.
+    """
+    def flush(lines):
+        geoms = shapely.from_wkt(np.asarray(lines, dtype=object), on_invalid="warn")
+        keep = shapely.get_type_id(geoms) == GeometryType.POLYGON
+        keep |= shapely.get_type_id(geoms) == GeometryType.MULTIPOLYGON
+        geoms = geoms[keep]
+        return geoms, [None] * len(geoms)
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = []
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            lines.append(line)
+            if len(lines) >= batch:
+                yield flush(lines)
+                lines = []
+        if lines:
+            yield flush(lines)
+
+
+# -------- SVG --------
+_NUM = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_CMD = re.compile(r"([MmLlHhVvCcSsQqTtAaZz])([^MmLlHhVvCcSsQqTtAaZz]*)")
+_CURVE_SAMPLES = 8      # line segments per Bezier curve segment
+
+
+def _nums(s: str) -> np.ndarray:
+    return np.array(_NUM.findall(s), dtype=np.float64)
+
+
+def _bezier(p0: np.ndarray, ctrl: np.ndarray, order: int) -> np.ndarray:
+    """
+    Sample consecutive Bezier segments. p0: (k, 2) start points,
+    ctrl: (k, order, 2) control + end points. Returns (k * samples, 2).
+    """
+    t = np.linspace(0.0, 1.0, _CURVE_SAMPLES + 1)[1:, None, None]
+    P = np.concatenate([p0[:, None, :], ctrl], axis=1)      # (k, order+1, 2)
+    if order == 2:
+        B = [(1 - t) ** 2, 2 * (1 - t) * t, t ** 2]
+    else:
+        B = [(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3]
+    pts = sum(b * P[None, :, i, :] for i, b in enumerate(B))  # (samples, k, 2)
+    return pts.transpose(1, 0, 2).reshape(-1, 2)
+
+
+def svg_path_rings(d: str) -> List[np.ndarray]:
+    """
+    Closed rings of an SVG path `d` attribute. Lines and Bezier curves are
+    decoded per command with array ops (relative coordinates via cumsum);
+    elliptical arcs are replaced by their chord.
+    """
+    rings, pts = [], []
+    cur = np.zeros(2)
+    start = np.zeros(2)
+    last_ctrl, last_cmd = None, ""
+
+    def close():
+        nonlocal pts
+        if pts:
+            r = np.concatenate(pts)
+            if len(r) >= 3:
+                rings.append(_ring(r))
+        pts = []
+
+    for cmd, args in _CMD.findall(d):
+        a = _nums(args)
+        rel = cmd.islower()
+        C = cmd.upper()
+        if C == "Z":
+            close()
+            cur = start.copy()
+            last_ctrl = None
+        elif C in "ML":
+            xy = a[: len(a) // 2 * 2].reshape(-1, 2)
+            if not len(xy):
+                continue
+            xy = cur + np.cumsum(xy, axis=0) if rel else xy
+            if C == "M":
+                close()
+                start = xy[0].copy()
+            pts.append(xy)
+            cur = xy[-1].copy()
+            last_ctrl = None
+        elif C in "HV":
+            if not len(a):
+                continue
+            i = 0 if C == "H" else 1
+            v = cur[i] + np.cumsum(a) if rel else a
+            xy = np.repeat(cur[None, :], len(v), axis=0)
+            xy[:, i] = v
+            pts.append(xy)
+            cur = xy[-1].copy()
+            last_ctrl = None
+        elif C in "CQ":
+            k = 3 if C == "C" else 2
+            seg = a[: len(a) // (2 * k) * 2 * k].reshape(-1, k, 2)
+            if not len(seg):
+                continue
+            if rel:
+                # each segment is relative to the end point of the previous one
+                ends = np.cumsum(seg[:, -1, :], axis=0)
+                base = cur + np.vstack([np.zeros((1, 2)), ends[:-1]])
+                seg = seg + base[:, None, :]
+            p0 = np.vstack([cur[None, :], seg[:-1, -1, :]])
+            pts.append(_bezier(p0, seg, k))
+            cur = seg[-1, -1].copy()
+            last_ctrl = seg[-1, -2].copy()
+        elif C in "ST":
+            # smooth curves depend on the previous control point --> sequential
+            k = 2 if C == "S" else 1
+            seg = a[: len(a) // (2 * k) * 2 * k].reshape(-1, k, 2)
+            order = 3 if C == "S" else 2
+            smooth_of = "CS" if C == "S" else "QT"
+            for s in seg:
+                s = cur + s if rel else s
+                refl = 2 * cur - last_ctrl if last_ctrl is not None and last_cmd in smooth_of else cur
+                ctrl = np.vstack([refl[None, :], s])
+                pts.append(_bezier(cur[None, :], ctrl[None, :, :], order))
+                last_ctrl = ctrl[-2].copy()
+                cur = s[-1].copy()
+                last_cmd = C
+            continue
+        elif C == "A":
+            seg = a[: len(a) // 7 * 7].reshape(-1, 7)[:, 5:]
+            if not len(seg):
+                continue
+            xy = cur + np.cumsum(seg, axis=0) if rel else seg
+            pts.append(xy)
+            cur = xy[-1].copy()
+            last_ctrl = None
+        last_cmd = C
+    close()
+    return rings
+
+
+def _evenodd(rings: List[np.ndarray]):
+    """Polygon covered by an odd number of rings (the SVG 'evenodd' fill)."""
+    polys = shapely.make_valid(shapely.polygons([shapely.linearrings(r) for r in rings]))
+    if len(polys) == 1:
+        return polys[0]
+    return shapely.symmetric_difference_all(polys)
+
+
+def iter_svg(path, batch: int = _BATCH) -> Iterator[Batch]:
+    """
+    Stream <path>, <polygon> and <rect> elements of an SVG file. The y axis
+    is flipped (SVG points down); element transforms are not applied.
+    """
+    geoms, names = [], []
+    for _, el in ET.iterparse(path, events=("end",)):
+        tag = el.tag.rsplit("}", 1)[-1]
+        rings = []
+        if tag == "path":
+            rings = svg_path_rings(el.get("d", ""))
+        elif tag == "polygon":
+            xy = _nums(el.get("points", ""))
+            xy = xy[: len(xy) // 2 * 2].reshape(-1, 2)
+            if len(xy) >= 3:
+                rings = [_ring(xy)]
+        elif tag == "rect":
+            x, y = float(el.get("x", 0)), float(el.get("y", 0))
+            w, h = float(el.get("width", 0)), float(el.get("height", 0))
+            if w > 0 and h > 0:
+                rings = [_ring([(x, y), (x + w, y), (x + w, y + h), (x, y + h)])]
+        if rings:
+            for r in rings:
+                r[:, 1] *= -1.0
+            g = _evenodd(rings)
+            if not g.is_empty:
+                geoms.append(g)
+                names.append(el.get("id"))
+        if tag in ("path", "polygon", "rect"):
+            el.clear()      # keep memory flat on large files
+        if len(geoms) >= batch:
+            yield np.asarray(geoms, dtype=object), names
+            geoms, names = [], []
+    if geoms:
+        yield np.asarray(geoms, dtype=object), names
+
+
+# -------- dispatch --------
+_READERS = {
+    ".geojson": iter_geojson, ".json": iter_geojson,
+    ".wkt": iter_wkt, ".txt": iter_wkt,
+    ".svg": iter_svg,
+}
+
+
+def iter_geometry_file(path, fmt: str | None = None) -> Iterator[Batch]:
+    """Pick a reader from `fmt` ('geojson', 'wkt', 'svg') or the file extension."""
+    ext = f".{fmt.lower().lstrip('.')}" if fmt else os.path.splitext(str(path))[1].lower()
+    reader = _READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"Unsupported geometry format: {fmt or ext or path}")
+    return reader(path)
+
+
+__all__ = ["iter_geojson", "iter_wkt", "iter_svg", "iter_geometry_file", "svg_path_rings"]
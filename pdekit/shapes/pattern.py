@@ -0,0 +1,99 @@
+# pdekit/shapes/pattern.py
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+import shapely
+
+
+def grid_transforms(nx: int, ny: int, dx: float, dy: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rectangular array: nx * ny copies shifted by multiples of (dx, dy), the
+    source itself being the (0, 0) copy. Returns (A, b) with A (n, 2, 2)
+    linear parts and b (n, 2) translations.
+    """
+    i, j = np.meshgrid(np.arange(int(nx)), np.arange(int(ny)), indexing="xy")
+    b = np.column_stack([i.ravel() * float(dx), j.ravel() * float(dy)])
+    A = np.broadcast_to(np.eye(2), (len(b), 2, 2))
+    return A, b
+
+
+def polar_transforms(count: int, center: Tuple[float, float], *, sweep: float = 360.0,
+                     start_angle: float = 0.0, rings: int = 1, ring_step: float = 0.0,
+                     rotate: bool = True, source_centroid: Tuple[float, float] | None = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Polar array about `center`: `count` copies per ring spread over `sweep`
+    degrees (a full circle does not repeat the first copy). Ring k is pushed
+    k * ring_step further out along the center -> source direction. With
+    rotate=False copies keep the source orientation and only their position
+    turns.
+    """
+    count, rings = max(int(count), 1), max(int(rings), 1)
+    full = np.isclose(abs(sweep) % 360.0, 0.0)
+    steps = count if full or count == 1 else count - 1
+    theta = np.deg2rad(start_angle + np.arange(count) * sweep / steps)
+    theta = np.tile(theta, rings)
+    k = np.repeat(np.arange(rings), count)
+
+    c = np.asarray(center, dtype=float)
+    s = c if source_centroid is None else np.asarray(source_centroid, dtype=float)
+    u = s - c
+    norm = np.hypot(*u)
+    u = u / norm if norm > 0 else np.array([1.0, 0.0])
+
+    cos, sin = np.cos(theta), np.sin(theta)
+    R = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], 1)   # (n, 2, 2)
+    push = k[:, None] * float(ring_step) * u                                  # radial ring offset
+    if rotate:
+        # p' = c + R (p - c + push)
+        A = R
+        b = c - np.einsum("nij,j->ni", R, c) + np.einsum("nij,nj->ni", R, push)
+    else:
+        # p' = p + (R - I)(s - c) + R push : the copy's reference point turns, the shape does not
+        A = np.broadcast_to(np.eye(2), R.shape)
+        b = np.einsum("nij,j->ni", R - np.eye(2), s - c) + np.einsum("nij,nj->ni", R, push)
+    return A, b
+
+
+def replicate(geom, A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Copies of `geom` under the affine maps p -> A[i] p + b[i], built with a
+    single shapely.transform call over all coordinates of all copies.
+    """
+    n = len(b)
+    copies = np.empty(n, dtype=object)
+    copies[:] = [geom] * n
+    k = int(shapely.get_num_coordinates(geom))
+
+    def apply(xy):
+        Ai = np.repeat(A, k, axis=0)
+        bi = np.repeat(b, k, axis=0)
+        return np.einsum("nij,nj->ni", Ai, xy) + bi
+
+    return shapely.transform(copies, apply)
+
+
+def pattern_geometry(geom, kind: str = "grid", **params):
+    """
+    Union of all copies of `geom` for a 'grid' (nx, ny, dx, dy) or 'polar'
+    (count, center, sweep, start_angle, rings, ring_step, rotate) pattern,
+    computed as one n-ary union.
+    """
+    if kind == "grid":
+        A, b = grid_transforms(params["nx"], params["ny"], params["dx"], params["dy"])
+    elif kind == "polar":
+        c = geom.centroid
+        A, b = polar_transforms(params["count"], params.get("center", (0.0, 0.0)),
+                                sweep=params.get("sweep", 360.0),
+                                start_angle=params.get("start_angle", 0.0),
+                                rings=params.get("rings", 1),
+                                ring_step=params.get("ring_step", 0.0),
+                                rotate=params.get("rotate", True),
+                                source_centroid=(c.x, c.y))
+    else:
+        raise ValueError(f"Unknown pattern kind: {kind}")
+    return shapely.union_all(replicate(geom, A, b))
+
+
+__all__ = ["grid_transforms", "polar_transforms", "replicate", "pattern_geometry"]
@@ -0,0 +1,239 @@
+# pdekit/utils/accel.py
+"""
+Optional compiled kernels.
+
+Loops that do not vectorize well (Jacobi smoothing sweeps, point-location
+walks, nonlinear coefficients per quadrature point) have a NumPy reference
+implementation and, when Numba is installed, a compiled `parallel=True`
+twin. The compiled one is picked automatically; set PDEKIT_ACCEL=numpy to
+force the reference code. Both variants of every kernel are listed in
+KERNELS so they can be checked against each other.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Tuple
+import os
+
+import numpy as np
+
+try:
+    import numba
+    from numba import prange
+    HAVE_NUMBA = True
+except Exception:   # optional dependency
+    numba = None
+    prange = range
+    HAVE_NUMBA = False
+
+# floor for |det| of degenerate triangles; any absolute eps larger than this
+# would swamp the determinants of small-scale meshes
+_TINY = float(np.finfo(np.float64).tiny)
+
+
+def backend() -> str:
+    """'numba' when compiled kernels are used, else 'numpy'."""
+    if HAVE_NUMBA and os.environ.get("PDEKIT_ACCEL", "").lower() != "numpy":
+        return "numba"
+    return "numpy"
+
+
+def _njit(fn):
+    return numba.njit(parallel=True, cache=True)(fn) if HAVE_NUMBA else None
+
+
+# -------- Jacobi (Laplacian) smoothing --------
+def _smooth_numpy(V, indptr, indices, fixed, iters):
+    n = len(V)
+    count = np.diff(indptr)
+    rows = np.repeat(np.arange(n), count)
+    move = (~fixed) & (count > 0)
+    cur = V.copy()
+    for _ in range(int(iters)):
+        sx = np.bincount(rows, weights=cur[indices, 0], minlength=n)
+        sy = np.bincount(rows, weights=cur[indices, 1], minlength=n)
+        cur[move, 0] = sx[move] / count[move]
+        cur[move, 1] = sy[move] / count[move]
+    return cur
+
+
+def _smooth_numba(V, indptr, indices, fixed, iters):
+    n = V.shape[0]
+    cur = V.copy()
+    nxt = V.copy()
+    for _ in range(iters):
+        for i in prange(n):
+            a, b = indptr[i], indptr[i + 1]
+            if fixed[i] or b == a:
+                nxt[i, 0] = cur[i, 0]
+                nxt[i, 1] = cur[i, 1]
+                continue
+            sx = 0.0
+            sy = 0.0
+            for k in range(a, b):
+                sx += cur[indices[k], 0]
+                sy += cur[indices[k], 1]
+            nxt[i, 0] = sx / (b - a)
+            nxt[i, 1] = sy / (b - a)
+        cur, nxt = nxt, cur
+    return cur
+
+
+# -------- point location by walking --------
+def _barycentric(A, B, C, P):
+    """Barycentric coordinates of P in triangles (A, B, C), all (k, 2)."""
+    v0, v1, v2 = B - A, C - A, P - A
+    det = v0[:, 0] * v1[:, 1] - v1[:, 0] * v0[:, 1]
+    det = np.where(np.abs(det) < _TINY, np.copysign(_TINY, det), det)
+    l1 = (v2[:, 0] * v1[:, 1] - v1[:, 0] * v2[:, 1]) / det
+    l2 = (v0[:, 0] * v2[:, 1] - v2[:, 0] * v0[:, 1]) / det
+    return np.column_stack([1.0 - l1 - l2, l1, l2])
+
+
+def _walk_numpy(V, T, N, P, start, max_steps, tol):
+    """
+    All points walk at once: from the current triangle step across the edge
+    opposite the most negative barycentric coordinate until the point is
+    inside (tol) or the walk leaves the mesh (-1).
+    """
+    out = np.full(len(P), -1, dtype=np.int64)
+    t = np.array(start, dtype=np.int64)
+    active = np.arange(len(P))
+    for _ in range(int(max_steps)):
+        if not len(active):
+            break
+        tt = t[active]
+        tri = T[tt]
+        lam = _barycentric(V[tri[:, 0]], V[tri[:, 1]], V[tri[:, 2]], P[active])
+        j = np.argmin(lam, axis=1)
+        inside = lam[np.arange(len(j)), j] >= -tol
+        out[active[inside]] = tt[inside]
+        nb = N[tt, j]
+        go = ~inside & (nb >= 0)
+        t[active[go]] = nb[go]
+        active = active[go]
+    return out
+
+
+def _walk_numba(V, T, N, P, start, max_steps, tol):
+    out = np.full(P.shape[0], -1, dtype=np.int64)
+    for p in prange(P.shape[0]):
+        t = start[p]
+        for _ in range(max_steps):
+            a, b, c = T[t, 0], T[t, 1], T[t, 2]
+            v0x, v0y = V[b, 0] - V[a, 0], V[b, 1] - V[a, 1]
+            v1x, v1y = V[c, 0] - V[a, 0], V[c, 1] - V[a, 1]
+            v2x, v2y = P[p, 0] - V[a, 0], P[p, 1] - V[a, 1]
+            det = v0x * v1y - v1x * v0y
+            if abs(det) < _TINY:
+                det = _TINY if det >= 0.0 else -_TINY
+            l1 = (v2x * v1y - v1x * v2y) / det
+            l2 = (v0x * v2y - v2x * v0y) / det
+            l0 = 1.0 - l1 - l2
+            j, lm = 0, l0
+            if l1 < lm:
+                j, lm = 1, l1
+            if l2 < lm:
+                j, lm = 2, l2
+            if lm >= -tol:
+                out[p] = t
+                break
+            nb = N[t, j]
+            if nb < 0:
+                break
+            t = nb
+    return out
+
+
+# -------- nonlinear P1 diffusion (coefficient per quadrature point) --------
+# 3-point rule, exact for quadratics: edge-midpoint barycentrics, weights 1/3
+QUAD_BARY = np.array([[0.5, 0.5, 0.0], [0.0, 0.5, 0.5], [0.5, 0.0, 0.5]])
+QUAD_WEIGHTS = np.full(3, 1.0 / 3.0)
+
+
+def _nonlinear_stiffness_numpy(P, u, kappa):
+    x, y = P[..., 0], P[..., 1]
+    bx = np.stack([y[:, 1] - y[:, 2], y[:, 2] - y[:, 0], y[:, 0] - y[:, 1]], -1)
+    by = np.stack([x[:, 2] - x[:, 1], x[:, 0] - x[:, 2], x[:, 1] - x[:, 0]], -1)
+    det = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+    gx, gy = bx / det[:, None], by / det[:, None]
+    kbar = np.asarray(kappa(u @ QUAD_BARY.T)) @ QUAD_WEIGHTS       # (m,)
+    s = 0.5 * np.abs(det) * kbar
+    return (gx[:, :, None] * gx[:, None, :] + gy[:, :, None] * gy[:, None, :]) * s[:, None, None]
+
+
+def _nonlinear_stiffness_numba(P, u, kappa):
+    m = P.shape[0]
+    out = np.empty((m, 3, 3))
+    for e in prange(m):
+        x0, y0 = P[e, 0, 0], P[e, 0, 1]
+        x1, y1 = P[e, 1, 0], P[e, 1, 1]
+        x2, y2 = P[e, 2, 0], P[e, 2, 1]
+        det = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        gx = ((y1 - y2) / det, (y2 - y0) / det, (y0 - y1) / det)
+        gy = ((x2 - x1) / det, (x0 - x2) / det, (x1 - x0) / det)
+        kbar = (kappa(0.5 * (u[e, 0] + u[e, 1])) + kappa(0.5 * (u[e, 1] + u[e, 2]))
+                + kappa(0.5 * (u[e, 0] + u[e, 2]))) / 3.0
+        s = 0.5 * abs(det) * kbar
+        for i in range(3):
+            for j in range(3):
+                out[e, i, j] = (gx[i] * gx[j] + gy[i] * gy[j]) * s
+    return out
+
+
+KERNELS: Dict[str, Tuple[Callable, Callable | None]] = {
+    "laplacian_smooth": (_smooth_numpy, _njit(_smooth_numba)),
+    "locate_walk": (_walk_numpy, _njit(_walk_numba)),
+    "nonlinear_stiffness": (_nonlinear_stiffness_numpy, _njit(_nonlinear_stiffness_numba)),
+}
+
+
+def kernel(name: str, which: str | None = None) -> Callable:
+    """The `which` ('numba'/'numpy', default: backend()) implementation of a kernel."""
+    ref, compiled = KERNELS[name]
+    if (which or backend()) == "numba" and compiled is not None:
+        return compiled
+    return ref
+
+
+# -------- public entry points --------
+def laplacian_smooth(V: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                     fixed: np.ndarray, iters: int = 1) -> np.ndarray:
+    """
+    `iters` Jacobi sweeps moving every free vertex to the mean of its
+    neighbours (vertex adjacency as CSR indptr/indices).
+    """
+    return kernel("laplacian_smooth")(np.ascontiguousarray(V, dtype=np.float64),
+                                      np.asarray(indptr, dtype=np.int64),
+                                      np.asarray(indices, dtype=np.int64),
+                                      np.asarray(fixed, dtype=np.bool_), int(iters))
+
+
+def locate_walk(V: np.ndarray, T: np.ndarray, neighbors: np.ndarray, points: np.ndarray,
+                start: np.ndarray, max_steps: int = 10_000, tol: float = 1e-10) -> np.ndarray:
+    """
+    Containing triangle per point by straight walks through triangle
+    neighbours (neighbors[t, i] opposite vertex i, -1 on the boundary), or
+    -1 when a walk leaves the mesh (outside, or blocked by a concave
+    boundary / hole: callers should fall back for those).
+    """
+    return kernel("locate_walk")(np.ascontiguousarray(V, dtype=np.float64),
+                                 np.asarray(T, dtype=np.int64),
+                                 np.asarray(neighbors, dtype=np.int64),
+                                 np.ascontiguousarray(points, dtype=np.float64),
+                                 np.asarray(start, dtype=np.int64), int(max_steps), float(tol))
+
+
+def nonlinear_stiffness(P: np.ndarray, u: np.ndarray, kappa: Callable) -> np.ndarray:
+    """
+    Element matrices of -div(kappa(u) grad v) for P1 triangles P (m, 3, 2)
+    with nodal values u (m, 3); kappa is evaluated at the 3 edge-midpoint
+    quadrature points. The compiled path needs a numba-jitted kappa, a plain
+    (vectorized) Python callable uses the NumPy path.
+    """
+    P = np.ascontiguousarray(P, dtype=np.float64)
+    u = np.ascontiguousarray(u, dtype=np.float64)
+    jitted = HAVE_NUMBA and isinstance(kappa, numba.core.registry.CPUDispatcher)
+    return kernel("nonlinear_stiffness", None if jitted else "numpy")(P, u, kappa)
+
+
+__all__ = ["HAVE_NUMBA", "backend", "KERNELS", "kernel",
+           "laplacian_smooth", "locate_walk", "nonlinear_stiffness"]
@@ -0,0 +1,199 @@
+# tests/test_accel.py
+"""
+Every kernel in pdekit.utils.accel.KERNELS: the NumPy reference against a
+plain-Python brute force, the Numba variant against the NumPy one (skipped
+without numba).
+"""
+from collections import Counter
+
+import numpy as np
+import pytest
+from shapely.geometry import Point, box
+
+from pdekit.mesh.generator import TriMesh, _laplacian_smooth, generate_mesh
+from pdekit.mesh.structured import structured_rectangle
+from pdekit.utils import accel
+
+needs_numba = pytest.mark.skipif(not accel.HAVE_NUMBA, reason="numba not installed")
+
+
+@pytest.fixture(scope="module")
+def holed_mesh() -> TriMesh:
+    return generate_mesh(box(0, 0, 3, 2).difference(Point(1.5, 1).buffer(0.5)), max_area=0.01)
+
+
+@pytest.fixture(scope="module")
+def jittered_rect() -> TriMesh:
+    m = structured_rectangle(0, 0, 2, 1, 16, 8)
+    rng = np.random.default_rng(1)
+    inner = ~m.topology.boundary_vertices
+    V = m.vertices.copy()
+    V[inner] += rng.uniform(-0.02, 0.02, (inner.sum(), 2))
+    m.vertices = V
+    return m
+
+
+# -------- brute-force references --------
+def _smooth_brute(V, indptr, indices, fixed, iters):
+    cur = V.copy()
+    for _ in range(iters):
+        nxt = cur.copy()
+        for i in range(len(V)):
+            ns = indices[indptr[i]:indptr[i + 1]]
+            if not fixed[i] and len(ns):
+                nxt[i] = cur[ns].mean(axis=0)
+        cur = nxt
+    return cur
+
+
+def _contains_brute(V, T, P, tol):
+    """For every point, the set of triangles containing it."""
+    out = []
+    for p in P:
+        hits = set()
+        for t, (a, b, c) in enumerate(T):
+            lam = accel._barycentric(V[[a]], V[[b]], V[[c]], p[None])[0]
+            if lam.min() >= -tol:
+                hits.add(t)
+        out.append(hits)
+    return out
+
+
+def _stiffness_brute(P, u, kappa):
+    out = np.empty((len(P), 3, 3))
+    for e in range(len(P)):
+        (x0, y0), (x1, y1), (x2, y2) = P[e]
+        det = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        g = np.array([[y1 - y2, x2 - x1], [y2 - y0, x0 - x2], [y0 - y1, x1 - x0]]) / det
+        kbar = np.mean([kappa(0.5 * (u[e, i] + u[e, j])) for i, j in ((0, 1), (1, 2), (0, 2))])
+        out[e] = g @ g.T * 0.5 * abs(det) * kbar
+    return out
+
+
+def _kappa(u):
+    return 1.0 + u * u
+
+
+def test_every_kernel_is_covered():
+    assert set(accel.KERNELS) == {"laplacian_smooth", "locate_walk", "nonlinear_stiffness"}
+
+
+# -------- laplacian_smooth --------
+def _smooth_args(mesh):
+    topo = mesh.topology
+    return (mesh.vertices.astype(np.float64), topo.vertex_neighbors_ptr, topo.vertex_neighbors,
+            topo.boundary_vertices, 3)
+
+
+def test_smooth_numpy_matches_brute(holed_mesh):
+    args = _smooth_args(holed_mesh)
+    np.testing.assert_array_equal(accel.kernel("laplacian_smooth", "numpy")(*args),
+                                  _smooth_brute(*args))
+
+
+@needs_numba
+def test_smooth_numba_matches_numpy(holed_mesh):
+    args = _smooth_args(holed_mesh)
+    np.testing.assert_array_equal(accel.kernel("laplacian_smooth", "numba")(*args),
+                                  accel.kernel("laplacian_smooth", "numpy")(*args))
+
+
+def _counter_smooth(mesh, iters, order):
+    """The Counter/set implementation _laplacian_smooth replaced; `order` sorts each neighbour set."""
+    V = mesh.vertices.copy()
+    T = mesh.triangles
+    edges = []
+    for a, b, c in T:
+        edges.extend([(a, b), (b, c), (c, a)])
+    edges = [tuple(sorted(e)) for e in edges]
+    counts = Counter(edges)
+    boundary = set([i for e, c in counts.items() if c == 1 for i in e])
+    nbrs = [[] for _ in range(len(V))]
+    for a, b, c in T:
+        nbrs[a] += [b, c]
+        nbrs[b] += [a, c]
+        nbrs[c] += [a, b]
+    nbrs = [order(set(ns)) for ns in nbrs]
+    for _ in range(iters):
+        newV = V.copy()
+        for i, ns in enumerate(nbrs):
+            if i in boundary or not ns:
+                continue
+            newV[i] = V[ns].mean(axis=0)
+        V = newV
+    return V
+
+
+@pytest.mark.parametrize("backend", ["numpy", pytest.param("numba", marks=needs_numba)])
+def test_laplacian_smooth_matches_counter_version(holed_mesh, monkeypatch, backend):
+    monkeypatch.setenv("PDEKIT_ACCEL", backend)
+    new = _laplacian_smooth(holed_mesh, iters=3).vertices
+    # same neighbour order (ascending): bit-identical
+    np.testing.assert_array_equal(new, _counter_smooth(holed_mesh, 3, sorted))
+    # the original summed in set iteration order: equal up to round-off
+    np.testing.assert_allclose(new, _counter_smooth(holed_mesh, 3, list), rtol=0, atol=1e-13)
+
+
+# -------- locate_walk --------
+def _walk_args(mesh, n=300, seed=2):
+    rng = np.random.default_rng(seed)
+    V, T = mesh.vertices, mesh.triangles.astype(np.int64)
+    lo, hi = V.min(axis=0), V.max(axis=0)
+    P = rng.uniform(lo - 0.1, hi + 0.1, (n, 2))
+    start = rng.integers(0, len(T), n)
+    return V, T, mesh.topology.neighbors, P, start, 10_000, 1e-10
+
+
+def test_walk_numpy_matches_brute(jittered_rect):
+    V, T, N, P, start, steps, tol = args = _walk_args(jittered_rect)
+    found = accel.kernel("locate_walk", "numpy")(*args)
+    hits = _contains_brute(V, T, P, tol)
+    for t, h in zip(found, hits):
+        # convex mesh: a walk only fails for points outside
+        assert (t in h) if h else t == -1
+
+
+@needs_numba
+@pytest.mark.parametrize("fixture", ["jittered_rect", "holed_mesh"])
+def test_walk_numba_matches_numpy(request, fixture):
+    args = _walk_args(request.getfixturevalue(fixture))
+    np.testing.assert_array_equal(accel.kernel("locate_walk", "numba")(*args),
+                                  accel.kernel("locate_walk", "numpy")(*args))
+
+
+@pytest.mark.parametrize("backend", ["numpy", pytest.param("numba", marks=needs_numba)])
+@pytest.mark.parametrize("scale", [1.0, 1e-5, 1e-7])
+def test_walk_matches_grid_at_small_scale(monkeypatch, backend, scale):
+    monkeypatch.setenv("PDEKIT_ACCEL", backend)
+    m = structured_rectangle(0, 0, scale, scale, 20, 20)
+    P = np.random.default_rng(3).uniform(0.01 * scale, 0.99 * scale, (200, 2))
+    walked, wb = m.locate(P, start=np.zeros(len(P), dtype=np.int64))
+    m._locator = None
+    grid, gb = m.locate(P)
+    assert (walked >= 0).all() and (grid >= 0).all()
+    assert wb.min() >= -1e-9 and gb.min() >= -1e-9
+    np.testing.assert_allclose(m.vertices[m.triangles[walked]].transpose(0, 2, 1) @ wb[..., None],
+                               P[..., None], rtol=0, atol=1e-9 * scale)
+
+
+# -------- nonlinear_stiffness --------
+def _stiffness_args(mesh):
+    P = mesh.vertices[mesh.triangles]
+    u = np.sin(3 * P[..., 0]) * np.cos(2 * P[..., 1])
+    return np.ascontiguousarray(P), np.ascontiguousarray(u)
+
+
+def test_stiffness_numpy_matches_brute(jittered_rect):
+    P, u = _stiffness_args(jittered_rect)
+    np.testing.assert_allclose(accel.kernel("nonlinear_stiffness", "numpy")(P, u, _kappa),
+                               _stiffness_brute(P, u, _kappa), rtol=1e-12, atol=1e-12)
+
+
+@needs_numba
+def test_stiffness_numba_matches_numpy(jittered_rect):
+    import numba
+    P, u = _stiffness_args(jittered_rect)
+    kappa = numba.njit(_kappa)
+    np.testing.assert_allclose(accel.kernel("nonlinear_stiffness", "numba")(P, u, kappa),
+                               accel.kernel("nonlinear_stiffness", "numpy")(P, u, _kappa),
+                               rtol=1e-12, atol=1e-12)